@@ -1,27 +1,56 @@
 import sys
 import argparse
 import logging
+from contextlib import nullcontext
 
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtCore import Qt
-
-from giwaxs_gui.app import App, launch_detached
-from giwaxs_gui.gui import GIWAXSMainController, UncaughtHook, DebugWindow
 from giwaxs_gui.__version import __version__
 
 
 __author__ = 'Vladimir Starostin'
 __email__ = 'v.starostin.m@gmail.com'
 
+# Qt, the gui and the app are imported on first use, so that importing the package
+# (e.g. for the headless scripts) and the startup of the program stay fast.
+_LAZY_ATTRIBUTES = {
+    'App': 'giwaxs_gui.app',
+    'launch_detached': 'giwaxs_gui.app',
+    'GIWAXSMainController': 'giwaxs_gui.gui',
+    'UncaughtHook': 'giwaxs_gui.gui',
+    'DebugWindow': 'giwaxs_gui.gui',
+}
+
+
+def __getattr__(name: str):
+    if name not in _LAZY_ATTRIBUTES:
+        raise AttributeError(f'module {__name__} has no attribute {name}')
+    from importlib import import_module
+    return getattr(import_module(_LAZY_ATTRIBUTES[name]), name)
+
+
+def run(logging_level: int = logging.ERROR, profiler=None):
+    if profiler:
+        profiler.start()
+
+    with _stage(profiler, 'import Qt'):
+        from PyQt5.QtWidgets import QApplication
+        from PyQt5.QtCore import Qt
+
+    with _stage(profiler, 'import gui'):
+        from giwaxs_gui.gui import GIWAXSMainController
 
-def run(logging_level: int = logging.ERROR):
     for log in (logging.getLogger(name) for name in logging.root.manager.loggerDict):
         log.setLevel(logging_level)
 
-    QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    q_app = QApplication([])
+    with _stage(profiler, 'create QApplication'):
+        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+        q_app = QApplication([])
 
-    giwaxs_app = GIWAXSMainController()
+    with _stage(profiler, 'create main window'):
+        giwaxs_app = GIWAXSMainController()
+
+    if profiler:
+        profiler.stop()
+        print(profiler.report())
 
     return q_app.exec_()
 
@@ -31,6 +60,8 @@ def main():
 
     parser.add_argument('-d', '--debug', action='store_true', help='open program in debug mode')
     parser.add_argument('--version', action='store_true', help='show the installed version')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help='print the import time breakdown after the program is started')
 
     args = parser.parse_args()
 
@@ -38,16 +69,29 @@ def main():
         print(__version__)
         return
 
+    profiler = None
+
+    if args.profile_startup:
+        from giwaxs_gui.import_profiler import ImportProfiler
+        profiler = ImportProfiler()
+
     level: int = logging.DEBUG if args.debug else logging.ERROR
 
-    exit_code: int = run(level)
+    exit_code: int = run(level, profiler)
+
+    from giwaxs_gui.gui import GIWAXSMainController
 
     if exit_code == GIWAXSMainController.EXIT_CODE_REBOOT:
+        from giwaxs_gui.app import launch_detached
         launch_detached()
         return 0
 
     return exit_code
 
 
+def _stage(profiler, name: str):
+    return profiler.stage(name) if profiler else nullcontext()
+
+
 if __name__ == '__main__':
     sys.exit(main())
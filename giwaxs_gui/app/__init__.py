@@ -3,5 +3,4 @@ from .geometry import Geometry
 from .rois.roi_data import RoiData
 from .rois.roi import Roi, RoiTypes
 from .fitting import FitObject
-from .debug_tracker import TrackQObjects
 from .update import launch_detached
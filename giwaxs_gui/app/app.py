@@ -8,9 +8,7 @@ from .geometry import Geometry
 from .geometry_holder import GeometryHolder
 from .image_holder import ImageHolder
 from .profiles import RadialProfile, AngularProfile
-from .debug_tracker import TrackQObjects
 from .data_manager import DataManager
-from .structures import CrystalsDatabase
 
 
 class App(metaclass=SingletonMeta):
@@ -24,20 +22,27 @@ class App(metaclass=SingletonMeta):
         self.radial_profile: RadialProfile = RadialProfile(self.image_holder, self.fm)
         self.angular_profile: AngularProfile = AngularProfile(self.image_holder)
         self.data_manager: DataManager = DataManager(self.fm, self.image_holder)
-        self.crystals_database: CrystalsDatabase = CrystalsDatabase()
+        self._crystals_database = None
 
         if _connect:
             self._connect_app()
 
-        self.debug_tracker: TrackQObjects or None = None
-        if self.log.level <= logging.DEBUG:
-            self.debug_tracker = TrackQObjects()
+        # set by the gui in debug mode (gui.debug_tracker.TrackQObjects)
+        self.debug_tracker = None
 
     def save_state(self):
         self.geometry_holder.save_state()
         self.roi_dict.save_state()
         # self.radial_profile.save_state()
 
+    @property
+    def crystals_database(self):
+        # crystals and periodictable are heavy, they are imported on first use
+        if self._crystals_database is None:
+            from .structures import CrystalsDatabase
+            self._crystals_database = CrystalsDatabase()
+        return self._crystals_database
+
     @property
     def image(self):
         return self.image_holder.image
@@ -0,0 +1,198 @@
+from typing import NamedTuple, Iterable, Generator, Callable, List, Tuple
+import logging
+
+from h5py import File, string_dtype
+import numpy as np
+
+from ..geometry import Geometry
+from ..file_manager import ImageKey
+from ..parallel_io import iter_ordered, in_memory
+from .load_data import LoadData, ImageData, ImageDataFlags
+
+logger = logging.getLogger(__name__)
+
+
+class DatasetSample(NamedTuple):
+    polar_image: np.ndarray
+    boxes: np.ndarray
+    labels: np.ndarray
+    intensities: np.ndarray
+    confidence_levels: np.ndarray
+    file_key: str
+    path: str
+
+
+class DatasetSampleLoader(object):
+    """Loads (or calculates) a polar image of an image key and converts its rois to boxes."""
+
+    FLAGS = ImageDataFlags.POLAR_IMAGE | ImageDataFlags.GEOMETRY | ImageDataFlags.ROI_DATA
+
+    def __init__(self, load_data: LoadData):
+        self._load_data = load_data
+
+    def __call__(self, image_key: ImageKey) -> DatasetSample or None:
+        image_data: ImageData = self._load_data.load_image_data(image_key, flags=self.FLAGS)
+
+        if image_data.polar_image is None or image_data.roi_data is None or image_data.geometry is None:
+            return
+
+        roi_data = image_data.roi_data
+        boxes, labels = get_boxes_n_labels(roi_data.to_array(), image_data.geometry)
+
+        return DatasetSample(
+            polar_image=in_memory(image_data.polar_image),
+            boxes=boxes,
+            labels=labels,
+            intensities=roi_data.intensities,
+            confidence_levels=np.asarray(roi_data.confidence_levels, dtype=np.float64),
+            file_key=str(image_key._file_key()),
+            path=str(getattr(image_key, 'path', '')),
+        )
+
+
+def get_boxes_n_labels(roi_arr: np.ndarray, geometry: Geometry) -> Tuple[np.ndarray, np.ndarray]:
+    """Converts rows (radius, width, angle, angle_std, key, type) to pixel boxes (x1, y1, x2, y2) of the polar image."""
+    if not len(roi_arr):
+        return np.zeros((0, 4)), np.zeros(0)
+
+    r, w, a, a_s = roi_arr[:, 0], roi_arr[:, 1], roi_arr[:, 2], roi_arr[:, 3]
+
+    boxes = np.stack([
+        geometry.r2p(r - w / 2), geometry.a2p(a - a_s / 2),
+        geometry.r2p(r + w / 2), geometry.a2p(a + a_s / 2),
+    ], axis=1)
+
+    return boxes, roi_arr[:, 5].copy()
+
+
+def iter_samples(loader: Callable[[ImageKey], DatasetSample or None],
+                 image_keys: Iterable[ImageKey],
+                 workers: int = 1,
+                 max_pending: int = None) -> Generator[DatasetSample or None, None, None]:
+    """Yields loaded samples in the order of image_keys, loaded by a bounded pool of threads."""
+    return iter_ordered(loader, image_keys, workers, max_pending)
+
+
+class GroupDatasetWriter(object):
+    """Writes every sample to a separate group named by the sample number."""
+
+    def __init__(self, f: File, compression: str = None, compression_opts=None):
+        self._file = f
+        self._count: int = len(list(f.keys()))
+        self._kwargs = dict(compression=compression, compression_opts=compression_opts) if compression else {}
+
+    def write(self, sample: DatasetSample):
+        group = self._file.create_group(str(self._count))
+        group.create_dataset('polar_image', data=sample.polar_image, **self._kwargs)
+        group.create_dataset('boxes', data=sample.boxes)
+        group.create_dataset('labels', data=sample.labels)
+        group.create_dataset('intensities', data=sample.intensities)
+        group.create_dataset('confidence_levels', data=sample.confidence_levels)
+
+        group.attrs.update(file_key=sample.file_key)
+        if sample.path:
+            group.attrs.update(path=sample.path)
+
+        self._count += 1
+
+    def close(self):
+        pass
+
+
+class ChunkedDatasetWriter(object):
+    """
+    Appends samples to resizable datasets of fixed-size items:
+
+        polar_images (N, H, W), one chunk per image;
+        boxes (M, 4), labels, intensities, confidence_levels (M,) - rois of all images;
+        roi_slices (N, 2) - start and stop rows of the rois of each image;
+        file_keys, paths (N,).
+
+    Samples are buffered and datasets are resized once per buffer_size samples.
+    All polar images must have the same shape.
+    """
+
+    log = logging.getLogger(__name__)
+
+    ROI_DATASETS = ('labels', 'intensities', 'confidence_levels')
+
+    def __init__(self, f: File, compression: str = None, compression_opts=None, buffer_size: int = 64):
+        self._file = f
+        self._compression = compression
+        self._compression_opts = compression_opts if compression else None
+        self._buffer_size = max(buffer_size, 1)
+        self._buffer: List[DatasetSample] = []
+        self.skipped: int = 0
+
+    @property
+    def num_images(self) -> int:
+        return self._file['polar_images'].shape[0] if 'polar_images' in self._file else 0
+
+    def write(self, sample: DatasetSample):
+        shape = self._image_shape()
+
+        if shape is None and self._buffer:
+            shape = self._buffer[0].polar_image.shape
+
+        if shape is not None and sample.polar_image.shape != shape:
+            self.log.warning(f'Polar image {sample.file_key} of shape {sample.polar_image.shape} '
+                             f'is skipped, dataset shape is {shape}.')
+            self.skipped += 1
+            return
+
+        self._buffer.append(sample)
+
+        if len(self._buffer) >= self._buffer_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        samples, self._buffer = self._buffer, []
+
+        if 'polar_images' not in self._file:
+            self._create_datasets(samples[0].polar_image.shape)
+
+        f = self._file
+        num_images, num_rois = f['polar_images'].shape[0], f['boxes'].shape[0]
+        new_images = len(samples)
+        roi_nums = np.array([sample.boxes.shape[0] for sample in samples], dtype=np.int64)
+        new_rois = int(roi_nums.sum())
+
+        _append(f['polar_images'], np.stack([sample.polar_image for sample in samples]), num_images)
+        _append(f['file_keys'], [sample.file_key for sample in samples], num_images)
+        _append(f['paths'], [sample.path for sample in samples], num_images)
+
+        stops = num_rois + np.cumsum(roi_nums)
+        _append(f['roi_slices'], np.stack([stops - roi_nums, stops], axis=1), num_images)
+
+        if new_rois:
+            _append(f['boxes'], np.concatenate([sample.boxes for sample in samples]), num_rois)
+            for name in self.ROI_DATASETS:
+                _append(f[name], np.concatenate([getattr(sample, name) for sample in samples]), num_rois)
+
+        self.log.debug(f'{new_images} images with {new_rois} rois are written.')
+
+    def close(self):
+        self.flush()
+
+    def _image_shape(self) -> tuple or None:
+        if 'polar_images' in self._file:
+            return self._file['polar_images'].shape[1:]
+
+    def _create_datasets(self, shape: Tuple[int, int]):
+        f = self._file
+        f.create_dataset('polar_images', shape=(0, *shape), maxshape=(None, *shape),
+                         chunks=(1, *shape), dtype=np.float32,
+                         compression=self._compression, compression_opts=self._compression_opts)
+        f.create_dataset('boxes', shape=(0, 4), maxshape=(None, 4), chunks=(1024, 4), dtype=np.float64)
+        for name in self.ROI_DATASETS:
+            f.create_dataset(name, shape=(0,), maxshape=(None,), chunks=(1024,), dtype=np.float64)
+        f.create_dataset('roi_slices', shape=(0, 2), maxshape=(None, 2), chunks=(1024, 2), dtype=np.int64)
+        for name in ('file_keys', 'paths'):
+            f.create_dataset(name, shape=(0,), maxshape=(None,), chunks=(1024,), dtype=string_dtype())
+
+
+def _append(dset, data, start: int):
+    dset.resize(start + len(data), axis=0)
+    dset[start:] = data
@@ -2,6 +2,7 @@ from ..file_manager import FileManager
 from .saving_parameters import SavingParameters, SaveFormats
 from .save_h5 import SaveH5
 from ..image_holder import ImageHolder
+from ..profiling import timed
 
 
 class SaveData(object):
@@ -10,11 +11,14 @@ class SaveData(object):
         self._image_holder: ImageHolder = image_holder
         self._save_h5 = SaveH5(fm, image_holder)
 
+    @timed('save')
     def save(self, params: SavingParameters):
         if params.format.value == SaveFormats.h5.value:
             self._save_h5.save(params)
         elif params.format.value == SaveFormats.object_detection.value:
             self._save_h5.save_for_object_detection(params)
+        elif params.format.value == SaveFormats.chunked_dataset.value:
+            self._save_h5.save_chunked_dataset(params)
         elif params.format.value == SaveFormats.h5_project.value:
             params.set_h5_project_params()
             self._save_h5.save(params)
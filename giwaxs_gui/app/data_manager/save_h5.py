@@ -1,15 +1,23 @@
-from typing import List
+from typing import List, NamedTuple
 from pathlib import Path
 
 from h5py import File, Group
-import numpy as np
+from numpy import ndarray
 
-from ..geometry import Geometry
 from .saving_parameters import SavingParameters, SaveMode
 from ..file_manager import (FileManager, FolderKey, ImageKey,
                             IMAGE_PROJECT_KEY, PROJECT_KEY)
 from ..image_holder import ImageHolder
-from .load_data import LoadData, ImageData, ImageDataFlags
+from ..parallel_io import iter_ordered, in_memory
+from .load_data import LoadData, ImageDataFlags
+from .dataset_writer import (DatasetSampleLoader, GroupDatasetWriter,
+                             ChunkedDatasetWriter, iter_samples)
+
+
+class _ImagesToSave(NamedTuple):
+    image_key: ImageKey
+    image: ndarray or None
+    polar_image: ndarray or None
 
 
 class SaveH5(object):
@@ -28,51 +36,28 @@ class SaveH5(object):
             self._save_folder_as_h5(path_str, folder_key, image_keys, params)
 
     def save_for_object_detection(self, params: SavingParameters):
+        self._save_dataset(params, GroupDatasetWriter)
+
+    def save_chunked_dataset(self, params: SavingParameters):
+        self._save_dataset(params, ChunkedDatasetWriter)
+
+    def _save_dataset(self, params: SavingParameters, writer_class):
         filepath = _get_h5_path(params.path)
-        count: int = 0
 
         if not filepath.parent.exists():
             raise IOError(f'Parent folder {filepath.parent} does not exist.')
 
-        path_str: str = str(filepath.resolve())
-
-        if filepath.exists():
-            with File(path_str, 'r') as f:
-                count = len(list(f.keys()))
-
-        with File(path_str, 'a') as f:
-            for _, image_keys in params.selected_images.items():
-                for image_key in image_keys:
-                    if self._save_image_for_object_detection(f, image_key, str(count)):
-                        count += 1
-
-    def _save_image_for_object_detection(self, f: File, image_key: ImageKey, name: str) -> bool:
-        image_data: ImageData = self._load_data.load_image_data(
-            image_key, flags=ImageDataFlags.POLAR_IMAGE | ImageDataFlags.GEOMETRY | ImageDataFlags.ROI_DATA)
-
-        if image_data.polar_image is None or image_data.roi_data is None or image_data.geometry is None:
-            return False
-
-        boxes, labels = _get_boxes_n_labels(image_data.roi_data.to_array(), image_data.geometry)
+        image_keys = [image_key for keys in params.selected_images.values() for image_key in keys]
+        samples = iter_samples(DatasetSampleLoader(self._load_data), image_keys, params.dataset_workers)
 
-        intensities = image_data.roi_data.intensities
-        confidence_levels = image_data.roi_data.confidence_levels
-
-        group = f.create_group(name)
-        group.create_dataset('polar_image', data=image_data.polar_image)
-        group.create_dataset('boxes', data=boxes)
-        group.create_dataset('labels', data=labels)
-        group.create_dataset('intensities', data=intensities)
-        group.create_dataset('confidence_levels', data=confidence_levels)
-
-        group.attrs.update(file_key=str(image_key._file_key()))
-
-        try:
-            group.attrs.update(path=str(image_key.path))
-        except AttributeError:
-            pass
-
-        return True
+        with File(str(filepath.resolve()), 'a') as f:
+            writer = writer_class(f, params.dataset_compression, params.dataset_compression_opts)
+            try:
+                for sample in samples:
+                    if sample is not None:
+                        writer.write(sample)
+            finally:
+                writer.close()
 
     def _save_folder_as_h5(self, path: str, folder_key: FolderKey,
                            image_keys: List[ImageKey], params: SavingParameters):
@@ -84,8 +69,12 @@ class SaveH5(object):
 
             self._save_folder_data(group, folder_key, params)
 
-            for image_key in image_keys:
-                self._save_image_as_h5(group, image_key, params)
+            # images are read by a pool of threads, h5 file is written by this thread only
+            images = iter_ordered(lambda image_key: self._load_images(image_key, params),
+                                  image_keys, params.read_workers)
+
+            for data in images:
+                self._save_image_as_h5(group, data, params)
 
     def _save_folder_data(self, group: Group, folder_key: FolderKey, params: SavingParameters):
 
@@ -99,11 +88,19 @@ class SaveH5(object):
             if roi_metadata:
                 self._fm.rois_meta_data.set_h5(group, folder_key, roi_metadata)
 
+    def _load_images(self, image_key: ImageKey, params: SavingParameters) -> _ImagesToSave:
+        # called by the reading threads, mapped images are read here and not by the writing thread
+        image = image_key.get_image() if params.save_image else None
+        polar_image = self._load_data.load_image_data(
+            image_key, ImageDataFlags.POLAR_IMAGE).polar_image if params.save_polar_image else None
+        return _ImagesToSave(image_key, in_memory(image), in_memory(polar_image))
+
     def _save_image_as_h5(self,
                           h5group: Group,
-                          image_key: ImageKey,
+                          data: _ImagesToSave,
                           params: SavingParameters
                           ):
+        image_key = data.image_key
 
         if image_key.name in h5group.keys():
             del h5group[image_key.name]
@@ -111,13 +108,11 @@ class SaveH5(object):
         img_group = h5group.create_group(image_key.name)
         img_group.attrs[IMAGE_PROJECT_KEY] = True
 
-        polar_image = self._load_data.load_image_data(image_key, ImageDataFlags.POLAR_IMAGE).polar_image
-
         if params.save_image:
-            self._fm.images.set_h5(img_group, image_key, image_key.get_image())
+            self._fm.images.set_h5(img_group, image_key, data.image)
 
-        if params.save_polar_image and polar_image is not None:
-            self._fm.polar_images.set_h5(img_group, image_key, polar_image)
+        if params.save_polar_image and data.polar_image is not None:
+            self._fm.polar_images.set_h5(img_group, image_key, data.polar_image)
 
         roi_data = self._fm.rois_data[image_key]
 
@@ -161,15 +156,3 @@ def _get_folder_group(f: File, name: str) -> Group:
     # TODO carefully handle name collisions by checking Path attribute (or any others)
     return f.create_group(name) if name not in f.keys() else f[name]
 
-
-def _get_boxes_n_labels(roi_arr: np.ndarray, geometry: Geometry):
-    labels, boxes = [], []
-
-    for r, w, a, a_s, key, roi_type in roi_arr:
-        x1, x2 = geometry.r2p(r - w / 2), geometry.r2p(r + w / 2)
-        y1, y2 = geometry.a2p(a - a_s / 2), geometry.a2p(a + a_s / 2)
-
-        labels.append(roi_type)
-        boxes.append([x1, y1, x2, y2])
-
-    return np.array(boxes), np.array(labels)
@@ -4,11 +4,13 @@ from typing import Dict, List
 from pathlib import Path
 
 from ..file_manager import FolderKey, ImageKey
+from ..parallel_io import IO_WORKERS
 
 
 class SaveFormats(Enum):
     h5_project = 'Save as h5 project'
     object_detection = 'Save as dataset'
+    chunked_dataset = 'Save as chunked dataset'
     h5 = 'Generic h5 format'
     text = 'Text formats'
 
@@ -53,6 +55,14 @@ class SavingParameters:
     meta_text_format: MetaTextFormats = MetaTextFormats.yaml
     roi_saving_type: RoiSavingType = RoiSavingType.group_by_image
 
+    # threads reading the images to save
+    read_workers: int = IO_WORKERS
+
+    # datasets for object detection
+    dataset_workers: int = 4
+    dataset_compression: str = None
+    dataset_compression_opts: int = None
+
     BOOL_FLAGS = {'save_image': 'Save images',
                   'save_polar_image': 'Save polar images',
                   'save_geometries': 'Save geometries',
@@ -0,0 +1,155 @@
+"""
+On-disk cache of decompressed image files (e.g. .edf.gz frames).
+
+A frame is stored decompressed under a name derived from the source path, modification
+time and size, so that a changed source file is decompressed again. Stored frames are
+uncompressed files of the original format and are mapped into memory by read_image.
+The least recently used frames are removed when the cache exceeds its size, down to
+LOW_WATERMARK of the size, so that the folder is not scanned again for every new frame.
+"""
+
+import os
+import gzip
+import shutil
+import logging
+import threading
+from hashlib import sha1
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Iterable, Callable, List
+
+__all__ = ['DecompressedCache', 'COMPRESSED_SUFFIXES']
+
+logger = logging.getLogger(__name__)
+
+COMPRESSED_SUFFIXES = ('.gz',)
+
+
+class DecompressedCache(object):
+    DEFAULT_MAX_SIZE: int = 4 << 30
+    # fraction of max_size the cache is reduced to when it exceeds max_size
+    LOW_WATERMARK: float = 0.9
+
+    def __init__(self, folder: Path, max_size: int = DEFAULT_MAX_SIZE):
+        self.folder: Path = folder
+        self.max_size: int = max_size
+        self._lock = threading.Lock()
+        self.folder.mkdir(parents=True, exist_ok=True)
+        self._size: int = sum(p.stat().st_size for p in self._cached_files())
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    @staticmethod
+    def is_compressed(path: Path) -> bool:
+        return path.name.lower().endswith(COMPRESSED_SUFFIXES)
+
+    def cached_path(self, path: Path) -> Path:
+        stat = path.stat()
+        key = sha1(f'{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}'.encode()).hexdigest()
+        # keep the suffix of the decompressed file (.edf.gz -> .edf) to choose the reader
+        return self.folder / (key + Path(path.stem).suffix)
+
+    def get(self, path: Path) -> Path:
+        """Path of the decompressed file, it is decompressed if not cached."""
+        cached = self.cached_path(path)
+
+        if cached.is_file():
+            # the modification time of the cached file is the time of the last access
+            try:
+                os.utime(cached)
+                return cached
+            except FileNotFoundError:
+                pass
+
+        size = _decompress(path, cached)
+
+        with self._lock:
+            self._size += size
+        if self._size > self.max_size:
+            self.cleanup(keep=cached, max_size=int(self.max_size * self.LOW_WATERMARK))
+        return cached
+
+    def warm(self, paths: Iterable[Path], *, workers: int = None,
+             process_callback: Callable[[int], None] = None,
+             set_max_callback: Callable[[int], None] = None) -> int:
+        """
+        Decompresses the files in parallel (zlib releases the GIL) and returns the number
+        of the cached files.
+        """
+        paths = [p for p in paths if self.is_compressed(p)]
+
+        if set_max_callback:
+            set_max_callback(len(paths))
+
+        cached_num = 0
+
+        with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+            for i, result in enumerate(executor.map(self._try_get, paths)):
+                cached_num += result
+                if process_callback:
+                    process_callback(i + 1)
+
+        return cached_num
+
+    def _try_get(self, path: Path) -> bool:
+        try:
+            self.get(path)
+            return True
+        except Exception as err:
+            logger.exception(err)
+            return False
+
+    def cleanup(self, keep: Path = None, max_size: int = None):
+        """Removes the least recently used files until the cache fits max_size (self.max_size by default)."""
+        if max_size is None:
+            max_size = self.max_size
+
+        with self._lock:
+            files = []
+            for p in self._cached_files():
+                try:
+                    files.append((p.stat(), p))
+                except FileNotFoundError:
+                    continue
+
+            self._size = sum(stat.st_size for stat, _ in files)
+
+            for stat, p in sorted(files, key=lambda item: item[0].st_mtime):
+                if self._size <= max_size:
+                    break
+                if p == keep:
+                    continue
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+                self._size -= stat.st_size
+
+    def clear(self):
+        with self._lock:
+            for p in self._cached_files():
+                try:
+                    p.unlink()
+                except OSError:
+                    continue
+            self._size = 0
+
+    def _cached_files(self) -> List[Path]:
+        return [p for p in self.folder.iterdir() if p.is_file() and not p.name.startswith('.')]
+
+
+def _decompress(path: Path, cached: Path) -> int:
+    # written to a temporary file first, so that the cache never contains partial files
+    tmp_path = cached.parent / f'.{cached.name}.{threading.get_ident()}.tmp'
+
+    try:
+        with gzip.open(str(path), 'rb') as src, open(str(tmp_path), 'wb') as dst:
+            shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(str(tmp_path), str(cached))
+    finally:
+        if tmp_path.is_file():
+            tmp_path.unlink()
+
+    return cached.stat().st_size
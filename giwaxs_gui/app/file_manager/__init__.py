@@ -4,9 +4,7 @@ from typing import List
 
 from h5py import Group
 
-from PyQt5.QtCore import pyqtSignal, QObject
-
-from .keys import (FolderKey, FolderH5Key, FolderPathKey, RemoveWeakrefs,
+from .keys import (FolderKey, FolderH5Key, FolderPathKey, KeyRegistry, key_registry,
                    ImageKey, ImageH5Key, ImagePathKey, InvalidKey,
                    PROJECT_KEY, IMAGE_PROJECT_KEY, GLOB_IMAGE_FORMATS)
 
@@ -19,27 +17,34 @@ from .read_meta_roi import _ReadMetaData
 from .read_radial_profile import _ReadRadialProfile
 from .config_manager import _GlobalConfigManager
 from .read_fits import _ReadFits
-
-
-class FileManager(QObject):
-    sigActiveImageChanged = pyqtSignal(object)
-    sigActiveFolderChanged = pyqtSignal(object)
-    sigProjectClosed = pyqtSignal()
-    sigProjectIsClosing = pyqtSignal()
-    sigProjectOpened = pyqtSignal()
-    sigNewFolder = pyqtSignal(object)
-    sigNewFile = pyqtSignal(object)
+from .write_behind import write_queue
+from ..signals import Signal
+from ..decompressed_cache import DecompressedCache
+from ..read_image import set_decompressed_cache
+
+
+class FileManager(object):
+    sigActiveImageChanged = Signal(object)
+    sigActiveFolderChanged = Signal(object)
+    sigProjectClosed = Signal()
+    sigProjectIsClosing = Signal()
+    sigProjectOpened = Signal()
+    sigNewFolder = Signal(object)
+    sigNewFile = Signal(object)
+    sigImageRemoved = Signal(object)
+    # files of the project that could not be written, {path: error}
+    sigSavingFailed = Signal(object)
 
     log = logging.getLogger(__name__)
 
     def __init__(self, config_path: Path = None):
-        QObject.__init__(self)
         self.config: _GlobalConfigManager = _GlobalConfigManager(config_path)
         self.recent_projects: List[Path] = self.config.get_project_paths()
         self._project_folder: Path or None = None
         self._project_structure: ProjectStructure = ProjectStructure()
         self.project_name: str = None
         self._current_key: ImageKey or None = None
+        self.decompressed_cache: DecompressedCache or None = None
 
         self.recent_projects = [p for p in self.recent_projects if p.is_dir()]
 
@@ -104,7 +109,9 @@ class FileManager(QObject):
         if isinstance(key, ImageKey):
             self._delete_image_data(key)
             if key.parent:
+                self._remove_from_meta_data(key)
                 key.parent.remove_image(key)
+                self.sigImageRemoved.emit(key)
         else:
             self._delete_folder(key)
         if self._current_key in key:
@@ -118,6 +125,13 @@ class FileManager(QObject):
 
         # TODO find all fits by image key (?)
 
+    def _remove_from_meta_data(self, key: ImageKey):
+        # roi meta data in memory (of the current folder) is updated by sigImageRemoved
+        meta_data = self.rois_meta_data[key.parent]
+        if meta_data:
+            meta_data.remove_image(key)
+            self.rois_meta_data[key.parent] = meta_data
+
     def _delete_folder(self, key: FolderKey):
         # TODO delete folder-level data
 
@@ -129,13 +143,24 @@ class FileManager(QObject):
     def close_project(self):
         if self.project_opened:
             self.sigProjectIsClosing.emit()
+            if not write_queue.flush():
+                self._report_failed_writes()
             self._project_structure.save_and_close()
+            self._set_decompressed_cache(None)
             if self._project_folder not in self.recent_projects:
                 self.recent_projects.append(self._project_folder)
             self._project_folder = None
             self.project_name = None
             self.sigProjectClosed.emit()
 
+    def _report_failed_writes(self):
+        failed = write_queue.pop_failed()
+        if not failed:
+            return
+        for path, err in failed.items():
+            self.log.error(f'Could not save {path}: {err}')
+        self.sigSavingFailed.emit(failed)
+
     def delete_project(self, project_path: Path):
         if self._project_folder == project_path:
             raise ValueError('Cannot delete opened project.')
@@ -158,17 +183,34 @@ class FileManager(QObject):
         self.fits: _ReadFits = _ReadFits(self._project_structure)
         self.profiles: _ReadRadialProfile = _ReadRadialProfile(self._project_structure)
         self.project_name = self._project_folder.name
+        self._init_decompressed_cache()
 
         for key in self._project_structure.root.folder_children:
             self.sigNewFolder.emit(key)
         for key in self._project_structure.root.image_children:
             self.sigNewFile.emit(key)
 
+    def _init_decompressed_cache(self):
+        # the size limit in bytes is stored in the config, 0 disables the cache
+        max_size = self.config['decompressed_cache_size']
+        if max_size is None:
+            max_size = DecompressedCache.DEFAULT_MAX_SIZE
+        if max_size:
+            try:
+                self._set_decompressed_cache(DecompressedCache(self._project_folder / 'decompressed', max_size))
+            except OSError as err:
+                self.log.exception(err)
+
+    def _set_decompressed_cache(self, cache: DecompressedCache or None):
+        self.decompressed_cache = cache
+        set_decompressed_cache(cache)
+
     def __len__(self):
         return len(self.paths)
 
     def close(self):
         self.close_project()
+        write_queue.flush()
         self.config.update_project_paths(self.recent_projects)
 
 
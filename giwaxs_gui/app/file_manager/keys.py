@@ -1,8 +1,9 @@
 import logging
 from pathlib import Path
-from typing import List, Union
+from typing import List
 import re
 import weakref
+import threading
 from abc import abstractmethod
 from copy import deepcopy
 
@@ -46,6 +47,38 @@ class AbstractKey(object):
     def __init__(self, parent=None, **kwargs):
         self._parent = weakref.ref(parent) if parent else None
 
+    def __getstate__(self):
+        # parents are not persisted, folders restore the parents of their children
+        state = self.__dict__.copy()
+        state['_parent'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        self._parent = None
+
+    def __deepcopy__(self, memo):
+        # copies within the process share the parent of the key
+        key = object.__new__(type(self))
+        memo[id(self)] = key
+        key.__setstate__(deepcopy(self.__getstate__(), memo))
+        key._parent = self._parent
+        return key
+
+    def ident(self) -> tuple:
+        """Immutable identifier of the key that does not depend on the parent."""
+        return (type(self),)
+
+    def clean_copy(self):
+        """Parent-free copy of the key, interned by key_registry."""
+        return key_registry.intern(self)
+
+    def _detached_copy(self):
+        key = object.__new__(type(self))
+        key.__dict__.update(self.__dict__)
+        key._parent = None
+        return key
+
     def file_name(self, name: str = '') -> str:
         return re.sub('[^\w\-_\. ]', '_', _file_name(self._file_key(), name))
 
@@ -123,9 +156,19 @@ class FolderKey(AbstractKey):
     def attach_subfolders(self, subfolders):
         self._folder_children = subfolders
 
-    def clean_copy(self):
-        with RemoveWeakrefs(self, restore=True, remove_subfolders=True):
-            return deepcopy(self)
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        # children are unpickled before their parent
+        ref = weakref.ref(self)
+        for key in self._image_children:
+            key._parent = ref
+        for key in self._folder_children:
+            key._parent = ref
+
+    def _detached_copy(self):
+        key = super()._detached_copy()
+        key._image_children, key._folder_children = [], []
+        return key
 
     def image_idx(self, key: 'ImageKey'):
         try:
@@ -178,9 +221,8 @@ class ImageKey(AbstractKey):
     def get_image(self):
         pass
 
-    def clean_copy(self):
-        with RemoveWeakrefs(self, restore=True):
-            return deepcopy(self)
+    def ident(self) -> tuple:
+        return super().ident() + (self.idx,)
 
     def __contains__(self, item):
         if self == item:
@@ -204,6 +246,9 @@ class PathKey(AbstractKey):
     def _file_key(self) -> str:
         return str(self._path.resolve())
 
+    def ident(self) -> tuple:
+        return super().ident() + (self._path,)
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return self._path == other._path
@@ -245,6 +290,9 @@ class H5Key(AbstractKey):
     def _file_key(self) -> str:
         return '-'.join((str(self._h5path.resolve()), self._h5key))
 
+    def ident(self) -> tuple:
+        return super().ident() + (self._h5path, self._h5key)
+
     def __eq__(self, other):
         if isinstance(other, self.__class__):
             return (self._h5path == other._h5path and
@@ -319,7 +367,7 @@ class FolderPathKey(FolderKey, PathKey):
                     self._folder_children.append(FolderPathKey(self, path=p))
                 elif p.suffix in H5_FORMAT:
                     self._folder_children.append(FolderH5Key(self, h5path=p))
-                elif p.suffix in AVAILABLE_IMAGE_FORMATS:
+                elif p.name.endswith(AVAILABLE_IMAGE_FORMATS):
                     self._image_children.append(ImagePathKey(self, path=p, idx=len(self._image_children)))
         except Exception as err:
             raise InvalidKey(err)
@@ -378,64 +426,32 @@ class ImageH5Key(ImageKey, H5Key):
             return False
 
 
-class RemoveWeakrefs(object):
-    def __init__(self, key: Union[FolderKey, ImageKey], *,
-                 remove_subfolders: bool = False,
-                 restore: bool = True):
-        self.__key = key
-        self.__parent = None
-        self.__remove_subfolders: bool = remove_subfolders
-        self.__restore: bool = restore
-        self.__subfolders: List[FolderKey] = []
-
-    def __enter__(self):
-        if self.__remove_subfolders:
-            try:
-                self.__subfolders = self.__key.detach_subfolders()
-            except AttributeError:
-                self.__remove_subfolders = False
-        self.__parent = self.remove(self.__key)
-        return self.__key
-
-    def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.__restore:
-            self.restore(self.__key, self.__parent)
-
-            if self.__remove_subfolders:
-                self.__key.attach_subfolders(self.__subfolders)
-        self.__subfolders = []
-        self.__parent = None
-
-    @staticmethod
-    def restore(key: Union[FolderKey, ImageKey], parent: FolderKey = None) -> None:
-        if parent:
-            key.set_parent(parent)
-        if isinstance(key, FolderKey):
-            _restore_parents(key, parent)
-
-    @staticmethod
-    def remove(key: Union[FolderKey, ImageKey]) -> FolderKey or None:
-        if isinstance(key, FolderKey):
-            _remove_parents(key)
-        return key.remove_parent()
-
-
-def _remove_parents(key: FolderKey):
-    for image_key in key.image_children:
-        image_key.remove_parent()
-
-    for folder_key in key.folder_children:
-        folder_key.remove_parent()
-        _remove_parents(folder_key)
-
-
-def _restore_parents(key: FolderKey, parent: FolderKey = None):
-    if parent:
-        key.set_parent(parent)
-
-    for image_key in key.image_children:
-        image_key.set_parent(key)
-
-    for folder_key in key.folder_children:
-        folder_key.set_parent(folder_key)
-        _restore_parents(folder_key)
+class KeyRegistry(object):
+    """
+    Interns the parent-free copies of the keys by their identifiers, so that the keys stored
+    in the roi meta data and fits are shared small objects that are pickled without their
+    parents and copied between threads as is. The copies are kept while they are referenced.
+    """
+
+    def __init__(self):
+        self._keys: 'weakref.WeakValueDictionary[tuple, AbstractKey]' = weakref.WeakValueDictionary()
+        self._lock = threading.Lock()
+
+    def intern(self, key: AbstractKey) -> AbstractKey:
+        ident = key.ident()
+
+        with self._lock:
+            detached = self._keys.get(ident)
+            if detached is None:
+                detached = self._keys[ident] = key._detached_copy()
+        return detached
+
+    def __len__(self):
+        return len(self._keys)
+
+    def clear(self):
+        with self._lock:
+            self._keys.clear()
+
+
+key_registry = KeyRegistry()
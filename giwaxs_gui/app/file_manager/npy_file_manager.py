@@ -6,6 +6,8 @@ from .object_file_manager import _ObjectFileManager
 
 
 class _ReadNpy(_ObjectFileManager):
+    WRITE_BEHIND = False
+
     @staticmethod
     def _set_pickle(path: Path, value):
         np.save(str(path.resolve()) + '.npy', value)
@@ -1,12 +1,14 @@
 import logging
 import pickle
 from pathlib import Path
+from typing import Iterable, Tuple
 
 from h5py import Group, File
 
 from ..utils import InternalError
 from .keys import ImageKey, AbstractKey, ImageH5Key
 from .project_structure import ProjectStructure
+from .write_behind import write_queue, DELETED
 
 
 def _check_empty_project(func):
@@ -23,6 +25,8 @@ class _ObjectFileManager(object):
     log = logging.getLogger(__name__)
 
     NAME = ''
+    # files are written by the write-behind queue, reads see the pending writes
+    WRITE_BEHIND: bool = True
 
     def __init__(self, project_structure: ProjectStructure):
         self.project_structure = project_structure
@@ -39,20 +43,27 @@ class _ObjectFileManager(object):
     def _get_path(self, key: AbstractKey) -> Path:
         return self.folder / key.file_name()
 
-    @staticmethod
-    def _set_pickle(path: Path, value):
+    def _set_pickle(self, path: Path, value):
+        if self.WRITE_BEHIND:
+            write_queue.put(path, pickle.dumps(value))
+            return
         with open(str(path.resolve()), 'wb') as f:
             pickle.dump(value, f)
 
-    @staticmethod
-    def _get_pickle(path: Path):
+    def _get_pickle(self, path: Path):
+        if self.WRITE_BEHIND:
+            pending, data = write_queue.get(path)
+            if pending:
+                return pickle.loads(data) if data is not DELETED else None
+
         if path.is_file():
             with open(str(path.resolve()), 'rb') as f:
                 return pickle.load(f)
 
-    @staticmethod
-    def _del_pickle(path: Path):
-        if path.is_file():
+    def _del_pickle(self, path: Path):
+        if self.WRITE_BEHIND:
+            write_queue.delete(path)
+        elif path.is_file():
             path.unlink()
 
     @staticmethod
@@ -75,3 +86,8 @@ class _ObjectFileManager(object):
 
     def __setitem__(self, key, value):
         return self._set_pickle(self._get_path(key), value)
+
+    def set_many(self, items: Iterable[Tuple[AbstractKey, object]]):
+        """Writes several objects at once, the files are written by the write-behind queue."""
+        for key, value in items:
+            self[key] = value
@@ -5,7 +5,7 @@ import logging
 from pathlib import Path
 
 from .keys import (AbstractKey, FolderKey, FolderH5Key, FolderPathKey,
-                   ImageKey, ImagePathKey, H5_FORMAT, RemoveWeakrefs,
+                   ImageKey, ImagePathKey, H5_FORMAT,
                    AVAILABLE_IMAGE_FORMATS)
 
 
@@ -37,6 +37,9 @@ class ProjectRootKey(FolderKey):
     def _file_key(self) -> str:
         return self.name
 
+    def ident(self) -> tuple:
+        return super().ident() + (self.path, self.h5_path)
+
     @property
     def name(self):
         return self._project_name
@@ -50,7 +53,7 @@ class ProjectRootKey(FolderKey):
             key = FolderPathKey(self, path=path)
             self._folder_children.append(key)
             return key
-        elif path.is_file() and path.suffix in AVAILABLE_IMAGE_FORMATS:
+        elif path.is_file() and path.name.endswith(AVAILABLE_IMAGE_FORMATS):
             key = ImagePathKey(self, path=path)
             self._image_children.append(key)
             return key
@@ -100,11 +103,11 @@ class ProjectStructure(object):
     def root(self) -> ProjectRootKey or None:
         return self._root
 
-    def save(self, restore: bool = True):
+    def save(self):
         if self.path and self.root and self.path.is_dir():
-            with RemoveWeakrefs(self.root, restore=restore):
-                with open(str(self.path.resolve() / 'project_structure'), 'wb') as f:
-                    pickle.dump(self.root, f)
+            # keys are pickled without their parents
+            with open(str(self.path.resolve() / 'project_structure'), 'wb') as f:
+                pickle.dump(self.root, f)
 
     def open_project(self, path: Path):
         self.close_project()
@@ -122,7 +125,6 @@ class ProjectStructure(object):
             try:
                 with open(str(pickle_file.resolve()), 'rb') as f:
                     self._root = pickle.load(f)
-                RemoveWeakrefs.restore(self._root)
             except Exception as err:
                 pickle_file.unlink()
                 self.log.exception(err)
@@ -131,7 +133,7 @@ class ProjectStructure(object):
             self._root = ProjectRootKey(project_path=self.path)
 
     def save_and_close(self):
-        self.save(False)
+        self.save()
         self.close_project()
 
     def close_project(self):
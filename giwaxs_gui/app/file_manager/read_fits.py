@@ -2,7 +2,7 @@ from datetime import datetime as dt
 from pathlib import Path
 
 from .object_file_manager import _ObjectFileManager
-from .keys import RemoveWeakrefs
+from .write_behind import write_queue
 
 # TODO save fits to h5
 
@@ -63,11 +63,8 @@ class MultiFitFileManager(_ObjectFileManager):
             fit_object.image_key = item
             return fit_object
 
-    def __setitem__(self, key, value):
-        with RemoveWeakrefs(value.image_key):
-            super().__setitem__(key, value)
-
     def delete(self):
+        write_queue.flush()
         for path in self.folder.iterdir():
             path.unlink()
         self.folder.rmdir()
@@ -5,9 +5,23 @@ from .keys import FolderKey
 from ..geometry import Geometry
 
 
-class _DefaultGeometry(_ObjectFileManager):
+class _GeometryFileManager(_ObjectFileManager):
+    """Stores the geometry parameters only, the grids are computed on access."""
+
     NAME = 'geometries'
 
+    def __getitem__(self, key) -> Geometry or None:
+        params = super().__getitem__(key)
+        if isinstance(params, dict):
+            return Geometry.fromdict(params)
+        # geometry objects pickled by the previous versions
+        return params
+
+    def __setitem__(self, key, value: Geometry):
+        return super().__setitem__(key, value.to_dict())
+
+
+class _DefaultGeometry(_GeometryFileManager):
     def _get_path(self, key: FolderKey):
         return self.folder / f'default_geometry_{key.name}'
 
@@ -26,9 +40,7 @@ class _DefaultGeometry(_ObjectFileManager):
                 del h5group.attrs[key]
 
 
-class _ReadGeometry(_ObjectFileManager):
-    NAME = 'geometries'
-
+class _ReadGeometry(_GeometryFileManager):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.default = _DefaultGeometry(*args, **kwargs)
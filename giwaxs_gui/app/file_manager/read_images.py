@@ -1,6 +1,7 @@
 from h5py import Group
 
 from .npy_file_manager import _ReadNpy
+from ..profiling import timed
 
 
 class _ReadImage(_ReadNpy):
@@ -20,6 +21,7 @@ class _ReadImage(_ReadNpy):
         if 'image' in h5group.keys():
             del h5group['image']
 
+    @timed('image read')
     def __getitem__(self, key):
         internal_path = self._get_path(key)
         if internal_path.is_file():
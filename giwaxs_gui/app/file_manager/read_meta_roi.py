@@ -1,7 +1,7 @@
 from h5py import Group
 
 from .object_file_manager import _ObjectFileManager
-from .keys import RemoveWeakrefs, FolderKey
+from .keys import FolderKey
 
 
 # dirty way to handle circular import
@@ -26,10 +26,6 @@ class _ReadMetaData(_ObjectFileManager):
             roi_meta_data.folder_key = item.clean_copy()
         return roi_meta_data
 
-    def __setitem__(self, key: FolderKey, value):
-        with RemoveWeakrefs(value.folder_key):
-            super().__setitem__(key, value)
-
     @staticmethod
     def get_h5(h5group: Group, key: FolderKey):
         return ImportManager.RoiMetaData().from_h5(key, h5group)
@@ -1,5 +1,7 @@
 import logging
+from enum import Enum
 
+import numpy as np
 from h5py import Group
 
 from .object_file_manager import _ObjectFileManager
@@ -29,7 +31,7 @@ class _ReadRoiData(_ObjectFileManager):
         roi_group = h5group.create_group('roi_data')
         for key, arr in rois_dict.items():
             try:
-                roi_group.create_dataset(key, data=arr)
+                roi_group.create_dataset(key, data=_to_h5_array(arr))
             except Exception as err:
                 logger.exception(err)
 
@@ -37,3 +39,29 @@ class _ReadRoiData(_ObjectFileManager):
     def del_h5(h5group: Group, key):
         if 'roi_data' in h5group.keys():
             del h5group['roi_data']
+
+
+def _to_h5_array(arr: np.ndarray) -> np.ndarray:
+    """
+    Converts the columns of fitted parameters to h5 types: strings and enums to byte
+    strings, sequences to float rows padded by nan. Missing values (rois without
+    fits) become empty strings or nan rows.
+    """
+    if arr.dtype.kind == 'U':
+        return np.char.encode(arr)
+    if arr.dtype != object:
+        return arr
+
+    values = [v.value if isinstance(v, Enum) else v for v in arr]
+
+    if any(isinstance(v, str) for v in values):
+        return np.array([v.encode() if isinstance(v, str) else b'' for v in values])
+
+    rows = [np.atleast_1d(np.asarray(v, dtype=float)).ravel() if v is not None else np.empty(0)
+            for v in values]
+    res = np.full((len(rows), max(row.size for row in rows)), np.nan)
+    for i, row in enumerate(rows):
+        # a single nan is the missing value of RoiData.to_dict
+        if not (row.size == 1 and np.isnan(row[0])):
+            res[i, :row.size] = row
+    return res
@@ -0,0 +1,138 @@
+"""
+Write-behind queue of the project files.
+
+Objects are pickled by the caller (so that the written state is the state at the time
+of saving), and the files are written by a background thread. Repeated writes of
+the same file are coalesced, reads of pending files return the pending data.
+The queue is flushed when the project is closed, on uncaught exceptions and at exit.
+Files that could not be written keep their data (served by get) and are retried on
+the next put or flush until they are written successfully or taken by pop_failed.
+"""
+
+import os
+import atexit
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Tuple
+
+__all__ = ['WriteBehindQueue', 'write_queue', 'DELETED']
+
+logger = logging.getLogger(__name__)
+
+# pending data of the files to be deleted
+DELETED = None
+
+
+class WriteBehindQueue(object):
+    def __init__(self):
+        self._pending: Dict[Path, bytes or None] = {}
+        self._writing: Dict[Path, bytes or None] = {}
+        # data and error of the files that could not be written
+        self._failed: Dict[Path, Tuple[bytes or None, Exception]] = {}
+        self._cond = threading.Condition()
+        self._thread: threading.Thread or None = None
+
+    @property
+    def pending_num(self) -> int:
+        with self._cond:
+            return len(self._pending) + len(self._writing)
+
+    @property
+    def failed(self) -> Dict[Path, Exception]:
+        with self._cond:
+            return {path: err for path, (_, err) in self._failed.items()}
+
+    def put(self, path: Path, data: bytes or None):
+        """Schedules writing data to path (or deleting the file if data is DELETED)."""
+        with self._cond:
+            self._failed.pop(path, None)
+            self._retry_failed()
+            self._pending[path] = data
+            self._start()
+            self._cond.notify_all()
+
+    def delete(self, path: Path):
+        self.put(path, DELETED)
+
+    def get(self, path: Path) -> Tuple[bool, bytes or None]:
+        """Returns (True, data) if the file is pending or failed, else (False, None)."""
+        with self._cond:
+            for files in (self._pending, self._writing):
+                if path in files:
+                    return True, files[path]
+            if path in self._failed:
+                return True, self._failed[path][0]
+        return False, None
+
+    def flush(self, timeout: float = None) -> bool:
+        """
+        Waits until all the pending files (including the failed ones, which are retried)
+        are written. Returns False on timeout or if some of the files have failed again.
+        """
+        with self._cond:
+            if self._failed:
+                self._retry_failed()
+                self._start()
+                self._cond.notify_all()
+            return (self._cond.wait_for(lambda: not self._pending and not self._writing, timeout)
+                    and not self._failed)
+
+    def pop_failed(self) -> Dict[Path, Exception]:
+        """Returns the failed files with their errors, their data is dropped."""
+        with self._cond:
+            failed, self._failed = self._failed, {}
+        return {path: err for path, (_, err) in failed.items()}
+
+    def _retry_failed(self):
+        for path, (data, _) in self._failed.items():
+            self._pending.setdefault(path, data)
+        self._failed = {}
+
+    def _start(self):
+        if not self._thread or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending)
+                path = next(iter(self._pending))
+                data = self._writing[path] = self._pending.pop(path)
+
+            error = None
+            try:
+                _write(path, data)
+            except Exception as err:
+                logger.exception(err)
+                error = err
+
+            with self._cond:
+                del self._writing[path]
+                if error is not None and path not in self._pending:
+                    self._failed[path] = data, error
+                self._cond.notify_all()
+
+
+def _write(path: Path, data: bytes or None):
+    if data is DELETED:
+        if path.is_file():
+            path.unlink()
+        return
+
+    # a file is never left partially written
+    tmp_path = path.parent / f'.{path.name}.tmp'
+    try:
+        with open(str(tmp_path), 'wb') as f:
+            f.write(data)
+        os.replace(str(tmp_path), str(path))
+    except Exception:
+        if tmp_path.is_file():
+            tmp_path.unlink()
+        raise
+
+
+write_queue = WriteBehindQueue()
+
+atexit.register(write_queue.flush)
@@ -2,4 +2,5 @@ from .functions import FittingType, FITTING_FUNCTIONS
 from .background import BackgroundType
 from .fit import Fit
 from .fit_object import FitObject
+from .polar_window import PolarWindows, PolarWindow, WindowParams, remap_window
 from .range_strategy import RangeStrategy, RangeStrategyType
@@ -11,6 +11,7 @@ from .functions import FittingFunction
 from .background import Background
 from .utils import Roi
 from .range_strategy import RangeStrategy
+from ..profiling import timed
 
 
 @dataclass
@@ -36,6 +37,8 @@ class Fit:
     background: Background
     range_strategy: RangeStrategy
     sigma: float = None
+    # read-only profiles of the polar image shared by the fits; x and y are their views
+    # in x_range, or the profiles of the polar window of the roi if polar windows are set
     x_profile: np.ndarray = None
     y_profile: np.ndarray = None
 
@@ -75,6 +78,7 @@ class Fit:
         if update:
             self.update_fit()
 
+    @timed('fit')
     def do_fit(self) -> None:
         if not self.y.size or not self.x.size:
             return
@@ -1,4 +1,4 @@
-from typing import Type
+from typing import Type, Tuple
 from copy import deepcopy
 
 import numpy as np
@@ -8,6 +8,7 @@ from ..app import App
 from .background import *
 from .functions import *
 from .fit import Fit
+from .polar_window import PolarWindows
 from .utils import _get_dummy_bounds, Roi
 from .range_strategy import RangeStrategy, RangeStrategyType
 
@@ -18,6 +19,9 @@ class FitHolder(object):
     def __init__(self):
         self.app = App()
         self.polar_image = None
+        self.polar_windows: PolarWindows or None = None
+        # the last segment profile ((p1, p2), profile), shared by the fits while the angles are not changed
+        self._segment_profile: Tuple[Tuple[int, int], np.ndarray] or None = None
         self.fit = None
         self.default_fitting: Type[FittingFunction] = Gaussian
         self.default_background: Type[Background] = LinearBackground
@@ -36,10 +40,14 @@ class FitHolder(object):
         self.r_delta = (self.r_axis.max() - self.r_axis.min()) / self.r_axis.size
         self.min_range: float = self.r_delta * self.MINIMAL_NUM
         self.phi_delta = (self.phi_axis.max() - self.phi_axis.min()) / self.phi_axis.size
-        self.r_profile = self.polar_image.sum(axis=0)
+        self.r_profile = _read_only(self.polar_image.sum(axis=0))
+        self._segment_profile = None
         self.aspect_ratio = self._aspect_ratio()
         self.bounds = self._bounds()
 
+        raw_image = self.app.image_holder.raw_image
+        self.polar_windows = PolarWindows(raw_image, self.app.geometry) if raw_image is not None else None
+
     # fit methods:
 
     def new_fit(self, roi: Roi):
@@ -88,20 +96,15 @@ class FitHolder(object):
             self._get_r_coords(r2_large),
         )
 
-        x, y, x_profile, y_profile = self._get_x_y(roi, x1l, x2l)
-
-        y_size = y_profile.size
-        y_profile_corrected = y_profile - (
-                y_profile[0] + (y_profile[-1] - y_profile[0]) / y_size * np.linspace(0, y_size, y_size)
-        )
+        # only the padded range of the profile is corrected, y_corrected[0] is at x1l
+        start = x1l
+        y_corrected = _detrend_and_smooth(self._get_profile(roi), x1l, x2l, 2)
 
-        y_profile_corrected = gaussian_filter1d(y_profile_corrected, 2)
-
-        left_indices = np.where(np.diff(np.sign(np.diff(y_profile_corrected[x1l:x1]))) > 0)[0]
+        left_indices = np.where(np.diff(np.sign(np.diff(y_corrected[:x1 - start]))) > 0)[0]
         if left_indices.size:
             x1l = x1l + left_indices[-1]
 
-        right_indices = np.where(np.diff(np.sign(np.diff(y_profile_corrected[x2:x2l]))) > 0)[0]
+        right_indices = np.where(np.diff(np.sign(np.diff(y_corrected[x2 - start:]))) > 0)[0]
         if right_indices.size:
             x2l = x2 + right_indices[0]
 
@@ -126,7 +129,7 @@ class FitHolder(object):
             r1, r2 = params['r_range']
 
         x1, x2 = self._get_r_coords(r1), self._get_r_coords(r2)
-        x, y, x_profile, y_profile = self._get_x_y(roi, x1, x2)
+        x, y, x_profile, y_profile = self._get_x_y(roi, x1, x2, r_range=(r1, r2))
 
         if 'background' in params:
             background: Background = BACKGROUNDS[params['background']]()
@@ -221,8 +224,8 @@ class FitHolder(object):
             fit.r_range = r1, r2 = self._get_r_range(fit.roi, fit.range_strategy.range_factor)
         else:
             r1, r2 = fit.r_range
-        x1, x2 = self._get_r_coords(r1), self._get_r_coords(r2)
-        fit.x, fit.y, fit.x_profile, fit.y_profile = self._get_x_y(fit.roi, x1, x2)
+        fit.x_range = x1, x2 = self._get_r_coords(r1), self._get_r_coords(r2)
+        fit.x, fit.y, fit.x_profile, fit.y_profile = self._get_x_y(fit.roi, x1, x2, r_range=(r1, r2))
 
         if update_fit:
             fit.update_fit(**kwargs)
@@ -233,24 +236,35 @@ class FitHolder(object):
         r1, r2 = roi.radius - roi.width * (factor + 1), roi.radius + roi.width * (factor + 1)
         return min(r1, roi.radius - self.min_range / 2), max(r2, roi.radius + self.min_range / 2)
 
-    def _get_x_y(self, roi: Roi, x1: int, x2: int):
-        x_profile = self.r_axis.copy()
-        x = x_profile[x1:x2]
-
-        if not roi.has_fixed_angles():
-            y_profile = self.r_profile.copy()
-        else:
-            p1, p2 = self._get_p_coords(roi.angle - roi.angle_std / 2), \
-                     self._get_p_coords(roi.angle + roi.angle_std / 2)
-            y_profile = self.polar_image[max(0, p1):min(p2, self.phi_axis.size - 1)].sum(axis=0)
-
-        y = y_profile[x1:x2]
+    def _get_x_y(self, roi: Roi, x1: int, x2: int, r_range: tuple = None):
+        # x and y are views of the shared read-only profiles, nothing of the profile size is copied
+        x_profile = self.r_axis
+        y_profile = self._get_profile(roi)
+        x, y = x_profile[x1:x2], y_profile[x1:x2]
 
         if x.size != y.size:
             raise ValueError(f'x.size != y.size: {x.size} != {y.size}')
 
+        if self.polar_windows is not None and r_range:
+            # the profiles are shown as is, the fits are made on the high resolution windows
+            x_y = self.polar_windows.get_x_y(roi, r_range)
+            if x_y:
+                x, y = x_y
+
         return x, y, x_profile, y_profile
 
+    def _get_profile(self, roi: Roi) -> np.ndarray:
+        if not roi.has_fixed_angles():
+            return self.r_profile
+
+        p1, p2 = self._get_p_coords(roi.angle - roi.angle_std / 2), \
+                 self._get_p_coords(roi.angle + roi.angle_std / 2)
+        p_range = max(0, p1), min(p2, self.phi_axis.size - 1)
+
+        if not self._segment_profile or self._segment_profile[0] != p_range:
+            self._segment_profile = p_range, _read_only(self.polar_image[slice(*p_range)].sum(axis=0))
+        return self._segment_profile[1]
+
     def _get_r_coords(self, r):
         r = np.clip(r, self.r_axis.min(), self.r_axis.max())
         return int(round((r - self.r_axis.min()) / self.r_delta))
@@ -269,3 +283,21 @@ class FitHolder(object):
     def _bounds(self):
         p = self.phi_axis
         return (p.max() + p.min()) / 2, (p.max() - p.min())
+
+
+def _detrend_and_smooth(profile: np.ndarray, start: int, stop: int, sigma: float) -> np.ndarray:
+    """
+    profile[start:stop] with the linear trend between the edges of the whole profile subtracted,
+    smoothed by a gaussian filter. The filter is applied to the range padded by its radius,
+    so that the result equals the slice of the whole corrected and smoothed profile.
+    """
+    size = profile.size
+    pad = int(4 * sigma + 0.5)
+    lo, hi = max(start - pad, 0), min(stop + pad, size)
+    trend = profile[0] + (profile[-1] - profile[0]) / max(size - 1, 1) * np.arange(lo, hi)
+    return gaussian_filter1d(profile[lo:hi] - trend, sigma)[start - lo:stop - lo]
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
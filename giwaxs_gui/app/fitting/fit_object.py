@@ -8,6 +8,7 @@ from ..utils import smooth_curve, baseline_correction
 from .background import *
 from .functions import *
 from .fit import Fit
+from .polar_window import PolarWindows
 from .utils import _get_dummy_bounds, Roi, RoiTypes
 from .range_strategy import RangeStrategy, RangeStrategyType
 
@@ -39,10 +40,26 @@ class FitObject(object):
         self.default_background: Type[Background] = LinearBackground
         self.default_range_strategy: RangeStrategy = RangeStrategy()
         self.default_sigma: float = 0
+        self.polar_windows: PolarWindows or None = None
 
         if saved_profile:
             self.set_profile(saved_profile, update_baseline)
 
+    def __getstate__(self):
+        # windows are cached data of the detector image, they are not pickled
+        state = self.__dict__.copy()
+        state['polar_windows'] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        self.polar_windows = None
+        self.__dict__.update(state)
+
+    def set_polar_windows(self, polar_windows: PolarWindows or None):
+        """Fits are made on the high resolution windows of the detector image if they are set."""
+        self.polar_windows = polar_windows
+        self.update_fit_data(update_r_range=False, update_fit=True)
+
     # profile methods:
 
     def set_profile(self, saved_profile: SavedProfile, update_baseline: bool = False):
@@ -98,7 +115,7 @@ class FitObject(object):
         r1, r2 = self._get_r_range(roi, self.default_range_strategy.range_factor)
 
         x1, x2 = self._get_r_coords(r1), self._get_r_coords(r2)
-        x, y = self._get_x_y(roi, x1, x2)
+        x, y = self._get_x_y(roi, x1, x2, r_range=(r1, r2))
 
         background: Background = self.default_background()
         function: FittingFunction = self.default_fitting()
@@ -195,7 +212,7 @@ class FitObject(object):
         else:
             r1, r2 = fit.r_range
         x1, x2 = self._get_r_coords(r1), self._get_r_coords(r2)
-        fit.x, fit.y = self._get_x_y(fit.roi, x1, x2, fit.sigma)
+        fit.x, fit.y = self._get_x_y(fit.roi, x1, x2, fit.sigma, r_range=(r1, r2))
 
         if update_fit:
             fit.update_fit(**kwargs)
@@ -215,7 +232,12 @@ class FitObject(object):
         r1, r2 = roi.radius - roi.width * (factor + 1), roi.radius + roi.width * (factor + 1)
         return min(r1, roi.radius - self.min_range / 2), max(r2, roi.radius + self.min_range / 2)
 
-    def _get_x_y(self, roi: Roi, x1: int, x2: int, sigma: float = None):
+    def _get_x_y(self, roi: Roi, x1: int, x2: int, sigma: float = None, r_range: tuple = None):
+        if self.polar_windows is not None and r_range:
+            x_y = self._get_window_x_y(roi, r_range, sigma)
+            if x_y:
+                return x_y
+
         x = self.r_axis[x1:x2]
 
         if not roi.has_fixed_angles():
@@ -223,6 +245,8 @@ class FitObject(object):
                 y = self.r_profile[x1:x2]
             else:
                 y = smooth_curve(self.polar_image[:, x1:x2].sum(axis=0), sigma)
+                if self._baseline is not None:
+                    y = y - self._baseline[x1:x2]
         else:
             if sigma is None:
                 sigma = self.default_sigma
@@ -232,6 +256,20 @@ class FitObject(object):
 
         return x, y
 
+    def _get_window_x_y(self, roi: Roi, r_range: tuple, sigma: float = None):
+        x_y = self.polar_windows.get_x_y(roi, r_range, self.default_sigma if sigma is None else sigma)
+
+        # as the profiles of the polar image, ring profiles are baseline corrected
+        # whatever the sigma, the baseline of the ring profile does not apply to segments
+        if x_y and not roi.has_fixed_angles() and self._baseline is not None:
+            x, y = x_y
+            return x, y - np.interp(x, self.r_axis, self._baseline)
+        return x_y
+
+    @property
+    def _baseline(self) -> np.ndarray or None:
+        return self.saved_profile.baseline if self.saved_profile else None
+
     def _get_r_coords(self, r):
         return int((r - self.r_axis.min()) / self.r_delta)
 
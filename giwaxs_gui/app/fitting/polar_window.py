@@ -0,0 +1,137 @@
+"""
+High resolution polar images of the fitting windows.
+
+The resolution of the polar image is limited by InterpolationParams.shape, so that a narrow
+peak gets a few r bins only. Instead of slicing it, fits remap the (r, phi) window of
+the roi from the detector image to a grid of a fixed size (WindowParams). The windows
+are cached per roi by PolarWindows, which is created per image and geometry.
+"""
+
+from typing import Tuple, Dict, NamedTuple
+
+import cv2
+import numpy as np
+
+from ..geometry import Geometry
+from ..polar_image import _remap_source
+from ..profiling import timed
+from ..utils import smooth_curve
+from .utils import Roi
+
+__all__ = ['WindowParams', 'PolarWindow', 'PolarWindows', 'remap_window']
+
+
+class WindowParams(NamedTuple):
+    r_size: int = 256
+    phi_size: int = 128
+    algorithm: int = cv2.INTER_LINEAR
+
+
+class PolarWindow(NamedTuple):
+    # scaled as geometry.r_axis
+    r_axis: np.ndarray
+    # degrees as geometry.phi_axis
+    phi_axis: np.ndarray
+    # (phi, r) as the polar image
+    image: np.ndarray
+
+
+@timed('polar window remap')
+def remap_window(image: np.ndarray, geometry: Geometry,
+                 r_range: Tuple[float, float], phi_range: Tuple[float, float],
+                 params: WindowParams = WindowParams(), *,
+                 transformed: bool = False) -> PolarWindow or None:
+    """
+    Polar image of the window of the detector image. The image is raw (the transformations
+    of the geometry are applied to the remap coordinates) unless transformed is True.
+    """
+    scale = geometry.scale
+    beam_center = geometry.beam_center
+
+    r = np.linspace(r_range[0] / scale, r_range[1] / scale, params.r_size)
+    phi = np.radians(np.linspace(*phi_range, params.phi_size))
+
+    x = r[np.newaxis, :] * np.cos(phi)[:, np.newaxis] + beam_center.y
+    y = r[np.newaxis, :] * np.sin(phi)[:, np.newaxis] + beam_center.z
+
+    if not transformed:
+        x, y = geometry.t.raw_coordinates(x, y, geometry.shape)
+
+    try:
+        polar_image = cv2.remap(_remap_source(image), x.astype(np.float32), y.astype(np.float32),
+                                interpolation=params.algorithm)
+    except cv2.error:
+        return
+
+    return PolarWindow(r * scale, np.degrees(phi), polar_image)
+
+
+class PolarWindows(object):
+    """
+    Windows of the fits of a single image and geometry, a window is cached per roi key
+    and is remapped again only if the r range or the angles of the roi are changed.
+    """
+
+    def __init__(self, image: np.ndarray, geometry: Geometry,
+                 params: WindowParams = None, *, transformed: bool = False):
+        self.image = image
+        self.geometry = geometry.copy()
+        self.params = params or WindowParams()
+        self.transformed = transformed
+
+        r_axis, phi_axis = self.geometry.r_axis, self.geometry.phi_axis
+        self.r_delta = (r_axis.max() - r_axis.min()) / r_axis.size
+        self.phi_delta = (phi_axis.max() - phi_axis.min()) / phi_axis.size
+        self.phi_range = phi_axis.min(), phi_axis.max()
+
+        self._windows: Dict[int, Tuple[tuple, PolarWindow]] = {}
+
+    def __len__(self):
+        return len(self._windows)
+
+    def clear(self):
+        self._windows.clear()
+
+    def get(self, roi_key: int, r_range: Tuple[float, float],
+            phi_range: Tuple[float, float]) -> PolarWindow or None:
+        window_range = tuple(r_range), tuple(phi_range)
+        cached = self._windows.get(roi_key)
+
+        if cached and cached[0] == window_range:
+            return cached[1]
+
+        window = remap_window(self.image, self.geometry, r_range, phi_range,
+                              self.params, transformed=self.transformed)
+        if window is not None:
+            self._windows[roi_key] = window_range, window
+        return window
+
+    def get_x_y(self, roi: Roi, r_range: Tuple[float, float],
+                sigma: float = 0) -> Tuple[np.ndarray, np.ndarray] or None:
+        """
+        Radial profile of the roi window. Profiles are scaled to the sums over the rows
+        of the polar image, and sigma is given in its r bins, so that the fits
+        of the windows and of the polar image are comparable.
+        """
+        if roi.has_fixed_angles():
+            p_min, p_max = self.phi_range
+            phi_range = (max(roi.angle - roi.angle_std / 2, p_min),
+                         min(roi.angle + roi.angle_std / 2, p_max))
+        else:
+            phi_range = self.phi_range
+
+        window = self.get(roi.key, r_range, phi_range)
+
+        if window is None:
+            return
+
+        r_size, phi_size = window.r_axis.size, window.phi_axis.size
+        phi_ratio = (phi_range[1] - phi_range[0]) / phi_size / self.phi_delta
+        r_ratio = self.r_delta / ((r_range[1] - r_range[0]) / r_size or self.r_delta)
+
+        y = window.image.sum(axis=0) * phi_ratio
+
+        if sigma:
+            y = smooth_curve(y, sigma * r_ratio)
+
+        return window.r_axis, y
@@ -1,5 +1,7 @@
-from typing import Tuple, NamedTuple
-from copy import deepcopy
+import threading
+import weakref
+from functools import lru_cache
+from typing import Tuple, NamedTuple, Dict
 
 import numpy as np
 
@@ -32,7 +34,86 @@ class BeamCenter(NamedTuple):
     y: float = 0
 
 
+class _Ranges(NamedTuple):
+    y: np.ndarray
+    z: np.ndarray
+    r_range: Tuple[float, float]
+    phi_range: Tuple[float, float]
+    ring_bounds: Tuple[float, float]
+
+
+class _PolarGrids(object):
+    """Unscaled polar grids shared by all the geometries with the same parameters (read-only)."""
+
+    def __init__(self, ranges: _Ranges, polar_shape: Tuple[int, int], beam_center: BeamCenter):
+        r = np.linspace(*ranges.r_range, polar_shape[1])
+        phi = np.linspace(*ranges.phi_range, polar_shape[0])
+
+        r_matrix = r[np.newaxis, :].repeat(polar_shape[0], axis=0)
+        p_matrix = phi[:, np.newaxis].repeat(polar_shape[1], axis=1)
+
+        self.yy = _read_only(r_matrix * np.cos(p_matrix) + beam_center.y)
+        self.zz = _read_only(r_matrix * np.sin(p_matrix) + beam_center.z)
+        self.r = _read_only(r)
+        self.phi = _read_only(phi * (180 / np.pi))
+        self.aspect_ratio = (self.phi.max() - self.phi.min()) * \
+                            polar_shape[0] / (ranges.r_range[1] - ranges.r_range[0]) / polar_shape[1]
+        # t key -> float32 grids in the raw image coordinates
+        self.raw: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+
+def _read_only(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+@lru_cache(maxsize=16)
+def _get_ranges(beam_center: BeamCenter, shape: Tuple[int, int]) -> _Ranges:
+    y = np.arange(shape[1]) - beam_center.y
+    z = np.arange(shape[0]) - beam_center.z
+
+    yy, zz = np.meshgrid(y, z)
+    rr = np.sqrt(yy ** 2 + zz ** 2)
+    phi = np.arctan2(zz, yy)
+    p_min, p_max = phi.min(), phi.max()
+    angle, angle_std = (p_max + p_min) / 2 * 180 / np.pi, (p_max - p_min) * 180 / np.pi
+    return _Ranges(_read_only(y), _read_only(z), (rr.min(), rr.max()), (p_min, p_max), (angle, angle_std))
+
+
+# polar grids are shared while they are used by a geometry, and freed with the last one
+_polar_grids_cache: 'weakref.WeakValueDictionary[tuple, _PolarGrids]' = weakref.WeakValueDictionary()
+_polar_grids_lock = threading.Lock()
+
+
+def _get_polar_grids(beam_center: BeamCenter, shape: Tuple[int, int], polar_shape: Tuple[int, int]) -> _PolarGrids:
+    key = beam_center, shape, polar_shape
+
+    with _polar_grids_lock:
+        grids = _polar_grids_cache.get(key)
+
+    if grids is None:
+        grids = _PolarGrids(_get_ranges(beam_center, shape), polar_shape, beam_center)
+        with _polar_grids_lock:
+            grids = _polar_grids_cache.setdefault(key, grids)
+    return grids
+
+
+class _ScaledAxes(NamedTuple):
+    scale: float
+    r: np.ndarray
+    y: np.ndarray
+    z: np.ndarray
+
+
 class Geometry(object):
+    """
+    Geometry parameters (beam center, scale, image and polar shapes and transformations).
+
+    The axes and the polar grids are derived data: they are computed on access, shared
+    by the geometries with the same parameters and replaced (never modified) when
+    the parameters are changed, so that copies are cheap. Only the parameters are pickled.
+    """
+
     def __init__(self, *, beam_center: tuple = (0, 0),
                  scale: float = 1.,
                  shape: Tuple[int, int] = (10, 10),
@@ -45,19 +126,14 @@ class Geometry(object):
         self._transforms = TransformationsHolder()
         if t_key:
             self._transforms.update(t_key)
-        self._shape = tuple(shape)
+        self._shape = tuple(shape) if shape is not None else None
         self._polar_shape = tuple(polar_shape)
+        self._reset()
 
-        self._r_range = (0, 1)
-        self._phi_range = (0, 2 * np.pi)
-        self._ring_bounds = (0, 2 * np.pi)
-        self._r = self._phi = None
-        self._y = self._z = None
-        self._polar_zz = self._polar_yy = None
-        self._polar_aspect_ratio = None
-
-        if update:
-            self.update()
+    def _reset(self):
+        self._ranges: _Ranges or None = None
+        self._grids: _PolarGrids or None = None
+        self._axes: _ScaledAxes or None = None
 
     def to_dict(self) -> dict:
         return dict(beam_center=tuple(self.beam_center),
@@ -85,15 +161,61 @@ class Geometry(object):
         return self._transforms
 
     def copy(self) -> 'Geometry':
-        return deepcopy(self)
+        geometry = Geometry.fromdict(self.to_dict())
+        geometry._scale._prev_scale = self._scale._prev_scale
+        # derived data is immutable and shared by the copy
+        geometry._ranges, geometry._grids, geometry._axes = self._ranges, self._grids, self._axes
+        return geometry
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        return self.copy()
+
+    def __getstate__(self):
+        return self.to_dict()
+
+    def __setstate__(self, state: dict):
+        if '_beam_center' in state:
+            # pickled by the previous versions with all the arrays
+            state = dict(beam_center=tuple(state['_beam_center']),
+                         shape=state['_shape'],
+                         scale=state['_scale'].scale,
+                         t_key=state['_transforms'].key,
+                         polar_shape=state['_polar_shape'])
+        self.__init__(**state)
 
     @property
     def is_available(self) -> bool:
         return self.shape is not None
 
+    @property
+    def _range_data(self) -> _Ranges:
+        if self._ranges is None:
+            self._ranges = _get_ranges(self._beam_center, self._shape)
+        return self._ranges
+
+    @property
+    def _polar_grids(self) -> _PolarGrids:
+        if self._grids is None:
+            self._grids = _get_polar_grids(self._beam_center, self._shape, self._polar_shape)
+        return self._grids
+
+    @property
+    def _scaled_axes(self) -> _ScaledAxes:
+        scale = self.scale
+        if self._axes is None or self._axes.scale != scale:
+            ranges = self._range_data
+            self._axes = _ScaledAxes(
+                scale, _read_only(self._polar_grids.r * scale),
+                _read_only(ranges.y * scale), _read_only(ranges.z * scale)
+            )
+        return self._axes
+
     @property
     def ring_bounds(self):
-        return self._ring_bounds
+        return self._range_data.ring_bounds
 
     @property
     def beam_center(self):
@@ -101,35 +223,49 @@ class Geometry(object):
 
     @property
     def r_range(self) -> Tuple[float, float]:
-        return self._r_range
+        return self._range_data.r_range
 
     @property
     def phi_range(self) -> Tuple[float, float]:
-        return self._phi_range
+        return self._range_data.phi_range
 
     @property
     def polar_grids(self):
-        return self._polar_yy, self._polar_zz
+        grids = self._polar_grids
+        return grids.yy, grids.zz
+
+    @property
+    def raw_polar_grids(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Polar grids mapped to the coordinates of the raw (not transformed) image as float32
+        arrays for cv2.remap. Shared per transformation by the geometries with the same grids.
+        """
+        grids, t_key = self._polar_grids, self.t.key
+        raw_grids = grids.raw.get(t_key)
+        if raw_grids is None:
+            x, y = self.t.raw_coordinates(grids.yy, grids.zz, self.shape)
+            raw_grids = grids.raw[t_key] = _read_only(x.astype(np.float32)), _read_only(y.astype(np.float32))
+        return raw_grids
 
     @property
     def r_axis(self):
-        return self._r
+        return self._scaled_axes.r
 
     @property
     def phi_axis(self):
-        return self._phi
+        return self._polar_grids.phi
 
     @property
     def polar_aspect_ratio(self):
-        return self._polar_aspect_ratio
+        return self._polar_grids.aspect_ratio / self.scale
 
     @property
     def y_axis(self):
-        return self._y
+        return self._scaled_axes.y
 
     @property
     def z_axis(self):
-        return self._z
+        return self._scaled_axes.z
 
     @property
     def shape(self):
@@ -150,87 +286,36 @@ class Geometry(object):
     def set_scale(self, scale: float, update: bool = True):
         if scale != self.scale:
             self._scale.set_scale(scale)
-            if update:
-                self._update_axes_on_scale(False)
 
     def set_beam_center(self, z: float, y: float, update: bool = True):
         if (self._beam_center.z, self._beam_center.y) != (z, y):
             self._beam_center = BeamCenter(z, y)
-            if update:
-                self.update()
+            self._reset()
             return True
         return False
 
     def set_shape(self, shape: Tuple[int, int], update: bool = True):
         if shape != self.shape:
-            self._shape = shape
-            if update:
-                self.update()
+            self._shape = tuple(shape)
+            self._reset()
             return True
         return False
 
     def set_polar_shape(self, shape: Tuple[int, int], update: bool = True):
         if shape != self.polar_shape:
-            self._polar_shape = shape
-            if update:
-                self.update_polar()
+            self._polar_shape = tuple(shape)
+            self._grids = self._axes = None
             return True
         return False
 
     def update(self):
-        if not self.is_available:
-            return
-        self._update_ranges()
-        self._update_polar_grid()
-        self._update_axes_on_scale()
+        """Derived data is computed on access, kept for compatibility."""
 
     def update_polar(self):
-        self._update_polar_grid()
-        self._r *= self.scale
-        self._polar_aspect_ratio /= self.scale
-
-    def _update_ranges(self):
-        self._y = (np.arange(self._shape[1]) - self._beam_center.y)
-        self._z = (np.arange(self._shape[0]) - self._beam_center.z)
-
-        yy, zz = np.meshgrid(self._y, self._z)
-        rr = np.sqrt(yy ** 2 + zz ** 2)
-        phi = np.arctan2(zz, yy)
-        self._r_range = (rr.min(), rr.max())
-        self._phi_range = p_min, p_max = phi.min(), phi.max()
-        angle, angle_std = (p_max + p_min) / 2 * 180 / np.pi, (p_max - p_min) * 180 / np.pi
-        self._ring_bounds = (angle, angle_std)
-
-    def _update_polar_grid(self):
-        self._phi = np.linspace(*self.phi_range, self.polar_shape[0])
-        self._r = np.linspace(*self.r_range, self.polar_shape[1])
-
-        r_matrix = self._r[np.newaxis, :].repeat(self.polar_shape[0], axis=0)
-        p_matrix = self._phi[:, np.newaxis].repeat(self.polar_shape[1], axis=1)
-
-        self._polar_yy = r_matrix * np.cos(p_matrix) + self.beam_center.y
-        self._polar_zz = r_matrix * np.sin(p_matrix) + self.beam_center.z
-
-        self._phi *= 180 / np.pi
-
-        aspect_ratio = (self._phi.max() - self._phi.min()) * \
-                       self.polar_shape[0] / (self._r_range[1] - self._r_range[0]) / self.polar_shape[1]
-        self._polar_aspect_ratio = aspect_ratio
-
-    def _update_axes_on_scale(self, init: bool = True):
-        if init:
-            scale = self.scale
-        else:
-            scale = self.scale_change
-
-        self._r = self._r * scale
-        self._y = self._y * scale
-        self._z = self._z * scale
-        self._polar_aspect_ratio = self._polar_aspect_ratio / scale
+        """Derived data is computed on access, kept for compatibility."""
 
     def r2p(self, r):
         return (r - self.r_range[0]) / (self.r_range[1] - self.r_range[0]) * self.polar_shape[1]
 
     def a2p(self, a):
         return (a / 180 * np.pi - self.phi_range[0]) / (self.phi_range[1] - self.phi_range[0]) * self.polar_shape[0]
-
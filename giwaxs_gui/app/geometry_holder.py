@@ -1,27 +1,25 @@
 from typing import Tuple
 import logging
 
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject
-
 import numpy as np
 
 from .transformations import Transformation
 from .file_manager import FileManager, ImageKey
 from .geometry import Geometry
+from .signals import Signal
 
 
-class GeometryHolder(QObject):
-    sigBeamCenterChanged = pyqtSignal()
-    sigGeometryChangeFinished = pyqtSignal()
-    sigPolarGeometryChanged = pyqtSignal()
-    sigTransformed = pyqtSignal()
-    sigScaleChanged = pyqtSignal()
-    sigRingBoundsChanged = pyqtSignal(tuple)
+class GeometryHolder(object):
+    sigBeamCenterChanged = Signal()
+    sigGeometryChangeFinished = Signal()
+    sigPolarGeometryChanged = Signal()
+    sigTransformed = Signal()
+    sigScaleChanged = Signal()
+    sigRingBoundsChanged = Signal(tuple)
 
     log = logging.getLogger(__name__)
 
     def __init__(self, fm: FileManager):
-        QObject.__init__(self)
         self._fm = fm
         self._default_geometry = Geometry()
         self._current_geometry = None
@@ -48,7 +46,12 @@ class GeometryHolder(QObject):
     def is_default(self) -> bool:
         return self._current_geometry is None
 
-    def change_image(self, image_key: ImageKey, image: np.ndarray = None):
+    def change_image(self, image_key: ImageKey, image: np.ndarray = None, geometry: Geometry = None):
+        """
+        Loads the geometry of the image and returns the transformed image. geometry is
+        the loaded geometry with the image shape already set (e.g. in a worker thread),
+        it is used instead of updating the shape if it matches the stored one.
+        """
         if image_key == self._current_key:
             return
 
@@ -65,6 +68,9 @@ class GeometryHolder(QObject):
             image = self.transform_image(image)
             if image.shape != self.geometry.shape:
                 self.set_shape(image.shape)
+        elif geometry is not None and geometry.shape != self.geometry.shape and \
+                dict(geometry.to_dict(), shape=self.geometry.shape) == self.geometry.to_dict():
+            self._current_geometry = geometry
         return image
 
     def save_as_default(self):
@@ -91,7 +97,6 @@ class GeometryHolder(QObject):
             del self._fm.geometries[self._current_key]
             self.log.info('Non-default geometry deleted.')
 
-    @pyqtSlot(tuple, bool, name='changeBeamCenter')
     def set_beam_center(self, beam_center: tuple, finished: bool = True):
         if (beam_center[0] == self.geometry.beam_center.z and
                 beam_center[1] == self.geometry.beam_center.y):
@@ -109,14 +114,12 @@ class GeometryHolder(QObject):
             self._current_geometry = self.geometry.copy()
         self._current_geometry.set_shape(shape)
 
-    @pyqtSlot(tuple, name='changePolarShape')
     def set_polar_shape(self, shape: Tuple[int, int]):
         if not self._current_geometry:
             self._current_geometry = self.geometry.copy()
         self._current_geometry.set_polar_shape(shape)
         self.sigGeometryChangeFinished.emit()
 
-    @pyqtSlot(float, name='changeScale')
     def set_scale(self, scale: float):
         if self.geometry.scale == scale:
             return
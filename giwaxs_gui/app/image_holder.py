@@ -1,37 +1,49 @@
 import logging
-from typing import List
+from typing import List, NamedTuple
 from datetime import datetime as dt
 
 import numpy as np
 
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject
-
 from .rois.roi_dict import RoiDict, Roi
 from .geometry import Geometry
 from .geometry_holder import GeometryHolder
 from .polar_image import (PolarImage, InterpolationParams,
                           INTERPOLATION_ALGORITHMS, INTERPOLATION_ALGORITHMS_INVERSED)
 from .file_manager import FileManager, ImageKey
-from .fitting import FitObject
+from .fitting import FitObject, PolarWindows
+from .image_loader import LatestRequestLoader, Dispatcher
+from .image_processing import subsample
+from .signals import Signal
+
+
+class LoadedImage(NamedTuple):
+    raw_image: np.ndarray or None
+    polar_image: np.ndarray or None = None
+    geometry: Geometry or None = None
+    saved_polar: bool = False
 
 
-class ImageHolder(QObject):
-    sigImageChanged = pyqtSignal()
-    sigPolarImageChanged = pyqtSignal()
-    sigFitOpen = pyqtSignal(object)
-    sigFitSaved = pyqtSignal(tuple)
-    sigEmptyImage = pyqtSignal()
+class ImageHolder(object):
+    # max number of pixels of the image preview shown while the image is loaded
+    PREVIEW_SIZE: int = 512 ** 2
+
+    sigImageChanged = Signal()
+    sigImagePreview = Signal(object, tuple)
+    sigPolarImageChanged = Signal()
+    sigFitOpen = Signal(object)
+    sigFitSaved = Signal(tuple)
+    sigEmptyImage = Signal()
 
     log = logging.getLogger(__name__)
 
     def __init__(self, fm: FileManager, g_holder: GeometryHolder, roi_dict: RoiDict):
-        QObject.__init__(self)
         self._fm = fm
         self._roi_dict = roi_dict
         self._image = self._raw_image = None
         self._current_key: ImageKey = None
         self._polar_image = PolarImage()
         self._g_holder = g_holder
+        self._loader: LatestRequestLoader or None = None
 
         self._roi_dict.sigFitRoisOpen.connect(self.open_fit_rois)
         self._g_holder.sigPolarGeometryChanged.connect(self._update_polar_image)
@@ -44,6 +56,9 @@ class ImageHolder(QObject):
 
     @property
     def image(self) -> np.ndarray or None:
+        # the transformed image is needed for display only, the polar image is calculated from the raw one
+        if self._image is None and self._raw_image is not None:
+            self._image = self.g_holder.transform_image(self._raw_image)
         return self._image
 
     @property
@@ -70,8 +85,59 @@ class ImageHolder(QObject):
     def geometry(self) -> Geometry:
         return self.g_holder.geometry
 
-    @pyqtSlot(object, name='changeImage')
+    def set_async_loading(self, dispatch: Dispatcher or None):
+        """
+        Loads images in a worker thread, the results are delivered by dispatch in the main thread.
+        Only the latest requested image is set, and a preview is shown while it is loaded.
+        Without a dispatcher images are loaded synchronously.
+        """
+        if self._loader:
+            self._loader.shutdown()
+            self._loader = None
+        if dispatch:
+            self._loader = LatestRequestLoader(self.read_image_data, self.finish_image_data,
+                                               self._on_image_loaded, dispatch, self._on_image_read)
+
+    @property
+    def is_loading(self) -> bool:
+        return bool(self._loader and self._loader.is_loading)
+
     def change_image(self, image_key: ImageKey):
+        if self._loader:
+            if image_key and image_key != self._current_key:
+                self._loader.request(image_key)
+                return
+            self._loader.cancel()
+        self._set_image(image_key)
+
+    def read_image_data(self, image_key: ImageKey) -> LoadedImage:
+        """Reads the image and its geometry (thread-safe)."""
+        image = self._fm.images[image_key]
+        if image is None:
+            return LoadedImage(None)
+        geometry = self.g_holder.get_geometry(image_key)
+        geometry.set_shape(geometry.t.transformed_shape(image.shape))
+        polar_image = self._fm.polar_images[image_key]
+        return LoadedImage(image, polar_image, geometry, polar_image is not None)
+
+    def finish_image_data(self, data: LoadedImage) -> LoadedImage:
+        """Calculates the polar image if it is not saved (thread-safe)."""
+        if data.raw_image is None or data.polar_image is not None:
+            return data
+        polar_image = self.polar.remap(data.raw_image, data.geometry, self.polar_params.algorithm)
+        return data._replace(polar_image=polar_image)
+
+    def _on_image_read(self, image_key: ImageKey, data: LoadedImage):
+        if data.raw_image is not None and image_key != self._current_key:
+            # the preview is transformed after subsampling
+            preview = data.geometry.t(subsample(data.raw_image, self.PREVIEW_SIZE))
+            self.sigImagePreview.emit(preview, data.geometry.shape)
+
+    def _on_image_loaded(self, image_key: ImageKey, data: LoadedImage or None):
+        # data is None if loading failed, then the image is set synchronously
+        self._set_image(image_key, data)
+
+    def _set_image(self, image_key: ImageKey, data: LoadedImage = None):
         if self._current_key == image_key:
             return
         self._current_key = image_key
@@ -84,17 +150,23 @@ class ImageHolder(QObject):
             self.sigEmptyImage.emit()
             return
 
-        image = self._fm.images[image_key]
+        image = self._fm.images[image_key] if data is None else data.raw_image
 
         if image is None:
             self.sigEmptyImage.emit()
             return
 
-        polar_image = self._fm.polar_images[image_key]
         prev_geometry = self.geometry
-
         self._raw_image = image
-        self._image = self.g_holder.change_image(image_key, image)
+        self._image = None
+
+        if data is None:
+            polar_image = self._fm.polar_images[image_key]
+            self.g_holder.change_image(image_key)
+            self._update_shape()
+        else:
+            polar_image = self._set_loaded_image(image_key, data)
+
         self._update_polar_image(polar_image, False)
 
         if self.geometry.beam_center != prev_geometry.beam_center:
@@ -108,6 +180,21 @@ class ImageHolder(QObject):
         # self.g_holder.check_ring_bounds()
         self._roi_dict.change_image(image_key)
 
+    def _set_loaded_image(self, image_key: ImageKey, data: LoadedImage) -> np.ndarray or None:
+        # the geometry could be changed after the image was read, then the polar image is calculated again
+        self.g_holder.change_image(image_key, geometry=data.geometry)
+
+        if self.geometry == data.geometry:
+            return data.polar_image
+
+        self._update_shape()
+        return data.polar_image if data.saved_polar else None
+
+    def _update_shape(self):
+        shape = self.geometry.t.transformed_shape(self._raw_image.shape)
+        if shape != self.geometry.shape:
+            self.g_holder.set_shape(shape)
+
     def get_data_by_key(self, image_key: ImageKey, save: bool = False):
         polar_image = self._fm.polar_images[image_key]
         image = self._fm.images[image_key]
@@ -115,15 +202,13 @@ class ImageHolder(QObject):
         if image is None or geometry is None:
             return None, None, None
 
-        image = geometry.t(image)
-        if geometry.shape != image.shape:
-            geometry.set_shape(image.shape)
+        if geometry.shape != geometry.t.transformed_shape(image.shape):
+            geometry.set_shape(geometry.t.transformed_shape(image.shape))
         if polar_image is None:
-            yy, zz = geometry.polar_grids
-            polar_image = self.polar.calc_polar_image(image, yy, zz, self.polar_params.algorithm)
+            polar_image = self.polar.remap(image, geometry, self.polar_params.algorithm)
             if save:
                 self._fm.polar_images[image_key] = polar_image
-        return image, polar_image, geometry
+        return geometry.t(image), polar_image, geometry
 
     # def set_image(self, img: np.ndarray, polar_image: np.ndarray = None):
     #     self._raw_image = img
@@ -134,17 +219,15 @@ class ImageHolder(QObject):
         if polar_image is not None:
             self._polar_image.set_polar_image(polar_image)
         else:
-            self._polar_image.update(self.geometry, self.image)
+            self._polar_image.update(self.geometry, self.raw_image)
         if emit:
             self.sigPolarImageChanged.emit()
 
     def _update_image(self, polar_image: np.ndarray = None, emit: bool = True) -> None:
         if self.raw_image is None:
             return
-        old_shape = self.image.shape if self.image is not None else None
-        self._image = self.g_holder.transform_image(self._raw_image)
-        if old_shape != self.image.shape:
-            self.g_holder.set_shape(self.image.shape)
+        self._image = None
+        self._update_shape()
         self._update_polar_image(polar_image, emit=emit)
         if emit:
             self.sigImageChanged.emit()
@@ -174,13 +257,14 @@ class ImageHolder(QObject):
 
         return self.polar.get_angular_profile(self.geometry, roi)
 
-    @pyqtSlot(list, name='openFitRois')
     def open_fit_rois(self, rois: List[Roi]):
         self.sigFitOpen.emit(self.create_fit_object(rois))
 
     def create_fit_object(self, rois: List[Roi]) -> FitObject:
         fit_object = FitObject(self._current_key, self.polar_image,
                                self.geometry.r_axis, self.geometry.phi_axis)
+        if self.raw_image is not None:
+            fit_object.set_polar_windows(PolarWindows(self.raw_image, self.geometry))
         profile = self._fm.profiles[self._current_key]
 
         if profile:
@@ -190,7 +274,6 @@ class ImageHolder(QObject):
             fit_object.new_fit(roi)
         return fit_object
 
-    @pyqtSlot(object, name='applyFit')
     def apply_fit(self, fit_object: FitObject):
         name = dt.now().ctime()
         fit_object.name = name
@@ -0,0 +1,95 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Hashable, Tuple
+
+__all__ = ['LatestRequestLoader', 'Dispatcher']
+
+logger = logging.getLogger(__name__)
+
+# dispatch(callback) calls callback in the main thread (e.g. by the Qt event loop)
+Dispatcher = Callable[[Callable[[], None]], None]
+
+
+class LatestRequestLoader(object):
+    """
+    Loads data by key in a worker thread with the "latest request wins" policy.
+
+    A new request replaces the waiting one, so that at most one load is running
+    and one is waiting, and the results of outdated requests are dropped.
+    Loading has two stages: a quick read (its result is delivered as a preview)
+    and an expensive finish, which is skipped if a newer request is made meanwhile.
+    The results are delivered by the dispatcher in the main thread.
+    """
+
+    def __init__(self,
+                 read: Callable[[Hashable], object],
+                 finish: Callable[[object], object],
+                 on_loaded: Callable[[Hashable, object], None],
+                 dispatch: Dispatcher,
+                 on_preview: Callable[[Hashable, object], None] = None):
+        self._read = read
+        self._finish = finish
+        self._on_loaded = on_loaded
+        self._on_preview = on_preview
+        self._dispatch = dispatch
+        self._lock = threading.Lock()
+        self._generation: int = 0
+        self._waiting: Tuple[int, Hashable] or None = None
+        self._running: bool = False
+        self._executor = ThreadPoolExecutor(1, thread_name_prefix='image-loader')
+
+    @property
+    def is_loading(self) -> bool:
+        with self._lock:
+            return self._running or self._waiting is not None
+
+    def request(self, key: Hashable):
+        with self._lock:
+            self._generation += 1
+            self._waiting = (self._generation, key)
+            if self._running:
+                return
+            self._running = True
+        self._executor.submit(self._run)
+
+    def cancel(self):
+        """Drops the waiting request and the results of the running one."""
+        with self._lock:
+            self._generation += 1
+            self._waiting = None
+
+    def shutdown(self):
+        self.cancel()
+        self._executor.shutdown(wait=False)
+
+    def _is_outdated(self, generation: int) -> bool:
+        with self._lock:
+            return generation != self._generation
+
+    def _run(self):
+        while True:
+            with self._lock:
+                if self._waiting is None:
+                    self._running = False
+                    return
+                (generation, key), self._waiting = self._waiting, None
+            self._load(generation, key)
+
+    def _load(self, generation: int, key: Hashable):
+        try:
+            data = self._read(key)
+            if self._on_preview and not self._is_outdated(generation):
+                self._dispatch(lambda: self._deliver(generation, key, data, self._on_preview))
+            if self._is_outdated(generation):
+                return
+            result = self._finish(data)
+        except Exception as err:
+            logger.exception(err)
+            result = None
+        self._dispatch(lambda: self._deliver(generation, key, result, self._on_loaded))
+
+    def _deliver(self, generation: int, key: Hashable, data: object, callback: Callable[[Hashable, object], None]):
+        # called in the main thread
+        if generation == self._generation:
+            callback(key, data)
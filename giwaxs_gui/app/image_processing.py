@@ -1,6 +1,16 @@
+from typing import Tuple, List
+
 import cv2 as cv
 import numpy as np
 
+# max number of pixels used to calculate image statistics
+STATS_SIZE: int = 2 ** 18
+
+# (level, row, column)
+TileKey = Tuple[int, int, int]
+
+_CV_DTYPES = tuple(map(np.dtype, (np.uint8, np.int8, np.uint16, np.int16, np.int32, np.float32, np.float64)))
+
 
 def clahe(img, limit: float = 5000):
     return cv.createCLAHE(clipLimit=limit, tileGridSize=(1, 1)).apply(img.astype('uint16')).astype(np.float32)
@@ -16,7 +26,152 @@ def standard_contrast_correction(
         coef: float = 5000,
         log: bool = True,
 ):
-    if log:
-        img = np.log10(norm_img(img) * coef + 1)
+    return ContrastCorrection(limit, coef, log)(img)
+
+
+class ContrastCorrection(object):
+    """
+    Log scaling and CLAHE of images for display. The CLAHE object and the lookup table
+    for the final normalization are reused between images, intermediate steps are performed
+    in place in float32.
+    """
+
+    def __init__(self, limit: float = 2000, coef: float = 5000, log: bool = True):
+        self.coef = coef
+        self.log = log
+        self._clahe = cv.createCLAHE(clipLimit=limit, tileGridSize=(1, 1))
+        self._ramp = np.arange(2 ** 16, dtype=np.float32)
+        self._lut = np.empty_like(self._ramp)
+
+    def __call__(self, img: np.ndarray) -> np.ndarray:
+        corrected = self.apply_clahe(img)
+        return np.take(self.normalization_lut(corrected), corrected)
+
+    def apply_clahe(self, img: np.ndarray) -> np.ndarray:
+        """Returns uint16 image that is mapped to [0, 1] by normalization_lut."""
+        img = np.array(img, dtype=np.float32)
+        _norm_inplace(img, self.coef)
+
+        if self.log:
+            # log10(x + 1) up to a factor that is removed by the normalization
+            np.log1p(img, out=img)
+            _norm_inplace(img, self.coef)
+
+        return self._clahe.apply(img.astype(np.uint16))
+
+    def normalization_lut(self, img: np.ndarray) -> np.ndarray:
+        """Lookup table that normalizes the uint16 image. The table is reused by the next call."""
+        min_value, max_value = min_max(img)
+        lut = self._lut
+        np.subtract(self._ramp, min_value, out=lut)
+        lut *= 1 / (max_value - min_value) if max_value > min_value else 0
+        return lut
+
+
+class ImagePyramid(object):
+    """
+    Image with 2x downsampled levels split into square tiles. Level 0 is the image itself
+    (it is not copied). If a lookup table is provided (e.g. for uint16 images after CLAHE),
+    it is applied to the tiles when they are requested.
+    """
+
+    def __init__(self, image: np.ndarray, tile_size: int = 512, lut: np.ndarray = None):
+        self.tile_size = tile_size
+        self.lut = lut
+        self.levels: List[np.ndarray] = [image]
+
+        while max(self.levels[-1].shape[:2]) > tile_size:
+            self.levels.append(_downsample(self.levels[-1]))
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.levels[0].shape[:2]
+
+    @property
+    def top_level(self) -> int:
+        return len(self.levels) - 1
+
+    def level_by_step(self, step: int) -> int:
+        """The coarsest level that has at least the resolution of the given pixel step."""
+        return min(int(np.log2(max(step, 1))), self.top_level)
+
+    def scale(self, level: int) -> Tuple[float, float]:
+        """Size (y, x) of the level pixel in the pixels of the image."""
+        (h, w), (lh, lw) = self.shape, self.levels[level].shape[:2]
+        return h / lh, w / lw
+
+    def get_level(self, level: int) -> np.ndarray:
+        return self._apply_lut(self.levels[level])
+
+    def sample(self, max_size: int = STATS_SIZE) -> np.ndarray:
+        """Strided subsample of the image for statistics (downsampled levels are smoothed)."""
+        return self._apply_lut(subsample(self.levels[0], max_size))
+
+    def tile_keys(self, level: int, x0: float, y0: float, x1: float, y1: float) -> List[TileKey]:
+        """Keys of the tiles of the level that intersect the region (in the pixels of the image)."""
+        t = self.tile_size
+        sy, sx = self.scale(level)
+        lh, lw = self.levels[level].shape[:2]
+        i0, j0 = max(int(y0 / sy) // t, 0), max(int(x0 / sx) // t, 0)
+        i1, j1 = min(int(np.ceil(y1 / sy / t)), -(-lh // t)), min(int(np.ceil(x1 / sx / t)), -(-lw // t))
+        return [(level, i, j) for i in range(i0, i1) for j in range(j0, j1)]
+
+    def tile(self, key: TileKey) -> np.ndarray:
+        level, i, j = key
+        t = self.tile_size
+        return self._apply_lut(self.levels[level][i * t:(i + 1) * t, j * t:(j + 1) * t])
+
+    def tile_rect(self, key: TileKey) -> Tuple[float, float, float, float]:
+        """Tile rectangle (x, y, width, height) in the pixels of the image."""
+        level, i, j = key
+        t = self.tile_size
+        sy, sx = self.scale(level)
+        lh, lw = self.levels[level].shape[:2]
+        th, tw = min(t, lh - i * t), min(t, lw - j * t)
+        return j * t * sx, i * t * sy, tw * sx, th * sy
+
+    def _apply_lut(self, data: np.ndarray) -> np.ndarray:
+        if self.lut is None:
+            return data
+        return np.take(self.lut, data)
+
+
+def min_max(img: np.ndarray) -> Tuple[float, float]:
+    if img.ndim == 2 and img.size and img.flags.c_contiguous and img.dtype in _CV_DTYPES:
+        min_value, max_value, *_ = cv.minMaxLoc(img)
+        return min_value, max_value
+    return img.min(), img.max()
+
+
+def subsample(img: np.ndarray, max_size: int = STATS_SIZE) -> np.ndarray:
+    """Strided view of the image with at most ~max_size pixels."""
+    if img.size <= max_size:
+        return img
+    step = int(np.ceil(np.sqrt(img.size / max_size)))
+    return img[::step, ::step]
+
+
+def screen_step(shape: Tuple[int, int], screen_shape: Tuple[int, int]) -> int:
+    """Pixel step to display an image region of the given shape at the screen resolution."""
+    return max(1, int(min(shape[0] / max(screen_shape[0], 1), shape[1] / max(screen_shape[1], 1))))
+
+
+def sigma_levels(img: np.ndarray, sigma_factor: float, max_size: int = STATS_SIZE) -> Tuple[float, float]:
+    """Levels mean +/- sigma_factor * std limited by the image range, calculated from a subsample."""
+    sample = subsample(img, max_size)
+    min_value, max_value = min_max(sample)
+    m, s = sample.mean(), sample.std() * sigma_factor
+    return max(m - s, min_value), min(m + s, max_value)
+
+
+def _norm_inplace(img: np.ndarray, coef: float = 1.):
+    min_value, max_value = min_max(img)
+    img -= min_value
+    img *= coef / (max_value - min_value) if max_value > min_value else 0
+
 
-    return norm_img(clahe(norm_img(img) * coef, limit))
+def _downsample(img: np.ndarray) -> np.ndarray:
+    if img.dtype not in (np.uint16, np.float32, np.float64):
+        img = img.astype(np.float32)
+    h, w = img.shape[:2]
+    return cv.resize(img, (max(w // 2, 1), max(h // 2, 1)), interpolation=cv.INTER_AREA)
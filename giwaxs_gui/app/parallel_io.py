@@ -0,0 +1,59 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future
+from mmap import mmap
+from typing import Callable, Iterable, Generator, Deque, TypeVar
+
+import numpy as np
+
+__all__ = ['iter_ordered', 'in_memory', 'IO_WORKERS']
+
+# reading files is dominated by the latency of (network) file systems, not by the cpu
+IO_WORKERS: int = 8
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+
+def iter_ordered(func: Callable[[T], R], items: Iterable[T],
+                 workers: int = IO_WORKERS, max_pending: int = None) -> Generator[R, None, None]:
+    """
+    Yields func(item) in the order of items. The calls are made by a pool of threads
+    (reading files and most numpy operations release the GIL), and never more than
+    max_pending results are kept in flight, so a slow consumer does not let them pile
+    up in memory. Closing the generator cancels the pending calls.
+    """
+    if workers <= 1:
+        yield from map(func, items)
+        return
+
+    max_pending = max_pending or workers * 2
+    pending: Deque[Future] = deque()
+
+    with ThreadPoolExecutor(workers) as executor:
+        try:
+            for item in items:
+                pending.append(executor.submit(func, item))
+                if len(pending) >= max_pending:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def in_memory(array: np.ndarray or None) -> np.ndarray or None:
+    """
+    Copy of the array if it is backed by a mapped file (see read_image), else the array itself.
+    Mapped files are only read when their pages are accessed, so that the prefetching calls
+    of iter_ordered have to copy the images to do the disk I/O in the worker threads.
+    """
+    if array is None:
+        return
+    base = array
+    while base is not None:
+        if isinstance(base, (np.memmap, mmap)):
+            return np.array(array)
+        base = getattr(base, 'base', None)
+    return array
@@ -0,0 +1,4 @@
+from .parameters import PipelineParams
+from .stages import ImageProcessor, ProcessedImage, ImageTask, iter_image_paths
+from .pipeline import Pipeline
+from .script_process import giwaxs_gui_process
@@ -0,0 +1,66 @@
+import json
+from dataclasses import dataclass, asdict, fields
+from pathlib import Path
+from typing import Tuple
+
+
+@dataclass
+class PipelineParams:
+    # geometry
+    beam_center: Tuple[float, float] = (0, 0)
+    scale: float = 1.
+    t_key: str = None
+    polar_shape: Tuple[int, int] = (512, 512)
+    algorithm: str = 'Bilinear'
+
+    # radial profile & baseline
+    sigma: float = 0
+    baseline: bool = True
+    r_range: Tuple[float, float] = None
+    smoothness: float = 100
+    asymmetry: float = 0.01
+
+    # peaks
+    find_peaks: bool = True
+    sigma_find: float = 8
+    max_peaks_number: int = 20
+    init_width: float = 30
+
+    # fitting
+    fit: bool = True
+    fitting_function: str = 'Gaussian'
+    background: str = 'Linear'
+
+    # export
+    save_image: bool = False
+    save_polar_image: bool = False
+    save_profiles: bool = True
+
+    @classmethod
+    def keys(cls):
+        return tuple(f.name for f in fields(cls))
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+    @classmethod
+    def fromdict(cls, d: dict):
+        unknown = set(d.keys()) - set(cls.keys())
+        if unknown:
+            raise ValueError(f'Unknown pipeline parameters: {", ".join(sorted(unknown))}')
+        return cls(**d)
+
+    @classmethod
+    def from_json(cls, path: Path or str):
+        with open(str(path), 'r') as f:
+            return cls.fromdict(json.load(f))
+
+    def to_json(self, path: Path or str):
+        with open(str(path), 'w') as f:
+            json.dump(self.to_dict(), f, indent=4)
+
+    def update(self, **params):
+        for k, v in params.items():
+            if k not in self.keys():
+                raise ValueError(f'Unknown pipeline parameter: {k}')
+            setattr(self, k, v)
@@ -0,0 +1,163 @@
+from collections import deque
+from multiprocessing import Pool
+from pathlib import Path
+from typing import Iterable, Generator, Callable, Deque, List
+import logging
+
+from h5py import File
+
+from ..file_manager import IMAGE_PROJECT_KEY, PROJECT_KEY
+from ..file_manager.read_roi_data import _ReadRoiData
+from ..parallel_io import iter_ordered, IO_WORKERS
+from .parameters import PipelineParams
+from .stages import ImageTask, ProcessedImage, ImageProcessor, iter_image_paths
+
+logger = logging.getLogger(__name__)
+
+# a processor per worker process, created once by the pool initializer
+_WORKER_PROCESSOR: ImageProcessor or None = None
+
+
+def _init_worker(params: PipelineParams):
+    global _WORKER_PROCESSOR
+    _WORKER_PROCESSOR = ImageProcessor(params)
+
+
+def _process_in_worker(task: ImageTask) -> ProcessedImage or None:
+    return _WORKER_PROCESSOR(task)
+
+
+class Pipeline(object):
+    """
+    Headless processing of image folders. Images are streamed through the stages
+    one by one (or by a bounded number of worker processes), and the results are written
+    to a single h5 file by the main process, so that the memory consumption does not
+    depend on the number of processed images. A single process reads the next images
+    by io_workers threads while processing the current one.
+    """
+
+    log = logging.getLogger(__name__)
+
+    def __init__(self, params: PipelineParams = None, *,
+                 processes: int = 1, max_pending: int = None, io_workers: int = IO_WORKERS):
+        self.params = params or PipelineParams()
+        self.processes = max(processes, 1)
+        self.io_workers = io_workers
+        self.max_pending = max_pending or self.processes * 2
+        # paths of the images that could not be read or processed by the last run
+        self.failed: List[Path] = []
+
+    def run(self, folders: Iterable[Path], dest: Path, *,
+            recursive: bool = False, overwrite: bool = False,
+            process_callback: Callable[[int], None] = None) -> int:
+        """
+        Returns the number of the processed images, the failed images are stored in self.failed.
+        Raises ValueError before processing if some of the images exist in dest and overwrite is False.
+        """
+        count: int = 0
+        self.failed = []
+        tasks = list(iter_image_paths(folders, recursive))
+
+        with H5Writer(dest, self.params, overwrite=overwrite) as writer:
+            writer.check_existing(tasks)
+
+            # results are yielded in the order of the tasks
+            for task, result in zip(tasks, self.process(tasks)):
+                if result is None:
+                    self.failed.append(task.path)
+                    continue
+                writer.write(result)
+                count += 1
+                if process_callback:
+                    process_callback(count)
+
+        if self.failed:
+            self.log.warning(f'{count} images processed, {len(self.failed)} images failed.')
+        else:
+            self.log.info(f'{count} images processed.')
+        return count
+
+    def process(self, tasks: Iterable[ImageTask]) -> Generator[ProcessedImage or None, None, None]:
+        if self.processes == 1:
+            processor = ImageProcessor(self.params)
+            for task, raw_image in iter_ordered(processor.read, tasks, self.io_workers):
+                yield processor(task, raw_image) if raw_image is not None else None
+            return
+
+        with Pool(self.processes, initializer=_init_worker, initargs=(self.params,)) as pool:
+            yield from _bounded_imap(pool, _process_in_worker, tasks, self.max_pending)
+
+
+def _bounded_imap(pool: Pool, func: Callable, tasks: Iterable, max_pending: int) -> Generator:
+    """
+    Like Pool.imap, but never keeps more than max_pending results in flight,
+    so a slow consumer (e.g. the h5 writer) does not let results pile up in memory.
+    """
+    pending: Deque = deque()
+
+    for task in tasks:
+        pending.append(pool.apply_async(func, (task,)))
+        if len(pending) >= max_pending:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
+
+
+class H5Writer(object):
+    """Writes the results to the h5 file, existing images are replaced only if overwrite is True."""
+
+    def __init__(self, dest: Path, params: PipelineParams, *, overwrite: bool = False):
+        self.dest = Path(dest)
+        self.params = params
+        self.overwrite = overwrite
+        self._file: File or None = None
+
+    def __enter__(self):
+        if not self.dest.parent.is_dir():
+            raise NotADirectoryError(f'Folder {str(self.dest.parent)} does not exist.')
+        self._file = File(str(self.dest.resolve()), 'a')
+        if self.params.save_image:
+            self._file.attrs[PROJECT_KEY] = True
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._file.close()
+        self._file = None
+
+    def check_existing(self, tasks: List[ImageTask]):
+        """Raises ValueError if some of the images exist in the file and overwrite is False."""
+        if self.overwrite:
+            return
+        existing = [path for path in (f'{task.folder}/{task.path.name}' for task in tasks) if path in self._file]
+        if existing:
+            raise ValueError(f'{len(existing)} images already exist in {self.dest} (e.g. {existing[0]}), '
+                             f'use overwrite to replace them.')
+
+    def write(self, result: ProcessedImage):
+        folder_group = self._file.require_group(result.folder)
+
+        if result.name in folder_group.keys():
+            path = f'{result.folder}/{result.name}'
+            if not self.overwrite:
+                raise ValueError(f'{path} already exists in {self.dest}, use overwrite to replace it.')
+            logger.info(f'Replacing {path} in {self.dest}.')
+            del folder_group[result.name]
+
+        group = folder_group.create_group(result.name)
+        group.attrs[IMAGE_PROJECT_KEY] = True
+        group.attrs['idx'] = result.idx
+        group.attrs.update(result.geometry)
+
+        if result.image is not None:
+            group.create_dataset('image', data=result.image)
+        if result.polar_image is not None:
+            group.create_dataset('polar_image', data=result.polar_image)
+        if self.params.save_profiles:
+            group.create_dataset('r_axis', data=result.r_axis)
+            group.create_dataset('radial_profile', data=result.radial_profile)
+            if result.baseline is not None:
+                group.create_dataset('baseline', data=result.baseline)
+        if len(result.roi_data):
+            _ReadRoiData.set_h5(group, None, result.roi_data)
+
@@ -0,0 +1,92 @@
+import argparse
+import logging
+import os
+import sys
+from pathlib import Path
+
+from .parameters import PipelineParams
+from .pipeline import Pipeline
+
+
+def giwaxs_gui_process() -> int:
+    parser = argparse.ArgumentParser(
+        description='Process folders of GIWAXS images without the graphical interface: '
+                    'read -> transform -> polar -> radial profile -> baseline -> peak fitting -> export.')
+
+    parser.add_argument('folders', type=Path, nargs='+', help='folders (or single images) to process')
+    parser.add_argument('-o', '--output', type=Path, required=True, help='destination h5 file')
+    parser.add_argument('--config', type=Path, default=None, help='json file with pipeline parameters')
+    parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    parser.add_argument('--recursive', action='store_true', help='process subfolders')
+    parser.add_argument('--overwrite', action='store_true',
+                        help='replace the images already stored in the output file')
+    parser.add_argument('--save_config', type=Path, default=None,
+                        help='save the resulting parameters to a json file and exit')
+    parser.add_argument('-d', '--debug', action='store_true', help='show debug messages')
+
+    parser.add_argument('--beam_center', type=float, nargs=2, metavar=('Z', 'Y'), default=None)
+    parser.add_argument('--scale', type=float, default=None)
+    parser.add_argument('--t_key', type=str, default=None, help='image transformation key, e.g. 2143')
+    parser.add_argument('--polar_shape', type=int, nargs=2, metavar=('PHI', 'R'), default=None)
+    parser.add_argument('--algorithm', type=str, default=None,
+                        choices=('Nearest', 'Bilinear', 'Cubic', 'Lanczos'))
+    parser.add_argument('--sigma', type=float, default=None, help='radial profile smoothing')
+    parser.add_argument('--no_baseline', action='store_true', help='skip baseline correction')
+    parser.add_argument('--no_peaks', action='store_true', help='skip peak finding and fitting')
+    parser.add_argument('--no_fit', action='store_true', help='find peaks without fitting them')
+    parser.add_argument('--save_image', action='store_true')
+    parser.add_argument('--save_polar_image', action='store_true')
+
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.INFO)
+    logger = logging.getLogger(__name__)
+
+    try:
+        params = PipelineParams.from_json(args.config) if args.config else PipelineParams()
+    except (OSError, ValueError) as err:
+        logger.error(f'Could not read config file {args.config}: {err}')
+        return 1
+
+    params.update(**_get_cli_params(args))
+
+    if args.save_config:
+        params.to_json(args.save_config)
+        return 0
+
+    pipeline = Pipeline(params, processes=args.processes)
+
+    try:
+        pipeline.run(args.folders, args.output, recursive=args.recursive, overwrite=args.overwrite)
+    except (OSError, ValueError) as err:
+        logger.error(err)
+        return 1
+
+    if pipeline.failed:
+        logger.error(f'{len(pipeline.failed)} images failed: ' + ', '.join(map(str, pipeline.failed)))
+        return 1
+
+    return 0
+
+
+def _get_cli_params(args) -> dict:
+    params = {k: getattr(args, k) for k in ('beam_center', 'scale', 't_key', 'polar_shape', 'algorithm', 'sigma')
+              if getattr(args, k) is not None}
+
+    for flag, key in (('no_baseline', 'baseline'), ('no_peaks', 'find_peaks'), ('no_fit', 'fit')):
+        if getattr(args, flag):
+            params[key] = False
+
+    for key in ('save_image', 'save_polar_image'):
+        if getattr(args, key):
+            params[key] = True
+
+    for key in ('beam_center', 'polar_shape'):
+        if key in params:
+            params[key] = tuple(params[key])
+
+    return params
+
+
+if __name__ == '__main__':
+    sys.exit(giwaxs_gui_process())
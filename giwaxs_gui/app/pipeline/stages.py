@@ -0,0 +1,222 @@
+from pathlib import Path
+from typing import NamedTuple, Dict, Tuple, List, Iterable, Generator
+import logging
+
+import numpy as np
+from scipy.signal import find_peaks
+
+from ..read_image import read_image
+from ..geometry import Geometry
+from ..transformations import TransformationsHolder
+from ..polar_image import PolarImage, INTERPOLATION_ALGORITHMS
+from ..profiles import SavedProfile, BaselineParams
+from ..rois import Roi, RoiData
+from ..fitting import FitObject, FittingType, BackgroundType, FITTING_FUNCTIONS
+from ..fitting.background import BACKGROUNDS
+from ..utils import baseline_correction, smooth_curve
+from ..file_manager.keys import AVAILABLE_IMAGE_FORMATS
+from .parameters import PipelineParams
+
+logger = logging.getLogger(__name__)
+
+
+class ImageTask(NamedTuple):
+    # h5 path of the folder group
+    folder: str
+    idx: int
+    path: Path
+
+
+class ProcessedImage(NamedTuple):
+    folder: str
+    idx: int
+    name: str
+    geometry: dict
+    r_axis: np.ndarray
+    radial_profile: np.ndarray
+    baseline: np.ndarray or None
+    roi_data: RoiData
+    image: np.ndarray or None = None
+    polar_image: np.ndarray or None = None
+
+
+def iter_image_paths(folders: Iterable[Path], recursive: bool = False) -> Generator[ImageTask, None, None]:
+    """
+    Tasks of the images of the folders. The group of an image is the name of its input
+    folder (made unique if several input folders have the same name) followed by
+    the path of its subfolder relative to the input folder.
+    """
+    groups: Dict[Path, str] = {}
+
+    for folder in folders:
+        folder = Path(folder)
+        if folder.is_file():
+            yield ImageTask(_root_group(folder.parent, groups), 0, folder)
+            continue
+        yield from _iter_folder(folder, recursive, _root_group(folder, groups))
+
+
+def _root_group(folder: Path, groups: Dict[Path, str]) -> str:
+    folder = folder.resolve()
+    if folder not in groups:
+        name, i = folder.name, 1
+        while name in groups.values():
+            i += 1
+            name = f'{folder.name}_{i}'
+        groups[folder] = name
+    return groups[folder]
+
+
+def _iter_folder(folder: Path, recursive: bool, group: str) -> Generator[ImageTask, None, None]:
+    idx = 0
+    subfolders = []
+    for p in sorted(folder.iterdir()):
+        if p.is_dir():
+            subfolders.append(p)
+        elif _is_image_path(p):
+            yield ImageTask(group, idx, p)
+            idx += 1
+    if recursive:
+        for p in subfolders:
+            yield from _iter_folder(p, recursive, f'{group}/{p.name}')
+
+
+def _is_image_path(path: Path) -> bool:
+    return path.is_file() and any(path.name.endswith(suffix) for suffix in AVAILABLE_IMAGE_FORMATS)
+
+
+class ImageProcessor(object):
+    """
+    Runs read -> transform -> polar -> radial profile -> baseline -> peaks -> fit
+    for a single image. Geometries (including polar grids) are cached per image shape,
+    so that only the parameters have to be sent to the worker processes.
+    """
+
+    def __init__(self, params: PipelineParams):
+        self.params = params
+        self._geometries: Dict[Tuple[int, int], Geometry] = {}
+        self._algorithm = INTERPOLATION_ALGORITHMS[params.algorithm]
+
+    def __call__(self, task: ImageTask, raw_image: np.ndarray = None) -> ProcessedImage or None:
+        try:
+            return self.process(task, raw_image)
+        except Exception as err:
+            logger.exception(err)
+            return
+
+    @staticmethod
+    def read(task: ImageTask) -> Tuple[ImageTask, np.ndarray or None]:
+        try:
+            return task, read_image(task.path, mmap=False)
+        except Exception as err:
+            logger.exception(err)
+            return task, None
+
+    def process(self, task: ImageTask, raw_image: np.ndarray = None) -> ProcessedImage or None:
+        if raw_image is None:
+            raw_image = read_image(task.path)
+        if raw_image is None:
+            return
+
+        geometry = self.get_geometry(raw_image.shape)
+        polar_image = self.polar_image(raw_image, geometry)
+
+        if polar_image is None:
+            return
+
+        r_axis = geometry.r_axis
+        profile, baseline = self.radial_profile(polar_image, r_axis)
+        roi_data = self.fit_peaks(task.path, polar_image, geometry, profile, baseline)
+
+        return ProcessedImage(
+            folder=task.folder, idx=task.idx, name=task.path.name,
+            geometry=geometry.to_dict(), r_axis=r_axis,
+            radial_profile=profile, baseline=baseline, roi_data=roi_data,
+            image=geometry.t(raw_image) if self.params.save_image else None,
+            polar_image=polar_image if self.params.save_polar_image else None,
+        )
+
+    def get_geometry(self, raw_shape: Tuple[int, int]) -> Geometry:
+        try:
+            return self._geometries[raw_shape]
+        except KeyError:
+            pass
+
+        params = self.params
+        shape = TransformationsHolder(params.t_key).transformed_shape(raw_shape)
+        geometry = Geometry(beam_center=params.beam_center, scale=params.scale, shape=shape,
+                            polar_shape=params.polar_shape, t_key=params.t_key)
+        self._geometries[raw_shape] = geometry
+        return geometry
+
+    def polar_image(self, raw_image: np.ndarray, geometry: Geometry) -> np.ndarray or None:
+        return PolarImage.remap(raw_image, geometry, self._algorithm)
+
+    def radial_profile(self, polar_image: np.ndarray, r_axis: np.ndarray) -> Tuple[np.ndarray, np.ndarray or None]:
+        profile = polar_image.sum(axis=0)
+        if not self.params.baseline:
+            return profile, None
+
+        x1, x2 = self._r_coords(r_axis)
+        smoothed = smooth_curve(profile, self.params.sigma)
+        baseline = np.zeros_like(smoothed)
+        baseline[x1:x2] = baseline_correction(smoothed[x1:x2], self.params.smoothness, self.params.asymmetry)
+        return profile, baseline
+
+    def fit_peaks(self, path: Path, polar_image: np.ndarray, geometry: Geometry,
+                  profile: np.ndarray, baseline: np.ndarray or None) -> RoiData:
+        params = self.params
+
+        if not params.find_peaks:
+            return RoiData()
+
+        radii = self.find_peaks(geometry.r_axis, profile, baseline)
+        width = params.init_width * geometry.scale
+        angle, angle_std = geometry.ring_bounds
+
+        rois = [Roi(radius=r, width=width, angle=angle, angle_std=angle_std, key=key, name=str(key))
+                for key, r in enumerate(radii)]
+
+        if params.fit and rois:
+            self._fit_rois(path, polar_image, geometry, profile, baseline, rois)
+
+        return RoiData(rois)
+
+    def find_peaks(self, r_axis: np.ndarray, profile: np.ndarray, baseline: np.ndarray or None) -> List[float]:
+        params = self.params
+        y = smooth_curve(profile, params.sigma_find)
+        if baseline is not None:
+            y = y - baseline
+        peaks = find_peaks(y)[0]
+
+        if len(peaks) > params.max_peaks_number:
+            logger.info(f'Number of found peaks ({len(peaks)}) exceeds the maximum number '
+                        f'{params.max_peaks_number}, only the highest peaks are kept.')
+            peaks = np.sort(peaks[np.argsort(y[peaks])[::-1][:params.max_peaks_number]])
+
+        return r_axis[peaks].tolist()
+
+    def _fit_rois(self, path: Path, polar_image: np.ndarray, geometry: Geometry,
+                  profile: np.ndarray, baseline: np.ndarray or None, rois: List[Roi]):
+        params = self.params
+
+        fit_object = FitObject(path, polar_image, geometry.r_axis, geometry.phi_axis)
+        fit_object.default_fitting = FITTING_FUNCTIONS[FittingType(params.fitting_function)]
+        fit_object.default_background = BACKGROUNDS[BackgroundType(params.background)]
+
+        if baseline is not None:
+            fit_object.set_profile(SavedProfile(
+                profile, geometry.r_axis, self._r_range(geometry.r_axis), params.sigma,
+                BaselineParams(params.smoothness, params.asymmetry), baseline))
+
+        for roi in rois:
+            fit_object.new_fit(roi).do_fit()
+
+    def _r_range(self, r_axis: np.ndarray) -> Tuple[float, float]:
+        return self.params.r_range or (r_axis.min(), r_axis.max())
+
+    def _r_coords(self, r_axis: np.ndarray) -> Tuple[int, int]:
+        if not self.params.r_range:
+            return 0, r_axis.size
+        r1, r2 = np.searchsorted(r_axis, sorted(self.params.r_range))
+        return int(r1), int(r2)
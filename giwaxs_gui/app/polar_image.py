@@ -4,6 +4,7 @@ import cv2
 import numpy as np
 
 from .geometry import Geometry
+from .profiling import timed
 from ..app.rois.roi import Roi
 
 INTERPOLATION_ALGORITHMS = {
@@ -49,13 +50,25 @@ class PolarImage(object):
         self._parameters = InterpolationParams(self.polar_params.shape, algorithm)
         self.update(geometry, image)
 
-    def update(self, geometry: Geometry, image: np.ndarray):
-        if image is None:
+    def update(self, geometry: Geometry, raw_image: np.ndarray):
+        if raw_image is None:
             self._polar_img = None
             return
 
-        yy, zz = geometry.polar_grids
-        self._polar_img = self.calc_polar_image(image, yy, zz, self.polar_params.algorithm)
+        self._polar_img = self.remap(raw_image, geometry, self.polar_params.algorithm)
+
+    @staticmethod
+    @timed('polar remap')
+    def remap(raw_image: np.ndarray, geometry: Geometry, algorithm=cv2.INTER_LINEAR) -> np.ndarray or None:
+        """
+        Polar image of the raw detector image. The transformations of the geometry are applied
+        to the remap coordinates, so the transformed image is not materialized.
+        """
+        yy, zz = geometry.raw_polar_grids
+        try:
+            return cv2.remap(_remap_source(raw_image), yy, zz, interpolation=algorithm)
+        except cv2.error:
+            return
 
     def set_polar_image(self, img: np.ndarray):
         self._polar_img = img
@@ -63,21 +76,24 @@ class PolarImage(object):
             self._parameters = InterpolationParams(img.shape, self._parameters.algorithm)
 
     @staticmethod
+    @timed('polar remap')
     def calc_polar_image(img: np.ndarray, yy: np.ndarray, zz: np.ndarray,
                          algorithm=cv2.INTER_LINEAR) -> np.ndarray or None:
         try:
-            return cv2.remap(img.astype(np.float32),
-                             yy.astype(np.float32),
-                             zz.astype(np.float32),
+            return cv2.remap(_remap_source(img),
+                             yy.astype(np.float32, copy=False),
+                             zz.astype(np.float32, copy=False),
                              interpolation=algorithm)
         except cv2.error:
             return
 
+    @timed('radial profile')
     def get_radial_profile(self) -> np.ndarray or None:
         if self.polar_image is None:
             return
         return self.polar_image.sum(axis=0)
 
+    @timed('angular profile')
     def get_angular_profile(self, geometry: Geometry, roi: Roi) -> np.ndarray or None:
         if self.polar_image is None:
             return
@@ -94,3 +110,9 @@ class PolarImage(object):
         if r1 > r_size or r2 < 0:
             return
         return self.polar_image[:, r1:r2].sum(axis=1)
+
+
+def _remap_source(img: np.ndarray) -> np.ndarray:
+    # float32 images are remapped without a copy, others are converted
+    # (cv2 interpolates float64 images with a lower precision)
+    return np.ascontiguousarray(img, dtype=np.float32)
@@ -3,3 +3,5 @@
 from .basic_profile import BasicProfile, BaselineParams, SavedProfile
 from .radial_profile import RadialProfile
 from .angular_profile import AngularProfile
+from .series_peaks import (SeriesPeaksFinder, SeriesPeaks, SeriesProfile,
+                           SeriesProfileLoader, RoiTrack, find_peaks_2d, track_peaks)
@@ -5,9 +5,9 @@ from .basic_profile import BasicProfile
 
 class AngularProfile(BasicProfile):
 
-    def __init__(self, image_holder, parent=None):
+    def __init__(self, image_holder):
         self.image_holder = image_holder
-        super().__init__(parent)
+        super().__init__()
 
     def update_data_from_source(self, key: int = None):
 
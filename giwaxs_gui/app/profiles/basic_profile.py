@@ -6,9 +6,8 @@ from abc import abstractmethod
 
 import numpy as np
 
-from PyQt5.QtCore import pyqtSignal, pyqtSlot, QObject
-
 from ..utils import baseline_correction, smooth_curve
+from ..signals import Signal
 
 logger = logging.getLogger(__name__)
 
@@ -29,11 +28,10 @@ class SavedProfile:
     baseline: np.ndarray = None
 
 
-class SmoothedProfile(QObject):
-    sigSigmaChanged = pyqtSignal()
+class SmoothedProfile(object):
+    sigSigmaChanged = Signal()
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self):
         self._sigma = 0
         self.baseline_params = BaselineParams()
         self.x_range: Tuple[float, float] or None = None
@@ -67,7 +65,6 @@ class SmoothedProfile(QObject):
     def sigma(self) -> float:
         return self._sigma
 
-    @pyqtSlot(float, name='setSigma')
     def set_sigma(self, sigma: float):
         if sigma <= 0:
             return
@@ -127,11 +124,11 @@ class SmoothedProfile(QObject):
 
 
 class BasicProfile(SmoothedProfile):
-    sigDataToBeUpdated = pyqtSignal()
-    sigDataUpdated = pyqtSignal()
+    sigDataToBeUpdated = Signal()
+    sigDataUpdated = Signal()
 
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self):
+        super().__init__()
         self._is_shown: bool = True
         self._should_update: bool = False
 
@@ -161,7 +158,6 @@ class BasicProfile(SmoothedProfile):
     def update_data_from_source(self,  *args, **kwargs):
         pass
 
-    @pyqtSlot(name='update')
     def update(self):
         if self.is_shown:
             self.update_data()
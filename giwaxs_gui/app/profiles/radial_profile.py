@@ -16,11 +16,11 @@ class SavedProfile:
 
 
 class RadialProfile(BasicProfile):
-    def __init__(self, image_holder, fm: FileManager, parent=None):
+    def __init__(self, image_holder, fm: FileManager):
         self.image_holder = image_holder
         self.fm = fm
         self._current_key: ImageKey = None
-        super().__init__(parent)
+        super().__init__()
 
     def save_state(self):
         if self._current_key and self._raw_y is not None:
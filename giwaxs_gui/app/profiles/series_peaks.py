@@ -0,0 +1,237 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, List, Tuple, Callable, Iterable
+import logging
+
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+
+from ..file_manager import FileManager, ImageKey
+from ..rois import Roi
+
+logger = logging.getLogger(__name__)
+
+# (image key, roi) pairs of a single peak tracked over the images
+RoiTrack = List[Tuple[ImageKey, Roi]]
+
+
+class SeriesProfile(NamedTuple):
+    profile: np.ndarray
+    r_axis: np.ndarray
+    baseline: np.ndarray or None = None
+
+
+class SeriesPeaks(NamedTuple):
+    image_keys: List[ImageKey]
+    r_axis: np.ndarray
+    frames: np.ndarray
+    positions: np.ndarray
+    tracks: np.ndarray
+
+    @property
+    def radii(self) -> np.ndarray:
+        return self.r_axis[self.positions]
+
+    def __len__(self):
+        return self.frames.size
+
+    def roi_tracks(self, width: float, **roi_params) -> List[RoiTrack]:
+        """Rois of the found peaks grouped by tracks."""
+        order = np.lexsort((self.frames, self.tracks))
+        tracks, frames, radii = self.tracks[order], self.frames[order], self.radii[order]
+        bounds = np.flatnonzero(np.diff(tracks)) + 1
+
+        return [
+            [(self.image_keys[frame], Roi(radius=radius, width=width, **roi_params))
+             for frame, radius in zip(track_frames.tolist(), track_radii.tolist())]
+            for track_frames, track_radii in zip(np.split(frames, bounds), np.split(radii, bounds))
+            if track_frames.size
+        ]
+
+
+class SeriesProfileLoader(object):
+    """Radial profile of an image: saved profile (with its baseline) or the sum of the polar image."""
+
+    def __init__(self, fm: FileManager, image_holder):
+        self._fm = fm
+        self._image_holder = image_holder
+
+    def __call__(self, image_key: ImageKey) -> SeriesProfile or None:
+        try:
+            _, polar_image, geometry = self._image_holder.get_data_by_key(image_key)
+        except Exception as err:
+            logger.exception(err)
+            return
+
+        if polar_image is None:
+            return
+
+        r_axis = geometry.r_axis
+        saved_profile = self._fm.profiles[image_key]
+
+        if saved_profile and saved_profile.raw_data is not None and saved_profile.raw_data.size == r_axis.size:
+            return SeriesProfile(saved_profile.raw_data, r_axis, saved_profile.baseline)
+        return SeriesProfile(polar_image.sum(axis=0), r_axis)
+
+
+class SeriesPeaksFinder(object):
+    """
+    Finds peaks of the radial profiles of an image series. The profiles are stacked into a
+    (frames x r) array, smoothed and searched for local maxima at once, and the peaks are
+    tracked over consecutive frames, so that a ring shifting along the series keeps its roi key.
+    max_shift is the maximal shift of a peak between consecutive frames in the units of the r axis
+    (as the roi radius and width), sigma is the smoothing width in profile points.
+    """
+
+    def __init__(self, loader: Callable[[ImageKey], SeriesProfile or None], *,
+                 sigma: float = 8, max_peaks_number: int = 40, max_shift: float = 15,
+                 workers: int = 4):
+        self.loader = loader
+        self.sigma = sigma
+        self.max_peaks_number = max_peaks_number
+        self.max_shift = max_shift
+        self.workers = workers
+
+    def find(self, image_keys: Iterable[ImageKey], *,
+             process_callback: Callable[[int], None] = None,
+             set_max_callback: Callable[[int], None] = None) -> SeriesPeaks:
+        image_keys = list(image_keys)
+
+        if set_max_callback:
+            set_max_callback(len(image_keys))
+
+        image_keys, r_axis, profiles, baselines = self.load_profiles(image_keys, process_callback)
+        return self.find_in_profiles(image_keys, r_axis, profiles, baselines)
+
+    def load_profiles(self, image_keys: List[ImageKey], process_callback: Callable[[int], None] = None
+                      ) -> Tuple[List[ImageKey], np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Loads the profiles by a pool of threads and returns the keys of the loaded images,
+        the common r axis and (frames x r) arrays of the profiles and the baselines.
+        """
+        loaded_keys, rows, baseline_rows = [], [], []
+        r_axis = None
+
+        with ThreadPoolExecutor(max(self.workers, 1)) as executor:
+            for i, (image_key, data) in enumerate(zip(image_keys, executor.map(self.loader, image_keys))):
+                if process_callback:
+                    process_callback(i + 1)
+                if data is None:
+                    continue
+                if r_axis is None:
+                    r_axis = data.r_axis
+                profile, baseline = _on_axis(data, r_axis)
+                rows.append(profile)
+                baseline_rows.append(baseline)
+                loaded_keys.append(image_key)
+
+        if r_axis is None:
+            return [], np.zeros(0), np.zeros((0, 0)), np.zeros((0, 0))
+
+        return loaded_keys, r_axis, np.stack(rows), np.stack(baseline_rows)
+
+    def find_in_profiles(self, image_keys: List[ImageKey], r_axis: np.ndarray,
+                         profiles: np.ndarray, baselines: np.ndarray = None) -> SeriesPeaks:
+        profiles = smooth_profiles(profiles, self.sigma)
+        if baselines is not None:
+            profiles = profiles - baselines
+        frames, positions = find_peaks_2d(profiles, self.max_peaks_number)
+        tracks = track_peaks(frames, positions, self.max_shift / _r_step(r_axis))
+        logger.info(f'{frames.size} peaks in {len(image_keys)} images, {np.unique(tracks).size} tracks.')
+        return SeriesPeaks(image_keys, r_axis, frames, positions, tracks)
+
+
+def _on_axis(data: SeriesProfile, r_axis: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    y = np.asarray(data.profile, dtype=float)
+    baseline = data.baseline if data.baseline is not None and data.baseline.size == y.size else np.zeros_like(y)
+
+    if data.r_axis is r_axis or np.array_equal(data.r_axis, r_axis):
+        return y, baseline
+    return np.interp(r_axis, data.r_axis, y), np.interp(r_axis, data.r_axis, baseline)
+
+
+def _r_step(r_axis: np.ndarray) -> float:
+    if r_axis.size < 2 or r_axis[-1] == r_axis[0]:
+        return 1.
+    return abs(r_axis[-1] - r_axis[0]) / (r_axis.size - 1)
+
+
+def smooth_profiles(profiles: np.ndarray, sigma: float) -> np.ndarray:
+    if sigma <= 0:
+        return profiles
+    return gaussian_filter1d(profiles, sigma, axis=1)
+
+
+def find_peaks_2d(profiles: np.ndarray, max_peaks_number: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Local maxima of every row of the (frames x r) array. Returns frame indices and positions
+    sorted by frame and position. If max_peaks_number is set, only the highest peaks of each frame are kept.
+    """
+    if profiles.shape[-1] < 3:
+        return np.zeros(0, dtype=int), np.zeros(0, dtype=int)
+
+    center = profiles[:, 1:-1]
+    frames, positions = np.nonzero((center > profiles[:, :-2]) & (center >= profiles[:, 2:]))
+    positions += 1
+
+    if max_peaks_number is None or not frames.size:
+        return frames, positions
+
+    heights = profiles[frames, positions]
+    order = np.lexsort((-heights, frames))
+    frames, positions = frames[order], positions[order]
+    rank = np.arange(frames.size) - np.searchsorted(frames, frames)
+    keep = rank < max_peaks_number
+
+    frames, positions = frames[keep], positions[keep]
+    order = np.lexsort((positions, frames))
+    return frames[order], positions[order]
+
+
+def track_peaks(frames: np.ndarray, positions: np.ndarray, max_shift: float) -> np.ndarray:
+    """
+    Links the peaks of consecutive frames: a peak continues the track of the nearest peak
+    of the previous frame if it is not farther than max_shift points (each track is continued
+    by the closest peak only). The input has to be sorted by frame and position.
+    Returns track ids of the peaks.
+    """
+    tracks = np.empty(frames.size, dtype=int)
+
+    if not frames.size:
+        return tracks
+
+    bounds = np.flatnonzero(np.diff(frames)) + 1
+    starts, stops = np.r_[0, bounds], np.r_[bounds, frames.size]
+    prev_frame, prev_positions, prev_tracks = None, positions[:0], tracks[:0]
+    num_tracks = 0
+
+    for start, stop in zip(starts, stops):
+        frame, current = frames[start], positions[start:stop]
+        current_tracks = np.full(current.size, -1)
+
+        if prev_frame == frame - 1 and prev_positions.size:
+            matched, nearest = _match_nearest(prev_positions, current, max_shift)
+            current_tracks[matched] = prev_tracks[nearest]
+
+        new = current_tracks == -1
+        current_tracks[new] = np.arange(num_tracks, num_tracks + new.sum())
+        num_tracks += new.sum()
+
+        tracks[start:stop] = current_tracks
+        prev_frame, prev_positions, prev_tracks = frame, current, current_tracks
+
+    return tracks
+
+
+def _match_nearest(prev: np.ndarray, current: np.ndarray, max_shift: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Indices of the matched current peaks and of their nearest previous peaks."""
+    j = np.searchsorted(prev, current)
+    left, right = np.clip(j - 1, 0, prev.size - 1), np.clip(j, 0, prev.size - 1)
+    nearest = np.where(np.abs(prev[left] - current) <= np.abs(prev[right] - current), left, right)
+    dist = np.abs(prev[nearest] - current)
+
+    matched = np.flatnonzero(dist <= max_shift)
+    # a previous peak is continued by the closest current peak only
+    order = matched[np.lexsort((dist[matched], nearest[matched]))]
+    _, first = np.unique(nearest[order], return_index=True)
+    matched = order[first]
+    return matched, nearest[matched]
@@ -0,0 +1,166 @@
+"""
+Lightweight timing instrumentation of the analysis stages.
+
+Stages are marked by the timed decorator or the stage context manager:
+
+    @timed('polar remap')
+    def calc_polar_image(...): ...
+
+    with stage('save'):
+        ...
+
+The wall time, the cpu time of the thread and (optionally) the net number of bytes
+allocated are aggregated per stage into histograms. The profiler is disabled
+by default, then the instrumentation costs a single attribute check per call.
+"""
+
+import json
+import time
+import threading
+import tracemalloc
+from bisect import bisect_right
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+from pathlib import Path
+from typing import Dict, List, Callable
+
+__all__ = ['Profiler', 'StageStats', 'profiler', 'stage', 'timed', 'HISTOGRAM_BINS']
+
+# upper bounds (seconds) of the wall time histogram bins: 1 us to 100 s, 4 bins per decade
+HISTOGRAM_BINS: List[float] = [10 ** (i / 4) for i in range(-24, 9)]
+
+
+class StageStats(object):
+    __slots__ = ('name', 'count', 'wall', 'cpu', 'allocated', 'min', 'max', 'histogram')
+
+    def __init__(self, name: str):
+        self.name: str = name
+        self.count: int = 0
+        self.wall: float = 0.
+        self.cpu: float = 0.
+        self.allocated: int = 0
+        self.min: float = float('inf')
+        self.max: float = 0.
+        # the last bin counts the calls longer than HISTOGRAM_BINS[-1]
+        self.histogram: List[int] = [0] * (len(HISTOGRAM_BINS) + 1)
+
+    @property
+    def mean(self) -> float:
+        return self.wall / self.count if self.count else 0.
+
+    def add(self, wall: float, cpu: float, allocated: int = 0):
+        self.count += 1
+        self.wall += wall
+        self.cpu += cpu
+        self.allocated += allocated
+        self.min = min(self.min, wall)
+        self.max = max(self.max, wall)
+        self.histogram[bisect_right(HISTOGRAM_BINS, wall)] += 1
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the histogram bin containing the q-quantile of the wall time."""
+        if not self.count:
+            return 0.
+        threshold, total = q * self.count, 0
+        for i, num in enumerate(self.histogram):
+            total += num
+            if total >= threshold:
+                return min(HISTOGRAM_BINS[i], self.max) if i < len(HISTOGRAM_BINS) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return dict(count=self.count, wall=self.wall, cpu=self.cpu, allocated=self.allocated,
+                    min=self.min if self.count else 0., max=self.max, mean=self.mean,
+                    median=self.quantile(0.5), p90=self.quantile(0.9), histogram=list(self.histogram))
+
+
+class Profiler(object):
+    """Aggregates timings of named stages (thread-safe). Disabled by default."""
+
+    def __init__(self):
+        self.enabled: bool = False
+        self.track_memory: bool = False
+        self._stats: Dict[str, StageStats] = {}
+        self._lock = threading.Lock()
+        self._tracing: bool = False
+
+    def enable(self, enabled: bool = True, track_memory: bool = None):
+        if track_memory is not None:
+            self.track_memory = track_memory
+        self.enabled = enabled
+
+        # tracemalloc slows down all allocations, it is running only when needed
+        if enabled and self.track_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tracing = True
+        elif self._tracing:
+            tracemalloc.stop()
+            self._tracing = False
+
+    def disable(self):
+        self.enable(False)
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL_CONTEXT
+        return self._measure(name)
+
+    def timed(self, name: str = None) -> Callable:
+        def wrapper(func):
+            stage_name = name or func.__qualname__
+
+            @wraps(func)
+            def timed_func(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                with self._measure(stage_name):
+                    return func(*args, **kwargs)
+
+            return timed_func
+
+        return wrapper
+
+    @contextmanager
+    def _measure(self, name: str):
+        memory = tracemalloc.is_tracing()
+        allocated = tracemalloc.get_traced_memory()[0] if memory else 0
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.thread_time() - cpu
+            if memory and tracemalloc.is_tracing():
+                allocated = tracemalloc.get_traced_memory()[0] - allocated
+            else:
+                allocated = 0
+            self.record(name, wall, cpu, allocated)
+
+    def record(self, name: str, wall: float, cpu: float = 0., allocated: int = 0):
+        with self._lock:
+            try:
+                stats = self._stats[name]
+            except KeyError:
+                stats = self._stats[name] = StageStats(name)
+            stats.add(wall, cpu, allocated)
+
+    def stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self._stats.items()}
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+    def to_json(self) -> str:
+        return json.dumps(dict(histogram_bins=HISTOGRAM_BINS, stages=self.stats()), indent=2)
+
+    def export_json(self, path: Path or str):
+        Path(path).write_text(self.to_json())
+
+
+_NULL_CONTEXT = nullcontext()
+
+profiler = Profiler()
+stage = profiler.stage
+timed = profiler.timed
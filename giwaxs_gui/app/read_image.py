@@ -1,18 +1,302 @@
 # -*- coding: utf-8 -*-
-from typing import Union
+"""
+Image readers registered by file suffix.
+
+Uncompressed detector frames (TIFF and EDF) keep the pixel data at a fixed offset,
+such files are mapped into memory (np.memmap) without copying the data.
+The parsed TIFF layout is cached per folder, as the detector files of a folder share
+the same layout, and is reused if the header bytes it depends on are the same.
+EDF headers are parsed for every file, as they are short text headers with values at
+varying offsets.
+Other files are read by PIL / read_edf. Compressed files (.edf.gz) are read from
+the decompressed cache if it is set.
+"""
+
+import logging
+import struct
+from abc import ABC, abstractmethod
+import threading
+from typing import Union, Tuple, List, Dict, NamedTuple, BinaryIO
 from pathlib import Path
 
 import numpy as np
 from PIL import Image
 from read_edf import read_edf
 
+from .decompressed_cache import DecompressedCache
+
+__all__ = ['read_image', 'ImageReader', 'ImageLayout', 'register_reader', 'get_reader', 'layout_cache',
+           'set_decompressed_cache']
+
+logger = logging.getLogger(__name__)
+
+
+class ImageLayout(NamedTuple):
+    offset: int
+    dtype: np.dtype
+    shape: Tuple[int, int]
+    # (offset, bytes) parts of the header that must match for another file to share the layout
+    checks: Tuple[Tuple[int, bytes], ...] = ()
+    # edf frames are stored transposed
+    rotate: bool = False
+
+    @property
+    def size(self) -> int:
+        return self.offset + self.dtype.itemsize * self.shape[0] * self.shape[1]
+
+    def matches(self, file: BinaryIO, file_size: int) -> bool:
+        if file_size < self.size:
+            return False
+        for offset, data in self.checks:
+            file.seek(offset)
+            if file.read(len(data)) != data:
+                return False
+        return True
+
+
+class ImageReader(ABC):
+    """Reads images with the given suffixes. parse_layout returns None if the data cannot be mapped."""
+
+    suffixes: Tuple[str, ...] = ()
+    # layouts are cached per folder if they can be validated by ImageLayout.checks
+    cache_layout: bool = True
+
+    def parse_layout(self, path: Path, file: BinaryIO) -> ImageLayout or None:
+        return None
+
+    @abstractmethod
+    def read(self, path: Path) -> np.ndarray:
+        pass
+
+
+class _PilReader(ImageReader):
+    def read(self, path: Path) -> np.ndarray:
+        return np.array(Image.open(str(path)))
+
+
+class TiffReader(_PilReader):
+    suffixes = ('.tif', '.tiff')
+
+    _TYPES = {3: ('H', 2), 4: ('I', 4), 16: ('Q', 8)}
+    _SAMPLE_FORMATS = {1: 'u', 2: 'i', 3: 'f'}
+
+    def parse_layout(self, path: Path, file: BinaryIO) -> ImageLayout or None:
+        header = file.read(8)
+        if header[:4] == b'II*\x00':
+            endian = '<'
+        elif header[:4] == b'MM\x00*':
+            endian = '>'
+        else:
+            return None
+
+        ifd_offset = struct.unpack(endian + 'I', header[4:])[0]
+        file.seek(ifd_offset)
+        num_data = file.read(2)
+        num = struct.unpack(endian + 'H', num_data)[0]
+        entries = file.read(12 * num)
+        checks = [(0, header), (ifd_offset, num_data + entries)]
+
+        tags = {}
+        for i in range(num):
+            tag, type_, count, value = struct.unpack(endian + 'HHI4s', entries[12 * i: 12 * (i + 1)])
+            if type_ not in self._TYPES:
+                continue
+            fmt, itemsize = self._TYPES[type_]
+            if count * itemsize <= 4:
+                values = struct.unpack(endian + fmt * count, value[:count * itemsize])
+            else:
+                pointer = struct.unpack(endian + 'I', value)[0]
+                file.seek(pointer)
+                data = file.read(count * itemsize)
+                values = struct.unpack(endian + fmt * count, data)
+                checks.append((pointer, data))
+            tags[tag] = values
+
+        try:
+            width, height = tags[256][0], tags[257][0]
+            bits = tags.get(258, (1,))[0]
+            strip_offsets, strip_counts = tags[273], tags[279]
+        except KeyError:
+            return None
+
+        if (
+                tags.get(259, (1,))[0] != 1 or  # compression
+                tags.get(277, (1,))[0] != 1 or  # samples per pixel
+                322 in tags or  # tiles
+                bits not in (8, 16, 32, 64)
+        ):
+            return None
+
+        kind = self._SAMPLE_FORMATS.get(tags.get(339, (1,))[0])
+        if not kind or kind == 'f' and bits < 32:
+            return None
+
+        # strips have to be contiguous
+        for offset, count, next_offset in zip(strip_offsets, strip_counts, strip_offsets[1:]):
+            if offset + count != next_offset:
+                return None
+
+        dtype = np.dtype(f'{endian}{kind}{bits // 8}')
+        layout = ImageLayout(strip_offsets[0], dtype, (height, width), tuple(checks))
+
+        if sum(strip_counts) < layout.size - layout.offset:
+            return None
+        return layout
+
+
+class EdfReader(ImageReader):
+    suffixes = ('.edf', '.edf.gz')
+    cache_layout = False
+
+    _DTYPES = {
+        'SIGNEDBYTE': 'i1', 'UNSIGNEDBYTE': 'u1',
+        'SIGNEDSHORT': 'i2', 'UNSIGNEDSHORT': 'u2',
+        'SIGNEDINTEGER': 'i4', 'UNSIGNEDINTEGER': 'u4',
+        'SIGNEDLONG': 'i4', 'UNSIGNEDLONG': 'u4',
+        'SIGNED64': 'i8', 'UNSIGNED64': 'u8',
+        'FLOATVALUE': 'f4', 'FLOAT': 'f4', 'DOUBLEVALUE': 'f8',
+    }
+    _HEADER_SIZE = 1 << 12
+    _MAX_HEADER_SIZE = 1 << 16
+
+    def parse_layout(self, path: Path, file: BinaryIO) -> ImageLayout or None:
+        if not path.name.endswith('.edf'):
+            return None
+
+        # headers are usually shorter than _HEADER_SIZE
+        data = file.read(self._HEADER_SIZE)
+        if data[:1] != b'{':
+            return None
+        if data.find(b'}\n') == -1:
+            data += file.read(self._MAX_HEADER_SIZE - len(data))
+        header_size = data.find(b'}\n') + 2
+        if header_size == 1:
+            return None
+
+        params = {}
+        for item in data[1:header_size].decode('utf-8', errors='replace').replace('\n', '').split(';'):
+            items = item.replace(' ', '').replace('{', '').replace('}', '').split('=')
+            if len(items) == 2:
+                params[items[0]] = items[1]
+
+        try:
+            dtype = self._DTYPES[params['DataType'].upper()]
+            shape = int(params['Dim_2']), int(params['Dim_1'])
+            size = int(params['Size'])
+        except (KeyError, ValueError):
+            return None
+
+        if params.get('Compression', 'None').upper() not in ('NONE', 'NO'):
+            return None
+
+        endian = '>' if params.get('ByteOrder') == 'HighByteFirst' else '<'
+        layout = ImageLayout(header_size, np.dtype(endian + dtype), shape,
+                             ((0, b'{'), (header_size - 2, b'}\n')), rotate=True)
+        if size != layout.size - layout.offset:
+            return None
+        return layout
+
+    def read(self, path: Path) -> np.ndarray:
+        return read_edf(str(path))
+
+
+class _LayoutCache(object):
+    """Layouts of the mapped files per (folder, reader)."""
+
+    def __init__(self):
+        self._layouts: Dict[Tuple[Path, type], ImageLayout] = {}
+        self._lock = threading.Lock()
+
+    def get(self, path: Path, reader: ImageReader, file: BinaryIO) -> ImageLayout or None:
+        key = path.parent, type(reader)
+        file_size = path.stat().st_size
+
+        if reader.cache_layout:
+            with self._lock:
+                layout = self._layouts.get(key)
+
+            if layout and layout.matches(file, file_size):
+                return layout
+
+        file.seek(0)
+        layout = reader.parse_layout(path, file)
+
+        if layout and layout.matches(file, file_size):
+            if reader.cache_layout:
+                with self._lock:
+                    self._layouts[key] = layout
+            return layout
+
+    def clear(self):
+        with self._lock:
+            self._layouts.clear()
+
+
+_READERS: List[ImageReader] = []
+_DEFAULT_READER = _PilReader()
+
+layout_cache = _LayoutCache()
+
+_decompressed_cache: DecompressedCache or None = None
+
+
+def register_reader(reader: ImageReader):
+    _READERS.insert(0, reader)
+
+
+def get_reader(path: Path) -> ImageReader:
+    name = path.name.lower()
+    for reader in _READERS:
+        if any(name.endswith(suffix) for suffix in reader.suffixes):
+            return reader
+    return _DEFAULT_READER
+
+
+register_reader(TiffReader())
+register_reader(EdfReader())
+
+
+def set_decompressed_cache(cache: DecompressedCache or None):
+    global _decompressed_cache
+    _decompressed_cache = cache
+
+
+def read_image(filepath: Union[Path, str], mmap: bool = True) -> np.ndarray:
+    path = Path(filepath).resolve()
+    cache = _decompressed_cache
+
+    if cache and cache.is_compressed(path):
+        try:
+            path = cache.get(path)
+        except Exception as err:
+            logger.exception(err)
+
+    reader = get_reader(path)
+
+    if mmap:
+        try:
+            image = _read_mapped(path, reader)
+        except Exception as err:
+            logger.debug(f'Could not map {path}: {err}')
+            image = None
+        if image is not None:
+            return image
+
+    return reader.read(path)
+
+
+def _read_mapped(path: Path, reader: ImageReader) -> np.ndarray or None:
+    with open(str(path), 'rb') as f:
+        layout = layout_cache.get(path, reader, f)
+
+    if not layout:
+        return
 
-def read_image(filepath: Union[Path, str]) -> np.array:
-    if isinstance(filepath, Path):
-        filepath = str(filepath.resolve())
+    image = np.memmap(str(path), dtype=layout.dtype, mode='r', offset=layout.offset, shape=layout.shape)
+    image = image.view(np.ndarray)
 
-    if filepath.endswith('.edf') or filepath.endswith('.edf.gz'):
-        image = read_edf(filepath)
-    else:
-        image = np.array(Image.open(filepath))
+    if not layout.dtype.isnative:
+        image = image.astype(layout.dtype.newbyteorder('='))
+    if layout.rotate:
+        image = np.rot90(image)
     return image
@@ -1,5 +1,5 @@
 from collections import OrderedDict
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
 from typing import Tuple
 
@@ -13,22 +13,23 @@ class PostponedImport(object):
     def __init__(self):
         self._module = None
 
-    @classmethod
-    def init_module(cls):
+    def init_module(self):
         pass
 
-    @classmethod
-    def __getattr__(cls, item):
-        if not hasattr(cls, '_module'):
-            cls.init_module()
-        return cls._module.__getattr__(item)
+    def __getattr__(self, item):
+        # called for the attributes of the module only
+        if self._module is None:
+            self.init_module()
+        return getattr(self._module, item)
 
 
-class Fit(PostponedImport):
-    @classmethod
-    def init_module(cls):
+class _Fit(PostponedImport):
+    def init_module(self):
         import giwaxs_gui.app.fitting as fit
-        cls._module = fit
+        self._module = fit
+
+
+Fit = _Fit()
 
 
 class RoiTypes(Enum):
@@ -91,7 +92,31 @@ class Roi:
         self.confidence_level = level
 
     def update(self, other: 'Roi'):
-        self.__dict__ = other.__dict__
+        for f in fields(self):
+            setattr(self, f.name, getattr(other, f.name))
+
+    @property
+    def is_bound(self) -> bool:
+        return self.__dict__.get('_table') is not None
+
+    def _bind(self, table, row: int) -> tuple:
+        values = tuple(_COLUMNS[name].to_column(self.__dict__.pop(name, _DEFAULTS.get(name)))
+                       for name in _TABLE_NAMES)
+        self.__dict__['_table'] = table
+        self.__dict__['_row'] = row
+        return values
+
+    def _unbind(self):
+        values = {name: getattr(self, name) for name in _TABLE_NAMES}
+        del self.__dict__['_table'], self.__dict__['_row']
+        self.__dict__.update(values)
+
+    def __getstate__(self):
+        state = dict(self.__dict__)
+        if state.pop('_table', None) is not None:
+            del state['_row']
+            state.update({name: getattr(self, name) for name in _TABLE_NAMES})
+        return state
 
     def to_array(self) -> np.ndarray:
         return np.array([self.radius, self.width, self.angle, self.angle_std,
@@ -175,6 +200,70 @@ DTYPES = [
 
 _ROI_NAMES = list(map(lambda x: x[0], DTYPES))
 
+# columns of RoiData table. Float columns are stored in double precision to keep fitted values intact.
+ROI_TABLE_DTYPES = [(name, 'f8' if dtype == 'f4' else dtype) for name, dtype in DTYPES] + [
+    ('confidence_level', 'f8'),
+    ('active', '?'),
+    ('movable', '?'),
+]
+
+_TABLE_NAMES = list(map(lambda x: x[0], ROI_TABLE_DTYPES))
+
+
+class _RoiColumn(object):
+    """
+    Descriptor for the Roi attributes stored in a RoiData table. While a roi does not belong
+    to a RoiData, the value is stored in the instance dict.
+    """
+
+    __slots__ = ('name', 'to_column', 'from_column')
+
+    def __init__(self, name: str, to_column=float, from_column=float):
+        self.name = name
+        self.to_column = to_column
+        self.from_column = from_column
+
+    def __get__(self, roi, owner=None):
+        if roi is None:
+            return self
+        table = roi.__dict__.get('_table')
+        if table is None:
+            return roi.__dict__[self.name]
+        return self.from_column(table.array[self.name][roi.__dict__['_row']].item())
+
+    def __set__(self, roi, value):
+        table = roi.__dict__.get('_table')
+        if table is None:
+            roi.__dict__[self.name] = value
+        else:
+            table.array[self.name][roi.__dict__['_row']] = self.to_column(value)
+
+
+def _key_to_column(key: int or None) -> int:
+    return -1 if key is None else int(key)
+
+
+def _key_from_column(key: int) -> int or None:
+    return None if key == -1 else key
+
+
+_COLUMNS = {
+    'radius': _RoiColumn('radius'),
+    'width': _RoiColumn('width'),
+    'angle': _RoiColumn('angle'),
+    'angle_std': _RoiColumn('angle_std'),
+    'key': _RoiColumn('key', _key_to_column, _key_from_column),
+    'type': _RoiColumn('type', lambda t: RoiTypes(t).value, RoiTypes),
+    'confidence_level': _RoiColumn('confidence_level'),
+    'active': _RoiColumn('active', bool, bool),
+    'movable': _RoiColumn('movable', bool, bool),
+}
+
+_DEFAULTS = {f.name: f.default for f in fields(Roi)}
+
+for _name, _column in _COLUMNS.items():
+    setattr(Roi, _name, _column)
+
 
 def roi_to_tuple(roi: Roi):
     return (roi.radius, roi.width, roi.angle, roi.angle_std,
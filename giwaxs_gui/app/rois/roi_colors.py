@@ -1,9 +1,8 @@
 from typing import Dict, Tuple
 
-from PyQt5.QtCore import QObject, pyqtSignal
-
 from ..file_manager import FileManager
 from .roi import RoiTypes
+from ..signals import Signal
 
 SELECTED = True
 NOT_SELECTED = False
@@ -46,14 +45,13 @@ class RoiColorsDict(dict):
         self.update(_DEFAULT_ROI_COLORS)
 
 
-class RoiColors(QObject):
+class RoiColors(object):
     _SAVE_KEY = 'roi_colors'
 
-    sigColorChanged = pyqtSignal(tuple)
-    sigColorDictSet = pyqtSignal()
+    sigColorChanged = Signal(tuple)
+    sigColorDictSet = Signal()
 
-    def __init__(self, fm: FileManager, color_dict: RoiColorsDict = None, parent=None):
-        super().__init__(parent)
+    def __init__(self, fm: FileManager, color_dict: RoiColorsDict = None):
         self._fm = fm
         self._color_dict: RoiColorsDict = color_dict or RoiColorsDict(fm.config[self._SAVE_KEY])
 
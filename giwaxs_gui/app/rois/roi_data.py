@@ -1,17 +1,45 @@
+from copy import copy
 from typing import List, Tuple, Dict
 
 import numpy as np
+from numpy.lib.recfunctions import structured_to_unstructured
 
-from .roi import Roi, RoiTypes
+from .roi import Roi, RoiTypes, ROI_TABLE_DTYPES, ROI_DICT_KEYS, _ROI_NAMES, _COLUMNS, _TABLE_NAMES
 
 
 class RoiData(dict):
+    """
+    Dict of rois (key -> Roi) with the numeric roi attributes stored in a structured array
+    (see ROI_TABLE_DTYPES). Rois added to RoiData become views of the table rows, so that
+    scale and bounds changes and exports are performed on the whole columns at once.
+    """
+
     def __init__(self, rois: List[Roi] = None):
         super().__init__()
         self._selected_keys = set()
+        self._init_table()
         if rois:
             self.add_rois(rois)
 
+    def _init_table(self, capacity: int = 0):
+        self._array: np.ndarray = np.zeros(capacity, dtype=ROI_TABLE_DTYPES)
+        self._row_keys: list = []
+
+    @property
+    def array(self) -> np.ndarray:
+        return self._array
+
+    @property
+    def table(self) -> np.ndarray:
+        """Table view, rows are not ordered."""
+        return self._array[:len(self._row_keys)]
+
+    @property
+    def ordered_table(self) -> np.ndarray:
+        """Copy of the table with rows in the order of the dict."""
+        rows = np.fromiter((roi.__dict__['_row'] for roi in self.values()), dtype=np.int64, count=len(self))
+        return self._array[rows]
+
     @property
     def selected_keys(self):
         yield from self._selected_keys
@@ -53,76 +81,125 @@ class RoiData(dict):
         return [self[i] for i in self._selected_keys]
 
     def select_all(self) -> List[int]:
-        to_select = list()
-        for roi in self.values():
-            if not roi.active:
-                roi.active = True
-                to_select.append(roi.key)
+        to_select = self._keys_by_mask(~self.table['active'])
+        self.table['active'] = True
         self._selected_keys = set(self.keys())
         return to_select
 
     def unselect_all(self) -> List[int]:
-        to_unselect = list()
-        for roi in self.values():
-            if roi.active:
-                roi.active = False
-                to_unselect.append(roi.key)
+        to_unselect = self._keys_by_mask(self.table['active'])
+        self.table['active'] = False
         self._selected_keys = set()
         return to_unselect
 
     def add_roi(self, roi: Roi) -> None:
-        self[roi.key] = roi
-
-        if roi.active:
-            self._selected_keys.add(roi.key)
+        self.add_rois([roi])
 
     def add_rois(self, roi_list: List[Roi]) -> List[int]:
-        keys = list()
         to_select = list()
+        self._reserve(len(roi_list))
+
         for roi in roi_list:
+            if roi.key in self.keys():
+                self._delete_row(self[roi.key])
+            if roi.is_bound:
+                # a roi can be a view of a single table only
+                roi = copy(roi)
+            row = len(self._row_keys)
+            self._array[row] = roi._bind(self, row)
+            self._row_keys.append(roi.key)
             self[roi.key] = roi
+
             if roi.active:
                 self._selected_keys.add(roi.key)
                 to_select.append(roi.key)
-            keys.append(roi.key)
         return to_select
 
+    def add_table(self, table: np.ndarray, attributes: List[dict] = None) -> List[int]:
+        """
+        Adds rois from the rows of a table (ROI_TABLE_DTYPES) at once. attributes are
+        the attributes of the rois that are not stored in the table (name, fitted_parameters, ...),
+        the dicts are shallow-copied. Rois with existing keys are replaced, the caller
+        has to emit their deletion to the views (as RoiDict.apply_rois_to_images).
+        """
+        keys = table['key'].tolist()
+
+        for key in keys:
+            if key in self:
+                self.delete_roi(key)
+
+        num, start = len(keys), len(self._row_keys)
+        self._reserve(num)
+        self._array[start:start + num] = table
+
+        for i, key in enumerate(keys):
+            roi = Roi.__new__(Roi)
+            roi.__dict__.update(_copy_attributes(attributes[i]) if attributes else _DEFAULT_ATTRIBUTES)
+            roi.__dict__['_table'] = self
+            roi.__dict__['_row'] = start + i
+            self._row_keys.append(key)
+            self[key] = roi
+
+        to_select = [key for key, active in zip(keys, table['active'].tolist()) if active]
+        self._selected_keys.update(to_select)
+        return to_select
+
+    def attributes(self) -> List[dict]:
+        """Attributes of the rois in the order of the table that are not stored in the table."""
+        return [_roi_attributes(self[key]) for key in self._row_keys]
+
     def delete_roi(self, k: int):
-        del self[k]
+        self._delete_row(self.pop(k))
 
         if k in self._selected_keys:
             self._selected_keys.remove(k)
 
     def clear(self):
+        for roi in self.values():
+            roi._unbind()
         super().clear()
         self._selected_keys = set()
+        self._init_table()
 
     def change_ring_bounds(self, bounds: Tuple[float, float]) -> List[int]:
         angle, angle_std = bounds
-        keys = list()
-        for k, roi in self.items():
-            if roi.should_adjust_angles(angle, angle_std):
-                keys.append(k)
-                roi.angle, roi.angle_std = bounds
-        return keys
+        table = self.table
+        mask = (
+                np.isin(table['type'], (RoiTypes.ring.value, RoiTypes.background.value)) &
+                ((table['angle'] != angle) | (table['angle_std'] != angle_std))
+        )
+        table['angle'][mask] = angle
+        table['angle_std'][mask] = angle_std
+        return self._keys_by_mask(mask)
+
+    def set_movable(self, movable: bool, only_selected: bool = False) -> List[int]:
+        table = self.table
+        mask = table['movable'] != movable
+        if only_selected:
+            mask &= table['active']
+        table['movable'][mask] = movable
+        return self._keys_by_mask(mask)
 
     def on_scale_changed(self, scale_change: float):
-        for roi in self.values():
-            roi.radius *= scale_change
-            roi.width *= scale_change
+        table = self.table
+        table['radius'] *= scale_change
+        table['width'] *= scale_change
 
     def apply_fit(self, rois: List[Roi]):
+        """Updates or creates the fitted rois, they become fixed and the only selected rois."""
         keys_to_move = []
         rois_to_create = []
 
+        self.unselect_all()
+
         for roi in rois:
             roi.active = True
             roi.movable = False
 
-            if roi.key in self.keys():
+            if roi.key in self:
                 keys_to_move.append(roi.key)
                 self[roi.key].update(roi)
-                self.select(roi.key)
+                self._selected_keys.add(roi.key)
             else:
                 rois_to_create.append(roi)
 
@@ -132,16 +209,24 @@ class RoiData(dict):
         return tuple(keys_to_create), tuple(keys_to_move)
 
     def to_array(self) -> np.ndarray:
-        return np.array([roi.to_array() for roi in self.values()])
+        if not len(self):
+            return np.array([])
+        return structured_to_unstructured(self.ordered_table[_ROI_NAMES], dtype=np.float64)
 
     @classmethod
     def from_array(cls, arr: np.ndarray):
         return cls([Roi.from_array(a) for a in arr])
 
     def to_dict(self) -> Dict[str, np.ndarray]:
-        roi_dicts = [roi.to_dict() for roi in self.values()]
-        keys = set().union(*[d.keys() for d in roi_dicts])
-        res = {k: np.array([d.get(k, np.nan) for d in roi_dicts]) for k in keys}
+        if not len(self):
+            return {}
+
+        fitted_parameters = [roi.fitted_parameters or {} for roi in self.values()]
+        keys = set().union(*[d.keys() for d in fitted_parameters]).difference(ROI_DICT_KEYS)
+        res = {k: _to_array([d.get(k, np.nan) for d in fitted_parameters]) for k in keys}
+
+        table = self.ordered_table
+        res.update({k: table[k] for k in ROI_DICT_KEYS})
         return res
 
     @classmethod
@@ -150,9 +235,16 @@ class RoiData(dict):
         if not keys:
             return cls()
         num_rois = len(arr_dict[keys[0]])
+
+        if 'fitting_function' not in arr_dict:
+            # no fitted parameters, the columns are copied at once
+            roi_data = cls()
+            roi_data._set_columns(num_rois, {k: arr_dict[k] for k in ROI_DICT_KEYS if k in arr_dict})
+            return roi_data
+
         rois = [
             Roi.from_dict({
-                k: arr_dict[k][i] for k in arr_dict.keys() if not np.isnan(arr_dict[k][i])
+                k: _from_h5_value(arr_dict[k][i]) for k in arr_dict.keys() if not _is_missing(arr_dict[k][i])
             })
             for i in range(num_rois)
         ]
@@ -160,8 +252,118 @@ class RoiData(dict):
 
     @property
     def intensities(self):
-        return np.array([roi.intensity for roi in self.values()], dtype=np.float)
+        return np.array([roi.intensity for roi in self.values()], dtype=float)
 
     @property
     def confidence_levels(self):
-        return np.array([roi.confidence_level for roi in self.values()], dtype=np.float)
+        return self.ordered_table['confidence_level']
+
+    def _set_columns(self, num: int, columns: Dict[str, np.ndarray]):
+        template = Roi(0., 0.)
+        table = np.zeros(num, dtype=ROI_TABLE_DTYPES)
+
+        for name in table.dtype.names:
+            if name in columns:
+                table[name] = columns[name]
+            else:
+                table[name] = _COLUMNS[name].to_column(getattr(template, name))
+        if 'key' not in columns:
+            table['key'] = np.arange(num)
+
+        self._array = table
+
+        for row in range(num):
+            roi = Roi(0., 0.)
+            roi._bind(self, row)
+            self._row_keys.append(roi.key)
+            self[roi.key] = roi
+            if roi.active:
+                self._selected_keys.add(roi.key)
+
+    def _reserve(self, num: int):
+        size = len(self._row_keys)
+        if size + num <= self._array.size:
+            return
+        array = np.zeros(max(size + num, 2 * self._array.size, 8), dtype=ROI_TABLE_DTYPES)
+        array[:size] = self._array[:size]
+        self._array = array
+
+    def _delete_row(self, roi: Roi):
+        row = roi.__dict__['_row']
+        roi._unbind()
+        last = len(self._row_keys) - 1
+        if row != last:
+            # the last row is moved to the free place
+            self._array[row] = self._array[last]
+            moved_key = self._row_keys[row] = self._row_keys[last]
+            self[moved_key].__dict__['_row'] = row
+        self._row_keys.pop()
+
+    def _keys_by_mask(self, mask: np.ndarray) -> List[int]:
+        return [self._row_keys[i] for i in np.flatnonzero(mask)]
+
+    # rois are pickled without the table, the table is restored from the rois
+
+    def __reduce__(self):
+        return self.__class__, (list(self.values()),)
+
+    def __copy__(self):
+        return self.__class__([copy(roi) for roi in self.values()])
+
+    def __setstate__(self, state: dict):
+        # RoiData pickled as a plain dict of rois
+        rois = list(self.values())
+        super().clear()
+        self.__dict__.update(state)
+        self._selected_keys = set()
+        self._init_table()
+        self.add_rois(rois)
+
+
+def copy_rois(rois: List[Roi]) -> List[Roi]:
+    """Unbound copies of the rois, cheaper than deepcopy (fitted parameters are shallow-copied)."""
+    copies = []
+    for roi in rois:
+        roi = copy(roi)
+        if roi.fitted_parameters:
+            roi.fitted_parameters = dict(roi.fitted_parameters)
+        copies.append(roi)
+    return copies
+
+
+def _roi_attributes(roi: Roi) -> dict:
+    return {k: v for k, v in roi.__dict__.items() if k not in _TABLE_NAMES and k not in ('_table', '_row')}
+
+
+def _copy_attributes(attributes: dict) -> dict:
+    attributes = dict(attributes)
+    if attributes.get('fitted_parameters'):
+        attributes['fitted_parameters'] = dict(attributes['fitted_parameters'])
+    return attributes
+
+
+_DEFAULT_ATTRIBUTES = _roi_attributes(Roi(0., 0.))
+
+
+def _is_missing(value) -> bool:
+    # nan (or nan rows) for numbers, empty strings for the names stored to h5
+    if isinstance(value, (bytes, str)):
+        return not value
+    try:
+        return bool(np.all(np.isnan(value)))
+    except TypeError:
+        return False
+
+
+def _from_h5_value(value):
+    return value.decode() if isinstance(value, bytes) else value
+
+
+def _to_array(values: list) -> np.ndarray:
+    try:
+        return np.array(values)
+    except ValueError:
+        # parameters of different shapes (e.g. failed fits)
+        arr = np.empty(len(values), dtype=object)
+        arr[:] = values
+        return arr
@@ -1,19 +1,21 @@
-from copy import deepcopy
-from typing import List, Tuple, Iterable
+from functools import wraps
+from typing import List, Tuple, Iterable, Dict
 import logging
 
 import numpy as np
-from PyQt5.QtCore import pyqtSlot, pyqtSignal, QObject
 
 from .roi import Roi, RoiTypes
-from .roi_data import RoiData
+from .roi_data import RoiData, copy_rois
 from .roi_meta_data import RoiMetaData
 from .roi_colors import RoiColors, RoiColorsDict, ROI_COLOR_KEY
 from ..file_manager import FileManager, ImageKey, FolderKey
 from ..geometry_holder import GeometryHolder
+from ..signals import Signal
+from ..throttle import EventCoalescer, Scheduler
 
 
 def _check_non_empty(func):
+    @wraps(func)
     def wrapper(self, *args, **kwargs):
         if not self._current_key:
             return
@@ -23,39 +25,51 @@ def _check_non_empty(func):
     return wrapper
 
 
-class RoiDict(QObject):
-    sig_roi_created = pyqtSignal(tuple)
-    sig_roi_deleted = pyqtSignal(tuple)
-    sig_roi_moved = pyqtSignal(tuple, str)
-    sig_deleted_rois_updated = pyqtSignal(tuple)
+def _merge_move_sources(name: str, other_name: str) -> str:
+    # a roi moved by different views within one period is updated in all the views
+    return name if name == other_name else ''
 
-    sig_selected = pyqtSignal(tuple)
-    sig_one_selected = pyqtSignal(int)
-    sig_roi_renamed = pyqtSignal(int)
-    sig_fixed = pyqtSignal(tuple)
-    sig_unfixed = pyqtSignal(tuple)
 
-    sig_type_changed = pyqtSignal(int)
-    sigFitRoisOpen = pyqtSignal(list)
-    sigColorChanged = pyqtSignal(tuple)
+class RoiDict(object):
+    sig_roi_created = Signal(tuple)
+    sig_roi_deleted = Signal(tuple)
+    sig_roi_moved = Signal(tuple, str)
+    sig_deleted_rois_updated = Signal(tuple)
 
-    sigConfLevelChanged = pyqtSignal(int)
+    sig_selected = Signal(tuple)
+    sig_one_selected = Signal(int)
+    sig_roi_renamed = Signal(int)
+    sig_fixed = Signal(tuple)
+    sig_unfixed = Signal(tuple)
+
+    sig_type_changed = Signal(int)
+    sigFitRoisOpen = Signal(list)
+    sigColorChanged = Signal(tuple)
+
+    sigConfLevelChanged = Signal(int)
+
+    # image keys of the images changed by a bulk operation
+    sig_images_changed = Signal(tuple)
 
     EMIT_NAME = 'RoiDict'
 
+    # max rate (Hz) of sig_roi_moved emitted by interactive moves
+    MAX_MOVE_RATE: float = 60.
+
     log = logging.getLogger(__name__)
 
     def __init__(self, file_manager: FileManager, geometry_holder: GeometryHolder):
-        super().__init__()
         self._geometry_holder: GeometryHolder = geometry_holder
         self._fm: FileManager = file_manager
         self._roi_data: RoiData = RoiData()
         self._current_key: ImageKey or None = None
         self._meta_data: RoiMetaData or None = None
         self._copied_rois: CopiedRois = CopiedRois()
-        self._roi_colors: RoiColors = RoiColors(file_manager, parent=self)
+        self._roi_colors: RoiColors = RoiColors(file_manager)
         self._roi_colors.sigColorChanged.connect(self.color_changed)
         self._roi_colors.sigColorDictSet.connect(self.update_colors)
+        self._moves = EventCoalescer(self._emit_moves, self.MAX_MOVE_RATE, merge=_merge_move_sources)
+        self._fm.sigImageRemoved.connect(self.remove_image)
 
     def __len__(self):
         return len(self._roi_data)
@@ -79,6 +93,17 @@ class RoiDict(QObject):
         else:
             del self._fm.rois_data[self._current_key]
             self.log.debug(f'Empty roi data {self._current_key} deleted.')
+        self.update_index(self._roi_data, self._current_key)
+
+    def update_index(self, roi_data: RoiData, image_key: ImageKey):
+        if self._meta_data and image_key.parent == self._meta_data.folder_key:
+            self._meta_data.update_index(roi_data, image_key)
+
+    def roi_series(self, key: int, name: str = 'radius') -> Tuple[np.ndarray, np.ndarray]:
+        """Image indices and values of a roi parameter over the current folder."""
+        if not self._meta_data:
+            return np.array([], dtype=int), np.array([])
+        return self._meta_data.index.get(key, name)
 
     @_check_non_empty
     def save_folder(self):
@@ -86,7 +111,12 @@ class RoiDict(QObject):
             self._fm.rois_meta_data[self._meta_data.folder_key] = self._meta_data
             self.log.debug(f'Roi meta data for {self._meta_data.folder_key} saved.')
 
+    def set_move_scheduler(self, scheduler: Scheduler or None):
+        """Moves are coalesced and emitted at most MAX_MOVE_RATE times per second by the scheduler."""
+        self._moves.set_scheduler(scheduler)
+
     def clear(self):
+        self.finish_moves()
         if len(self._roi_data):
             self.sig_roi_deleted.emit(tuple(self.keys()))
             self._roi_data.clear()
@@ -96,17 +126,34 @@ class RoiDict(QObject):
         self.save_state()
         self.clear()
 
-    @pyqtSlot(object, name='changeFolder')
     def change_folder(self, folder_key: FolderKey):
         self.save_folder()
 
         if folder_key:
             self._meta_data = self._fm.rois_meta_data[folder_key] or RoiMetaData(folder_key)
             self.log.debug(f'Loaded roi meta data {folder_key}.')
+            if self._meta_data.index_outdated:
+                self._rebuild_index()
         else:
             self._meta_data = None
             self.log.debug(f'Empty folder selected')
 
+    def _rebuild_index(self):
+        roi_data_dict = {image_key: self._fm.rois_data[image_key] for image_key in self._meta_data.image_keys()}
+        self._meta_data.rebuild_index({k: v for k, v in roi_data_dict.items() if v})
+        self.log.info(f'Roi index of {self._meta_data.folder_key} is rebuilt.')
+
+    def remove_image(self, image_key: ImageKey):
+        """Called when the image is removed from the project (FileManager.sigImageRemoved)."""
+        if self._meta_data and image_key.parent == self._meta_data.folder_key:
+            self._meta_data.remove_image(image_key)
+
+        if image_key == self._current_key:
+            # roi data of the removed image is not saved again
+            self.save_folder()
+            self.clear()
+            self._current_key = None
+
     def change_image(self, image_key: ImageKey):
         self.clear()
         self._current_key = image_key
@@ -122,7 +169,6 @@ class RoiDict(QObject):
         if len(self._roi_data):
             self.sig_roi_created.emit(tuple(self.keys()))
 
-    @pyqtSlot()
     def select_next(self):
         sorted_keys, current_idx = self._select_by_order()
         if not sorted_keys:
@@ -132,7 +178,6 @@ class RoiDict(QObject):
 
         self.select(sorted_keys[current_idx + 1])
 
-    @pyqtSlot()
     def select_previous(self):
         sorted_keys, current_idx = self._select_by_order()
         if not sorted_keys:
@@ -172,7 +217,6 @@ class RoiDict(QObject):
     def __getitem__(self, item: int) -> Roi:
         return self._roi_data[item]
 
-    @pyqtSlot(int, name='select')
     def select(self, key: int):
         change_select = self._roi_data.select(key)
         if change_select:
@@ -181,7 +225,6 @@ class RoiDict(QObject):
             if self._roi_data.selected_num == 1:
                 self.sig_one_selected.emit(next(iter(self._roi_data.selected_keys)))
 
-    @pyqtSlot(int, name='shift_select')
     def shift_select(self, key: int):
         self._roi_data.shift_select(key)
         self.sig_selected.emit((key,))
@@ -189,30 +232,25 @@ class RoiDict(QObject):
         if self._roi_data.selected_num == 1:
             self.sig_one_selected.emit(next(iter(self._roi_data.selected_keys)))
 
-    @pyqtSlot(name='selectAll')
     @_check_non_empty
     def select_all(self) -> None:
         self._emit_select(self._roi_data.select_all())
         self.log.info(f'Select status changed (select all)')
 
-    @pyqtSlot(name='unselectAll')
     @_check_non_empty
     def unselect_all(self):
         self._emit_select(self._roi_data.unselect_all())
 
-    @pyqtSlot(name='deleteSelected')
     @_check_non_empty
     def delete_selected_roi(self):
         for key in list(self._roi_data.selected_keys):
             self.delete_roi(key)
 
-    @pyqtSlot(int, str, name='changeName')
     def change_name(self, key: int, name: str):
         self._meta_data.rename(self[key], name)
         self.sig_roi_renamed.emit(key)
         self.log.info(f'Roi {key} renamed to {name}')
 
-    @pyqtSlot(int, float, name='changeConfLevel')
     def change_conf_level(self, key: int, level: float):
         self._roi_data[key].confidence_level = level
         self.sigConfLevelChanged.emit(key)
@@ -226,7 +264,6 @@ class RoiDict(QObject):
             self.log.debug(f'Emit select one {keys}')
             self.sig_one_selected.emit(next(iter(self._roi_data.selected_keys)))
 
-    @pyqtSlot(object, name='addRoi')
     @_check_non_empty
     def add_roi(self, roi: Roi) -> None:
         self._meta_data.add_roi(roi, self._current_key)
@@ -244,6 +281,109 @@ class RoiDict(QObject):
         self.sig_roi_created.emit(tuple(roi.key for roi in roi_list))
         self._emit_select(to_select)
 
+    def apply_rois_to_images(self, rois: List[Roi], image_keys: Iterable[ImageKey]) -> None:
+        """
+        Adds unselected copies of the rois to the images of the current folder without switching the images.
+        Rois with keys registered in the folder keep their keys, the others get new keys shared
+        by all the images. Ring rois get the angles of the geometry of each image. Roi data of every image
+        is read and written once, the index is updated once, sig_roi_deleted (for the replaced rois)
+        and sig_roi_created are emitted once for the current image and sig_images_changed once for all.
+        """
+        if not rois or not self._meta_data:
+            return
+
+        folder_key = self._meta_data.folder_key
+        image_keys = [image_key for image_key in image_keys if image_key.parent == folder_key]
+
+        if not image_keys:
+            return
+
+        rois = copy_rois(rois)
+        ring_bounds = self.ring_bounds
+
+        for roi in rois:
+            roi.active = False
+            if not roi.has_fixed_angles():
+                roi.angle, roi.angle_std = ring_bounds
+
+        self._meta_data.add_rois_to_images(rois, image_keys)
+        template = RoiData(rois)
+        table, attributes = template.table.copy(), template.attributes()
+
+        changed: Dict[ImageKey, RoiData] = {}
+
+        for image_key in image_keys:
+            if image_key == self._current_key:
+                replaced = tuple(key for key in table['key'].tolist() if key in self._roi_data)
+                if replaced:
+                    self.sig_roi_deleted.emit(replaced)
+                self._roi_data.add_table(table, attributes)
+                changed[image_key] = self._roi_data
+            else:
+                roi_data = self._fm.rois_data[image_key] or RoiData()
+                roi_data.add_table(table, attributes)
+                image_bounds = self._image_ring_bounds(image_key)
+                if image_bounds and image_bounds != ring_bounds:
+                    roi_data.change_ring_bounds(image_bounds)
+                changed[image_key] = roi_data
+
+        self._fm.rois_data.set_many((k, v) for k, v in changed.items() if k != self._current_key)
+        self._meta_data.update_indices(changed)
+
+        if self._current_key in changed:
+            self.sig_roi_created.emit(tuple(table['key'].tolist()))
+
+        self.log.info(f'{len(rois)} rois applied to {len(changed)} images.')
+        self.sig_images_changed.emit(tuple(changed.keys()))
+
+    def _image_ring_bounds(self, image_key: ImageKey) -> Tuple[float, float] or None:
+        geometry = self._geometry_holder.get_geometry(image_key)
+        return geometry.ring_bounds if geometry.is_available else None
+
+    @_check_non_empty
+    def apply_rois_to_folder(self, rois: List[Roi]):
+        """Applies the rois to all the other images of the current folder."""
+        image_keys = [k for k in self._current_key.parent.image_children if k != self._current_key]
+        self.apply_rois_to_images(rois, image_keys)
+
+    def add_roi_tracks(self, folder_key: FolderKey, tracks: Iterable[List[Tuple[ImageKey, Roi]]]):
+        """
+        Adds rois to the images of a folder, rois of a track (e.g. the same peak found
+        in a series of images) get the same roi key. Roi data of each image is saved once,
+        and only the rois of the current image are emitted.
+        """
+        if self._meta_data and self._meta_data.folder_key == folder_key:
+            meta_data = self._meta_data
+        else:
+            meta_data = self._fm.rois_meta_data[folder_key] or RoiMetaData(folder_key)
+
+        by_image: Dict[ImageKey, List[Roi]] = {}
+
+        for track in tracks:
+            key = None
+            for image_key, roi in track:
+                roi.key = key
+                meta_data.add_roi(roi, image_key)
+                key = roi.key
+                if not roi.has_fixed_angles():
+                    roi.angle, roi.angle_std = self.ring_bounds
+                by_image.setdefault(image_key, []).append(roi)
+
+        for image_key, rois in by_image.items():
+            if image_key == self._current_key:
+                self._roi_data.add_rois(rois)
+                self.sig_roi_created.emit(tuple(roi.key for roi in rois))
+            else:
+                roi_data = self._fm.rois_data[image_key] or RoiData()
+                roi_data.add_rois(rois)
+                self._fm.rois_data[image_key] = roi_data
+                meta_data.update_index(roi_data, image_key)
+
+        if meta_data is not self._meta_data:
+            self._fm.rois_meta_data[folder_key] = meta_data
+
+        self.log.info(f'{sum(map(len, by_image.values()))} rois added to {len(by_image)} images.')
+
     @_check_non_empty
     def delete_roi(self, key: int):
         self._roi_data.delete_roi(key)
@@ -260,13 +400,11 @@ class RoiDict(QObject):
         self.add_roi(roi)
         return roi
 
-    @pyqtSlot(tuple, name='change_ring_bounds')
     def change_ring_bounds(self, bounds: Tuple[float, float]):
         keys = self._roi_data.change_ring_bounds(bounds)
         if keys:
             self.sig_roi_moved.emit(tuple(keys), self.EMIT_NAME)
 
-    @pyqtSlot(name='on_scale_changed')
     def on_scale_changed(self):
         self._roi_data.on_scale_changed(self._geometry_holder.geometry.scale_change)
         self.sig_roi_moved.emit(tuple(self.keys()), self.EMIT_NAME)
@@ -280,24 +418,32 @@ class RoiDict(QObject):
         angle, angle_std = self.ring_bounds
         return dict(radius=radius, width=width, angle=angle, angle_std=angle_std)
 
-    @pyqtSlot(int, str, name='moveRoi')
     def move_roi(self, key: int, name: str):
         # TODO: add roiIsAboutToMove(self, key: int) slot
-        # TODO: how to implement roiIsMoved ? (mouse interaction only? or time?)
         self.select(key)
-        self.sig_roi_moved.emit((key,), name)
+        self._moves.push(key, name)
         roi = self[key]
         if roi.should_adjust_angles(*self.ring_bounds):
             roi.type = RoiTypes.segment
             self.sig_type_changed.emit(key)
 
-    @pyqtSlot(tuple, name='colorChanged')
+    def finish_moves(self):
+        """Emits pending moves immediately, called when a drag is finished."""
+        self._moves.flush()
+
+    def _emit_moves(self, moves: dict):
+        by_name = {}
+        for key, name in moves.items():
+            if key in self.keys():
+                by_name.setdefault(name, []).append(key)
+        for name, keys in by_name.items():
+            self.sig_roi_moved.emit(tuple(keys), name)
+
     def color_changed(self, key: ROI_COLOR_KEY):
         keys = self._get_rois_by_color_key(key)
         if keys:
             self.sigColorChanged.emit(keys)
 
-    @pyqtSlot(name='updateColors')
     def update_colors(self):
         keys = list(self.keys())
         if keys:
@@ -310,7 +456,6 @@ class RoiDict(QObject):
                 keys.append(roi.key)
         return keys
 
-    @pyqtSlot(int, name='roiTypeChanged')
     def change_roi_type(self, key: int):
         try:
             roi = self[key]
@@ -321,39 +466,22 @@ class RoiDict(QObject):
             return
         self.sig_type_changed.emit(key)
 
-    @pyqtSlot(name='fixAll')
     def fix_all(self, only_selected: bool = False):
-        keys = []
-        for roi in self.values():
-            if only_selected and not roi.active:
-                continue
-            if roi.movable:
-                roi.movable = False
-                keys.append(roi.key)
+        keys = self._roi_data.set_movable(False, only_selected)
         if keys:
             self.sig_fixed.emit(tuple(keys))
 
-    @pyqtSlot(name='fixSelected')
     def fix_selected(self):
         self.fix_all(True)
 
-    @pyqtSlot(name='unfixAll')
     def unfix_all(self, only_selected: bool = False):
-        keys = []
-        for roi in self.values():
-            if only_selected and not roi.active:
-                continue
-            if not roi.movable:
-                roi.movable = True
-                keys.append(roi.key)
+        keys = self._roi_data.set_movable(True, only_selected)
         if keys:
             self.sig_unfixed.emit(tuple(keys))
 
-    @pyqtSlot(name='unfixSelected')
     def unfix_selected(self):
         self.unfix_all(True)
 
-    @pyqtSlot(int, name='fixRoi')
     def fix_roi(self, key: int):
         try:
             self[key].movable = False
@@ -361,7 +489,6 @@ class RoiDict(QObject):
         except KeyError:
             return
 
-    @pyqtSlot(int, name='unfixRoi')
     def unfix_roi(self, key: int):
         try:
             self[key].movable = True
@@ -387,28 +514,37 @@ class RoiDict(QObject):
             return
         self.add_rois(self._copied_rois.paste(self._geometry_holder.geometry))
 
-    @pyqtSlot(bool, name='openFitRois')
+    @_check_non_empty
+    def paste_rois_to_folder(self):
+        """Pastes the copied rois to all the images of the current folder."""
+        if not len(self._copied_rois):
+            return
+        self.apply_rois_to_images(
+            self._copied_rois.paste(self._geometry_holder.geometry), self._current_key.parent.image_children)
+
     def open_fit_rois(self, only_selected: bool):
         if only_selected:
-            rois = deepcopy(self.selected_rois)
+            rois = copy_rois(self.selected_rois)
         else:
-            rois = deepcopy(list(self.values()))
+            rois = copy_rois(list(self.values()))
         if rois:
             self.sigFitRoisOpen.emit(rois)
 
     def apply_fit(self, rois: List[Roi], image_key: ImageKey):
 
         if self._current_key == image_key:
+            unselected = tuple(self._roi_data.selected_keys)
             keys_to_create, keys_to_move = self._roi_data.apply_fit(rois)
             self.sig_roi_created.emit(keys_to_create)
             self.sig_roi_moved.emit(keys_to_move, self.EMIT_NAME)
             self.sig_fixed.emit(keys_to_move)
-            self.sig_selected.emit(keys_to_move)
+            self.sig_selected.emit(tuple(set(unselected).union(keys_to_move)))
 
         else:
             roi_data = self._fm.rois_data[image_key] or RoiData()
             roi_data.apply_fit(rois)
             self._fm.rois_data[image_key] = roi_data
+            self.update_index(roi_data, image_key)
 
 
 class CopiedRois(object):
@@ -424,7 +560,7 @@ class CopiedRois(object):
         return len(self._rois) if self._rois else 0
 
     def copy_rois(self, rois: List[Roi], geometry):
-        self._rois = deepcopy(rois)
+        self._rois = copy_rois(rois)
 
         for roi in self._rois:
             roi.active = True
@@ -441,7 +577,7 @@ class CopiedRois(object):
             rois = self._rois
             self.clear()
         else:
-            rois = deepcopy(self._rois)
+            rois = copy_rois(self._rois)
 
         if self._scale != geometry.scale:
             s = geometry.scale / self._scale
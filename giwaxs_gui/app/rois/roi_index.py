@@ -0,0 +1,147 @@
+from typing import Dict, Tuple, List
+
+import numpy as np
+
+from .roi import ROI_DICT_KEYS
+from .roi_data import RoiData
+
+ROI_INDEX_DTYPES = [
+    ('key', 'i4'),
+    ('image_idx', 'i4'),
+    ('radius', 'f8'),
+    ('width', 'f8'),
+    ('angle', 'f8'),
+    ('angle_std', 'f8'),
+]
+
+_ROI_COLUMNS = ('key', 'radius', 'width', 'angle', 'angle_std')
+
+
+class RoiIndex(object):
+    """
+    Table of rois of all images in a folder sorted by (roi key, image idx).
+    Scalar fitted parameters are stored as additional columns (nan if missing).
+    Allows to get the evolution of roi parameters over the image series
+    without loading RoiData of every image.
+    """
+
+    def __init__(self):
+        self._table: np.ndarray = np.zeros(0, dtype=ROI_INDEX_DTYPES)
+        self._fitted: Dict[str, np.ndarray] = {}
+
+    def __len__(self):
+        return self._table.size
+
+    def __contains__(self, key: int):
+        start, stop = self._roi_bounds(key)
+        return stop > start
+
+    @property
+    def table(self) -> np.ndarray:
+        return self._table
+
+    @property
+    def parameter_names(self) -> List[str]:
+        return list(self._table.dtype.names[2:]) + list(self._fitted.keys())
+
+    def roi_keys(self) -> np.ndarray:
+        return np.unique(self._table['key'])
+
+    def image_indices(self, key: int) -> np.ndarray:
+        return self._table['image_idx'][self._roi_slice(key)]
+
+    def get(self, key: int, name: str = 'radius') -> Tuple[np.ndarray, np.ndarray]:
+        """Returns sorted image indices and the corresponding values of the parameter of the roi."""
+        s = self._roi_slice(key)
+        if name in self._fitted:
+            values = self._fitted[name][s]
+        elif name in self._table.dtype.names:
+            values = self._table[name][s]
+        else:
+            raise KeyError(f'Unknown roi parameter {name}.')
+        return self._table['image_idx'][s], values
+
+    def closest_image_idx(self, key: int, image_idx: int) -> int or None:
+        indices = self.image_indices(key)
+        if not indices.size:
+            return
+        i = np.searchsorted(indices, image_idx)
+        if i == indices.size:
+            return int(indices[-1])
+        if i == 0 or indices[i] == image_idx:
+            return int(indices[i])
+        if image_idx - indices[i - 1] < indices[i] - image_idx:
+            return int(indices[i - 1])
+        return int(indices[i])
+
+    def update_image(self, image_idx: int, roi_data: RoiData):
+        self.update_images({image_idx: roi_data})
+
+    def update_images(self, roi_data_dict: Dict[int, RoiData]):
+        """Replaces the rows of several images at once (the table is rebuilt and sorted once)."""
+        keep = ~np.isin(self._table['image_idx'], list(roi_data_dict.keys()))
+        new_tables, new_fitted = [], []
+
+        for image_idx, roi_data in roi_data_dict.items():
+            new_table = np.zeros(len(roi_data), dtype=ROI_INDEX_DTYPES)
+            if len(roi_data):
+                roi_table = roi_data.ordered_table
+                for name in _ROI_COLUMNS:
+                    new_table[name] = roi_table[name]
+                new_table['image_idx'] = image_idx
+                new_fitted.append(_get_fitted_columns(roi_data))
+            else:
+                new_fitted.append({})
+            new_tables.append(new_table)
+
+        table = np.concatenate([self._table[keep]] + new_tables)
+        names = set(self._fitted.keys()).union(*(d.keys() for d in new_fitted))
+        fitted = {
+            name: np.concatenate(
+                [self._fitted[name][keep] if name in self._fitted else _nan_column(keep.sum())] +
+                [d[name] if name in d else _nan_column(t.size) for d, t in zip(new_fitted, new_tables)]
+            )
+            for name in names
+        }
+        self._set_sorted(table, fitted)
+
+    def remove_image(self, image_idx: int, renumber: bool = False):
+        """
+        Removes the rows of the image. If renumber is True, the next images are renumbered
+        as in FolderKey.remove_image (the order of the rows is kept).
+        """
+        keep = self._table['image_idx'] != image_idx
+        self._table = self._table[keep]
+        self._fitted = {name: column[keep] for name, column in self._fitted.items()}
+        if renumber:
+            self._table['image_idx'][self._table['image_idx'] > image_idx] -= 1
+
+    def clear(self):
+        self._table = np.zeros(0, dtype=ROI_INDEX_DTYPES)
+        self._fitted = {}
+
+    def _set_sorted(self, table: np.ndarray, fitted: Dict[str, np.ndarray]):
+        order = np.lexsort((table['image_idx'], table['key']))
+        self._table = table[order]
+        self._fitted = {name: column[order] for name, column in fitted.items()
+                        if not np.isnan(column).all()}
+
+    def _roi_bounds(self, key: int) -> Tuple[int, int]:
+        keys = self._table['key']
+        return int(np.searchsorted(keys, key, 'left')), int(np.searchsorted(keys, key, 'right'))
+
+    def _roi_slice(self, key: int) -> slice:
+        return slice(*self._roi_bounds(key))
+
+
+def _get_fitted_columns(roi_data: RoiData) -> Dict[str, np.ndarray]:
+    if not any(roi.is_fitted for roi in roi_data.values()):
+        return {}
+    return {
+        name: column.astype(np.float64) for name, column in roi_data.to_dict().items()
+        if name not in ROI_DICT_KEYS and column.ndim == 1 and column.dtype.kind in 'fiub'
+    }
+
+
+def _nan_column(size: int) -> np.ndarray:
+    return np.full(size, np.nan)
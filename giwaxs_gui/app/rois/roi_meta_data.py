@@ -1,24 +1,36 @@
-from typing import Dict, Iterable
+from bisect import bisect_left, insort
+from typing import Dict, Iterable, List
+import logging
 
 from h5py import Group
 
 from .roi_data import RoiData
 from .roi import Roi
+from .roi_index import RoiIndex
 from ..file_manager.keys import ImageKey, FolderKey
 
 
 class ImageKeysContainer(object):
     def __init__(self, *image_keys):
         self.__image_dict: Dict[int, ImageKey] = {}
+        self.__sorted_idx: List[int] = []
+        self.__idx_dict: Dict[int, ImageKey] = {}
         for key in image_keys:
             self.add(key)
 
     def add(self, image_key: ImageKey):
-        self.__image_dict[hash(image_key)] = image_key
+        h = hash(image_key)
+        if h in self.__image_dict:
+            self.__remove_idx(self.__image_dict[h])
+        self.__image_dict[h] = image_key
+        if image_key.idx is not None:
+            if image_key.idx not in self.__idx_dict:
+                insort(self.__sorted_idx, image_key.idx)
+            self.__idx_dict[image_key.idx] = image_key
 
     def remove(self, image_key: ImageKey):
         try:
-            del self.__image_dict[hash(image_key)]
+            self.__remove_idx(self.__image_dict.pop(hash(image_key)))
         except KeyError:
             raise ValueError(f'Unregistered image key {image_key}')
 
@@ -27,13 +39,31 @@ class ImageKeysContainer(object):
             return
         if hash(image_key) in self.__image_dict:
             return image_key
-        idx, target_key, min_distance = image_key.idx, None, None
-
-        for i, key in enumerate(self):
-            if target_key is None or min_distance >= abs(idx - key.idx):
-                target_key = key
-                min_distance = abs(idx - target_key.idx)
-        return target_key
+        if not self.__sorted_idx or image_key.idx is None:
+            return next(iter(self))
+
+        sorted_idx, idx = self.__sorted_idx, image_key.idx
+        i = bisect_left(sorted_idx, idx)
+        if i == len(sorted_idx):
+            i -= 1
+        elif i > 0 and idx - sorted_idx[i - 1] < sorted_idx[i] - idx:
+            i -= 1
+        return self.__idx_dict[sorted_idx[i]]
+
+    def __remove_idx(self, image_key: ImageKey):
+        idx = image_key.idx
+        if idx is not None and self.__idx_dict.get(idx) is image_key:
+            del self.__idx_dict[idx]
+            del self.__sorted_idx[bisect_left(self.__sorted_idx, idx)]
+
+    def __setstate__(self, state: dict):
+        # objects pickled before the sorted indices were introduced
+        self.__dict__.update(state)
+        if '_ImageKeysContainer__sorted_idx' not in state:
+            image_keys = list(self)
+            self.__image_dict, self.__sorted_idx, self.__idx_dict = {}, [], {}
+            for key in image_keys:
+                self.add(key)
 
     def __contains__(self, item):
         return hash(item) in self.__image_dict
@@ -45,6 +75,8 @@ class ImageKeysContainer(object):
 class RoiMetaData(object):
     H5_NAME = 'roi_metadata'
 
+    log = logging.getLogger(__name__)
+
     def __init__(self, folder_key: FolderKey, *,
                  names: Dict[int, str] = None):
         # groups: Dict[int, str] = None):
@@ -52,6 +84,9 @@ class RoiMetaData(object):
         self.folder_key = folder_key.clean_copy()
         self.__names: Dict[int, str] = names or {}
         self.__keys_dict: Dict[int, ImageKeysContainer] = {}
+        self.index: RoiIndex = RoiIndex()
+        # the index has to be rebuilt from the stored roi data (see RoiDict.change_folder)
+        self.index_outdated: bool = False
         # self.__radii: Dict[int, Dict[ImageKey, float]] = {}
         # self.__widths: Dict[int, Dict[ImageKey, float]] = {}
         # self.__groups: Dict[int, str] = groups or {}
@@ -88,6 +123,17 @@ class RoiMetaData(object):
         for roi in rois:
             self.add_roi(roi, image_key, make_copy=False)
 
+    def add_rois_to_images(self, rois: List[Roi], image_keys: List[ImageKey]):
+        """Registers the rois in all the images, every roi keeps a single key over the images."""
+        image_keys = [image_key.clean_copy() for image_key in image_keys]
+        if not image_keys:
+            return
+        for roi in rois:
+            self.add_roi(roi, image_keys[0], make_copy=False)
+            container = self.__keys_dict[roi.key]
+            for image_key in image_keys[1:]:
+                container.add(image_key)
+
     def delete_roi(self, key: int, image_key: ImageKey):
         try:
             self.__keys_dict[key].remove(image_key)
@@ -121,6 +167,35 @@ class RoiMetaData(object):
             except KeyError:
                 self.__names[key] = roi.name
 
+    def update_index(self, roi_data: RoiData, image_key: ImageKey):
+        if image_key.idx is None:
+            self.log.debug(f'Image {image_key} has no index, roi index is not updated.')
+            return
+        self.index.update_image(image_key.idx, roi_data)
+
+    def update_indices(self, roi_data_dict: Dict[ImageKey, RoiData]):
+        self.index.update_images({
+            image_key.idx: roi_data for image_key, roi_data in roi_data_dict.items() if image_key.idx is not None
+        })
+
+    def rebuild_index(self, roi_data_dict: Dict[ImageKey, RoiData]):
+        self.index.clear()
+        self.update_indices(roi_data_dict)
+        self.index_outdated = False
+
+    def image_keys(self) -> List[ImageKey]:
+        """Image keys with registered rois."""
+        return list(set().union(*self.__keys_dict.values()))
+
+    def remove_image(self, image_key: ImageKey):
+        """Unregisters the removed image, rois registered in this image only are deleted."""
+        for key in list(self.roi_keys()):
+            if image_key in self.__keys_dict[key]:
+                self.delete_roi(key, image_key)
+
+        if image_key.idx is not None:
+            self.index.remove_image(image_key.idx, renumber=True)
+
     def get_deleted_rois(self, image_key: ImageKey):
         return [(key, self.__names[key]) for key in self.roi_keys() if image_key not in self.__keys_dict[key]]
 
@@ -134,6 +209,15 @@ class RoiMetaData(object):
         self.__keys_dict[key] = ImageKeysContainer(image_key)
         self.__names[key] = roi.name
 
+    def __setstate__(self, state: dict):
+        self.__dict__.update(state)
+        if 'index' not in state:
+            # objects pickled before the index was introduced
+            self.index = RoiIndex()
+            self.index_outdated = True
+        elif 'index_outdated' not in state:
+            self.index_outdated = False
+
     # methods for storing the object to and retrieving from h5 files (under development)
 
     def to_h5(self, h5_group: Group):
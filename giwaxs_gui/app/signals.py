@@ -0,0 +1,135 @@
+import inspect
+import sys
+import logging
+import weakref
+from types import MethodType
+from typing import Callable, List, Tuple
+
+__all__ = ['Signal', 'BoundSignal']
+
+logger = logging.getLogger(__name__)
+
+
+class Signal(object):
+    """
+    Pure python replacement for pyqtSignal used by the app layer.
+
+    The interface (connect, disconnect, emit) mimics the one of Qt signals, so that
+    Qt widgets can be connected to the app objects directly. Bound methods are
+    referenced weakly (as PyQt does), other callables are referenced strongly.
+    Slots accepting fewer arguments than emitted receive only the first ones.
+    Delivery is synchronous; use gui.signal_bridge to deliver signals through
+    the Qt event loop. Exceptions raised by a slot are passed to sys.excepthook
+    (as PyQt does) and do not prevent calling the other slots, slots of deleted
+    Qt objects are disconnected.
+    """
+
+    def __init__(self, *types):
+        self.types: tuple = types
+        self.name: str = ''
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        try:
+            return instance.__dict__[self.name]
+        except KeyError:
+            bound = instance.__dict__[self.name] = BoundSignal(self.name)
+            return bound
+
+
+class BoundSignal(object):
+    __slots__ = ('name', '_slots', '__weakref__')
+
+    def __init__(self, name: str = ''):
+        self.name: str = name
+        self._slots: List[Tuple[object, int or None]] = []
+
+    def __len__(self):
+        return len(self._slots)
+
+    def __repr__(self):
+        return f'<BoundSignal {self.name} ({len(self)} slots)>'
+
+    def connect(self, slot: Callable) -> Callable:
+        if isinstance(slot, BoundSignal) or (not callable(slot) and hasattr(slot, 'emit')):
+            # chained signals (including Qt bound signals)
+            ref, num = slot.emit, None
+        elif isinstance(slot, MethodType):
+            ref, num = weakref.WeakMethod(slot), _max_args_num(slot)
+        elif callable(slot):
+            ref, num = slot, _max_args_num(slot)
+        else:
+            raise TypeError(f'Slot {slot} is not callable.')
+        self._slots.append((ref, num))
+        return slot
+
+    def disconnect(self, slot: Callable = None) -> None:
+        if slot is None:
+            self._slots = []
+            return
+        if isinstance(slot, BoundSignal) or (not callable(slot) and hasattr(slot, 'emit')):
+            slot = slot.emit
+        slots = [s for s in self._slots if _resolve(s[0]) != slot]
+        if len(slots) == len(self._slots):
+            raise TypeError(f'Slot {slot} is not connected to signal {self.name}.')
+        self._slots = slots
+
+    def emit(self, *args) -> None:
+        dead = []
+        for slot in tuple(self._slots):
+            ref, num = slot
+            func = _resolve(ref)
+            if func is None:
+                dead.append(id(slot))
+                continue
+            try:
+                func(*args[:num]) if num is not None else func(*args)
+            except RuntimeError as err:
+                if _is_deleted_qt_object(err):
+                    logger.debug(f'Slot of a deleted object is disconnected from {self.name}: {err}')
+                    dead.append(id(slot))
+                else:
+                    sys.excepthook(*sys.exc_info())
+            except Exception:
+                sys.excepthook(*sys.exc_info())
+        if dead:
+            self._slots = [s for s in self._slots if id(s) not in dead]
+
+    # connections are not copied or pickled, similar to QObjects which can not be copied at all
+
+    def __reduce__(self):
+        return BoundSignal, (self.name,)
+
+    def __copy__(self):
+        return BoundSignal(self.name)
+
+    def __deepcopy__(self, memo):
+        return BoundSignal(self.name)
+
+
+def _resolve(ref) -> Callable or None:
+    return ref() if isinstance(ref, weakref.WeakMethod) else ref
+
+
+def _is_deleted_qt_object(err: RuntimeError) -> bool:
+    # raised by PyQt when the slot belongs to a deleted Qt object
+    msg = str(err)
+    return 'wrapped C/C++ object' in msg and 'has been deleted' in msg
+
+
+def _max_args_num(slot: Callable) -> int or None:
+    try:
+        params = inspect.signature(slot).parameters.values()
+    except (TypeError, ValueError):
+        return
+    num = 0
+    for p in params:
+        if p.kind == p.VAR_POSITIONAL:
+            return
+        if p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD):
+            num += 1
+    return num
@@ -0,0 +1,76 @@
+import time
+import logging
+from typing import Callable, Dict, Hashable
+
+__all__ = ['EventCoalescer', 'Scheduler']
+
+logger = logging.getLogger(__name__)
+
+# scheduler(delay_in_seconds, callback) calls callback once after the delay
+Scheduler = Callable[[float, Callable[[], None]], None]
+
+
+class EventCoalescer(object):
+    """
+    Merges events by key and dispatches them at most max_rate times per second.
+
+    The first event after a quiet period is dispatched immediately, the following ones
+    are accumulated per key (replaced, or combined by merge(old, new)) and dispatched
+    together by a single delayed call, so the last event is always delivered. Delayed
+    calls are made by the scheduler (e.g. QTimer.singleShot in the gui); without
+    a scheduler every event is dispatched immediately.
+    """
+
+    def __init__(self, dispatch: Callable[[Dict[Hashable, object]], None],
+                 max_rate: float = 60., scheduler: Scheduler = None,
+                 merge: Callable[[object, object], object] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        self._dispatch = dispatch
+        self._merge = merge
+        self._interval: float = 1 / max_rate if max_rate else 0.
+        self._scheduler: Scheduler or None = scheduler
+        self._clock = clock
+        self._pending: Dict[Hashable, object] = {}
+        self._scheduled: bool = False
+        self._last_time: float = - float('inf')
+
+    @property
+    def has_pending(self) -> bool:
+        return bool(self._pending)
+
+    def set_scheduler(self, scheduler: Scheduler or None):
+        self._scheduler = scheduler
+        if not scheduler:
+            self._scheduled = False
+            self.flush()
+
+    def push(self, key: Hashable, value: object = None):
+        if self._merge and key in self._pending:
+            value = self._merge(self._pending[key], value)
+        self._pending[key] = value
+
+        if self._scheduled:
+            return
+
+        delay = self._last_time + self._interval - self._clock()
+
+        if delay <= 0 or not self._scheduler:
+            self.flush()
+        else:
+            self._scheduled = True
+            self._scheduler(delay, self._on_timeout)
+
+    def flush(self):
+        """Dispatches pending events immediately (e.g. when a drag is finished)."""
+        if not self._pending:
+            return
+        events, self._pending = self._pending, {}
+        self._last_time = self._clock()
+        self._dispatch(events)
+
+    def clear(self):
+        self._pending = {}
+
+    def _on_timeout(self):
+        self._scheduled = False
+        self.flush()
@@ -1,7 +1,10 @@
 from enum import Enum
+from typing import Tuple
 
 import numpy as np
 
+from .profiling import timed
+
 __all__ = ['TransformationsHolder', 'Transformation', 'UnknownTransformation']
 
 
@@ -18,6 +21,15 @@ class Flip(object):
     def __call__(self, img: np.ndarray):
         return np.flip(img, self.axis)
 
+    def input_shape(self, shape: Tuple[int, int]) -> Tuple[int, int]:
+        return shape
+
+    def input_coordinates(self, x: np.ndarray, y: np.ndarray, shape: Tuple[int, int]):
+        """Maps the (column, row) coordinates of the output of the given shape to the input."""
+        if self.axis == 1:
+            return shape[1] - 1 - x, y
+        return x, shape[0] - 1 - y
+
 
 class Rotate(object):
     __slots__ = ('k',)
@@ -28,6 +40,15 @@ class Rotate(object):
     def __call__(self, img: np.ndarray):
         return np.rot90(img, self.k)
 
+    def input_shape(self, shape: Tuple[int, int]) -> Tuple[int, int]:
+        return shape[::-1] if self.k % 2 else shape
+
+    def input_coordinates(self, x: np.ndarray, y: np.ndarray, shape: Tuple[int, int]):
+        """Maps the (column, row) coordinates of the output of the given shape to the input."""
+        if self.k == 1:
+            return shape[0] - 1 - y, x
+        return y, shape[1] - 1 - x
+
 
 class Transformation(Enum):
     horizontal_flip = Flip(1)
@@ -54,11 +75,32 @@ class TransformationsHolder(object):
         if key:
             self.update(key)
 
+    @timed('transform')
     def __call__(self, image):
         for op in self._operations:
             image = op(image)
         return image
 
+    def raw_shape(self, shape: Tuple[int, int]) -> Tuple[int, int]:
+        """Shape of the raw image by the shape of the transformed one."""
+        for op in reversed(self._operations):
+            shape = op.input_shape(shape)
+        return tuple(shape)
+
+    def transformed_shape(self, raw_shape: Tuple[int, int]) -> Tuple[int, int]:
+        # all the operations are flips and rotations by 90 degrees
+        return tuple(self.raw_shape(raw_shape))
+
+    def raw_coordinates(self, x: np.ndarray, y: np.ndarray, shape: Tuple[int, int]):
+        """
+        Maps the (column, row) coordinates of the transformed image of the given shape
+        to the raw image, so that the raw image can be sampled without transforming it.
+        """
+        for op in reversed(self._operations):
+            x, y = op.input_coordinates(x, y, shape)
+            shape = op.input_shape(shape)
+        return x, y
+
     def add(self, op: Transformation):
         self._img = op.value(self._img)
 
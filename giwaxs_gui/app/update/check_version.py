@@ -1,8 +1,6 @@
 import json
 from enum import Enum, auto
 import logging
-import requests
-from pkg_resources import parse_version
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +16,10 @@ class CheckVersionMessage(Enum):
 
 
 def check_outdated(version: str, package: str = 'giwaxs_gui') -> CheckVersionMessage:
+    # requests and pkg_resources are slow to import, the check runs in background anyway
+    import requests
+    from pkg_resources import parse_version
+
     logger.info(f'Checking the latest version of the {package} package.')
 
     url = f'https://pypi.python.org/pypi/{package}/json'
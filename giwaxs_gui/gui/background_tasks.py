@@ -3,7 +3,8 @@ from typing import Hashable, Callable
 
 from PyQt5.QtCore import QThreadPool, QObject, pyqtSlot, pyqtSignal
 
-from ..app.utils import Worker, SingletonMeta
+from ..app.utils import SingletonMeta
+from .workers import Worker
 
 
 class _BackgroundTasksNotifications(QObject):
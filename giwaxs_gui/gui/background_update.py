@@ -3,7 +3,7 @@
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 
 from ..__version import __version__
-from ..app.utils import Worker
+from .workers import Worker
 
 from ..app import App
 from ..app.update import (
@@ -1,6 +1,6 @@
 from .buttons import RoundedPushButton, InfoButton, DeleteButton, ConfirmButton
 from .plots_1d import Custom1DPlot, Smooth1DPlot, PlotBC
-from .plots_2d import CustomImageViewer
+from .plots_2d import CustomImageViewer, DisplayModes
 from .sliders import DoubleSlider, LabeledSlider, ControlSlider, ParametersSlider
 from .setup_widgets import AbstractInputParametersWidget, BasicInputParametersWidget
 from .toolbars import ToolBar, BlackToolBar
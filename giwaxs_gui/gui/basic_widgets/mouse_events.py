@@ -70,6 +70,7 @@ class ViewBoxMouseEvents(MouseEventsController):
 class DrawRoiController(ViewBoxMouseEvents):
     sigCreateRoi = pyqtSignal(object)
     sigMoveRoi = pyqtSignal(int, str)
+    sigMoveFinished = pyqtSignal()
 
     def __init__(self, view_box=None, parent=None):
         super().__init__(view_box, parent)
@@ -98,6 +99,7 @@ class DrawRoiController(ViewBoxMouseEvents):
     def mouseReleaseEvent(self, ev) -> bool:
         if self._pressed:
             self.update_roi(ev)
+            self.sigMoveFinished.emit()
 
             self._init_point: QPointF = None
             self._roi: Roi = None
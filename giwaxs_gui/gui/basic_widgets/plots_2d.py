@@ -1,24 +1,34 @@
 # -*- coding: utf-8 -*-
+from enum import Enum
+from typing import Dict, List, Tuple
 
 import numpy as np
 
-from PyQt5.QtCore import pyqtSignal, pyqtSlot
-from PyQt5.QtWidgets import QWidgetAction
+from PyQt5.QtCore import pyqtSignal, pyqtSlot, QTimer, QRectF
+from PyQt5.QtWidgets import QWidgetAction, QActionGroup
 
 from pyqtgraph import (GraphicsLayoutWidget, setConfigOptions,
                        ImageItem, HistogramLUTItem)
 from pyqtgraph.graphicsItems.ViewBox.ViewBoxMenu import ViewBoxMenu
 
 from giwaxs_gui.gui.basic_widgets.sliders import LabeledSlider
-from giwaxs_gui.app.image_processing import standard_contrast_correction
+from giwaxs_gui.app.image_processing import (ContrastCorrection, ImagePyramid, TileKey,
+                                             sigma_levels, min_max, screen_step)
+
+
+class DisplayModes(Enum):
+    full = 'Full image'
+    viewport = 'Process visible area only'
+    tiles = 'Tiled image pyramid'
 
 
 class CustomViewBoxMenu(ViewBoxMenu):
     sigSigmaChanged = pyqtSignal(float)
     sigRangeAsDefault = pyqtSignal()
     sigUseClahe = pyqtSignal(bool)
+    sigDisplayModeChanged = pyqtSignal(object)
 
-    def __init__(self, view, sigma: float = 3):
+    def __init__(self, view, sigma: float = 3, display_mode: DisplayModes = DisplayModes.full):
         super().__init__(view)
         self._use_clahe = True
         self.slider = LabeledSlider('Clip sigma factor', bounds=(0.001, 4),
@@ -32,6 +42,16 @@ class CustomViewBoxMenu(ViewBoxMenu):
         action.setDefaultWidget(self.slider)
         self.sigma_factor_menu.addAction(action)
 
+        self.display_mode_menu = self.addMenu('Display mode')
+        self._display_mode_group = QActionGroup(self)
+
+        for mode in DisplayModes:
+            mode_action = self.display_mode_menu.addAction(
+                mode.value, lambda *x, m=mode: self.sigDisplayModeChanged.emit(m))
+            mode_action.setCheckable(True)
+            mode_action.setChecked(mode == display_mode)
+            self._display_mode_group.addAction(mode_action)
+
     @pyqtSlot()
     def _use_clahe_changed(self):
         self._use_clahe = not self._use_clahe
@@ -44,6 +64,13 @@ class CustomViewBoxMenu(ViewBoxMenu):
 
 
 class CustomImageViewer(GraphicsLayoutWidget):
+    # max size of the image preview in the visible area only mode
+    PREVIEW_SIZE: int = 2048
+    # tile size in the tiled image pyramid mode
+    TILE_SIZE: int = 512
+    # delay (ms) before the visible area is updated after the view range is changed
+    VIEWPORT_DELAY: int = 50
+
     @property
     def view_box(self):
         return self.image_plot.vb
@@ -52,13 +79,21 @@ class CustomImageViewer(GraphicsLayoutWidget):
                  parent=None, *,
                  hist_range: tuple = None,
                  sigma_factor: float = 3,
+                 display_mode: DisplayModes = DisplayModes.full,
                  **kwargs
                  ):
         setConfigOptions(imageAxisOrder='row-major')
         super(CustomImageViewer, self).__init__(parent)
 
         self._raw_data = None
+        self._image_shape: tuple = None
         self._use_clahe: bool = True
+        self._display_mode: DisplayModes = display_mode
+        self._preview_step: int = 1
+        self._contrast = ContrastCorrection()
+        self._pyramid: ImagePyramid or None = None
+        self._tile_items: Dict[TileKey, ImageItem] = {}
+        self._free_tile_items: List[ImageItem] = []
 
         self._scale = (1., 1.)
         self._center = (0, 0)
@@ -77,12 +112,45 @@ class CustomImageViewer(GraphicsLayoutWidget):
         self.image_plot.addItem(self.image_item)
         self.image_plot.setMenuEnabled(False)
         self.hist = HistogramLUTItem()
-        self.hist.setImageItem(self.image_item)
         self.addItem(self.hist)
-        self.hist.vb.menu = CustomViewBoxMenu(self.hist.vb)
+        self.hist.vb.menu = CustomViewBoxMenu(self.hist.vb, display_mode=self._display_mode)
         self.hist.vb.menu.sigSigmaChanged.connect(self.set_sigma_factor)
         self.hist.vb.menu.sigRangeAsDefault.connect(self.set_limit_as_default)
         self.hist.vb.menu.sigUseClahe.connect(self.enable_clahe)
+        self.hist.vb.menu.sigDisplayModeChanged.connect(self.set_display_mode)
+        self._init_viewport_items()
+        self.hist.setImageItem(self._display_item)
+
+    def _init_viewport_items(self):
+        # in the viewport and tiles modes the image item keeps the pixel coordinates
+        # (and the transformations) of the full image, while the children items display
+        # the preview of the whole image and the visible area at the screen resolution.
+        self._preview_item = ImageItem()
+        self._preview_item.setParentItem(self.image_item)
+        self._viewport_item = ImageItem()
+        self._viewport_item.setParentItem(self.image_item)
+        self._viewport_item.setZValue(1)
+
+        self._viewport_timer = QTimer(self)
+        self._viewport_timer.setSingleShot(True)
+        self._viewport_timer.setInterval(self.VIEWPORT_DELAY)
+        self._viewport_timer.timeout.connect(self._update_viewport)
+
+        self.view_box.sigRangeChanged.connect(self._on_range_changed)
+        self.hist.sigLevelsChanged.connect(self._sync_viewport_items)
+        self.hist.sigLookupTableChanged.connect(self._sync_viewport_items)
+
+    @property
+    def image_shape(self) -> tuple or None:
+        return self._image_shape
+
+    @property
+    def display_mode(self) -> DisplayModes:
+        return self._display_mode
+
+    @property
+    def _display_item(self) -> ImageItem:
+        return self.image_item if self._display_mode == DisplayModes.full else self._preview_item
 
     def set_data(self, data, *, reset_axes: bool = False):
         self._raw_data = data
@@ -90,15 +158,173 @@ class CustomImageViewer(GraphicsLayoutWidget):
         if data is None:
             return
 
-        if self._use_clahe:
-            data = standard_contrast_correction(data)
+        self._image_shape = data.shape[:2]
+
+        if self._display_mode == DisplayModes.viewport:
+            self._set_preview(data)
+        elif self._display_mode == DisplayModes.tiles:
+            self._set_pyramid(data)
+        else:
+            self._preview_item.clear()
+            self.image_item.setImage(self._contrast_correction(data))
 
-        self.image_item.setImage(data)
         self.set_levels()
         if reset_axes:
             self.image_item.resetTransform()
         self.set_default_range()
 
+    def set_preview(self, preview: np.ndarray, shape: Tuple[int, int]):
+        """Shows a low resolution preview of an image of the given shape until the image is set."""
+        self._raw_data = self._pyramid = None
+        self._image_shape = shape
+        self._viewport_timer.stop()
+        self._viewport_item.hide()
+        self._clear_tiles()
+        self.image_item.clear()
+        self._preview_item.setImage(self._contrast_correction(preview))
+        self._preview_item.setRect(QRectF(0, 0, shape[1], shape[0]))
+
+    def _contrast_correction(self, data: np.ndarray) -> np.ndarray:
+        if self._use_clahe:
+            return self._contrast(data)
+        return data
+
+    def _set_preview(self, data: np.ndarray):
+        h, w = self._image_shape
+        self._preview_step = step = max(1, int(np.ceil(max(h, w) / self.PREVIEW_SIZE)))
+        preview = self._contrast_correction(data[::step, ::step])
+        self._show_preview(preview, step)
+
+    def _set_pyramid(self, data: np.ndarray):
+        if self._use_clahe:
+            corrected = self._contrast.apply_clahe(data)
+            lut = self._contrast.normalization_lut(corrected).copy()
+            self._pyramid = ImagePyramid(corrected, self.TILE_SIZE, lut)
+        else:
+            self._pyramid = ImagePyramid(data, self.TILE_SIZE)
+
+        self._clear_tiles()
+        top_level = self._pyramid.top_level
+        self._preview_step = 2 ** top_level
+        self._show_preview(self._pyramid.get_level(top_level), self._pyramid.scale(top_level))
+
+    def _show_preview(self, preview: np.ndarray, scale):
+        sy, sx = scale if isinstance(scale, tuple) else (scale, scale)
+        self.image_item.clear()
+        self._preview_item.setImage(preview)
+        self._preview_item.setRect(QRectF(0, 0, preview.shape[1] * sx, preview.shape[0] * sy))
+        self._viewport_item.hide()
+        self._viewport_timer.start()
+
+    @pyqtSlot(object)
+    def set_display_mode(self, display_mode: DisplayModes):
+        if self._display_mode == display_mode:
+            return
+        self._display_mode = display_mode
+
+        self._preview_item.clear()
+        self._viewport_item.clear()
+        self._viewport_item.hide()
+        self._clear_tiles()
+        self._pyramid = None
+        self.image_item.clear()
+        self.hist.setImageItem(self._display_item)
+        self.set_data(self._raw_data)
+
+    @pyqtSlot(object)
+    def _on_range_changed(self, *args):
+        if self._display_mode != DisplayModes.full and self._raw_data is not None:
+            self._viewport_timer.start()
+
+    def _visible_rect(self) -> tuple or None:
+        h, w = self._image_shape
+        rect = self.image_item.mapRectFromView(self.view_box.viewRect())
+        x0, y0 = max(int(rect.left()), 0), max(int(rect.top()), 0)
+        x1, y1 = min(int(np.ceil(rect.right())), w), min(int(np.ceil(rect.bottom())), h)
+
+        if x1 <= x0 or y1 <= y0:
+            return
+        return x0, y0, x1, y1
+
+    def _visible_step(self, x0: int, y0: int, x1: int, y1: int) -> int:
+        return screen_step((y1 - y0, x1 - x0), (self.view_box.height(), self.view_box.width()))
+
+    @pyqtSlot()
+    def _update_viewport(self):
+        if self._raw_data is None:
+            return
+        if self._display_mode == DisplayModes.tiles:
+            self._update_tiles()
+            return
+        if self._display_mode != DisplayModes.viewport:
+            return
+
+        rect = self._visible_rect()
+        step = self._visible_step(*rect) if rect else None
+
+        if not rect or step >= self._preview_step:
+            # the preview already has the screen resolution
+            self._viewport_item.hide()
+            return
+
+        x0, y0, x1, y1 = rect
+        data = self._contrast_correction(self._raw_data[y0:y1:step, x0:x1:step])
+        self._viewport_item.setImage(data, levels=self.hist.getLevels(), lut=self.hist.getLookupTable)
+        self._viewport_item.setRect(QRectF(x0, y0, data.shape[1] * step, data.shape[0] * step))
+        self._viewport_item.show()
+
+    def _update_tiles(self):
+        pyramid = self._pyramid
+        rect = self._visible_rect()
+
+        if pyramid is None or not rect:
+            self._clear_tiles()
+            return
+
+        level = pyramid.level_by_step(self._visible_step(*rect))
+
+        if level == pyramid.top_level:
+            # the preview is the top level
+            self._clear_tiles()
+            return
+
+        keys = pyramid.tile_keys(level, *rect)
+        self._clear_tiles(exclude=set(keys))
+
+        for key in keys:
+            if key in self._tile_items:
+                continue
+            item = self._free_tile_items.pop() if self._free_tile_items else self._new_tile_item()
+            item.setImage(pyramid.tile(key), levels=self.hist.getLevels(), lut=self.hist.getLookupTable)
+            item.setRect(QRectF(*pyramid.tile_rect(key)))
+            item.show()
+            self._tile_items[key] = item
+
+    def _new_tile_item(self) -> ImageItem:
+        item = ImageItem()
+        item.setParentItem(self.image_item)
+        item.setZValue(1)
+        return item
+
+    def _clear_tiles(self, exclude: set = ()):
+        for key in list(self._tile_items.keys()):
+            if key not in exclude:
+                item = self._tile_items.pop(key)
+                item.hide()
+                self._free_tile_items.append(item)
+
+    @pyqtSlot(object)
+    def _sync_viewport_items(self, *args):
+        if self._display_mode == DisplayModes.full:
+            return
+        items = list(self._tile_items.values())
+        if self._viewport_item.image is not None:
+            items.append(self._viewport_item)
+        levels = self.hist.getLevels()
+        for item in items:
+            item.setLevels(levels)
+            item.setLookupTable(self.hist.getLookupTable)
+
     def hist_params(self) -> dict:
         return dict(sigma_factor=self._sigma_factor, hist_range=self._hist_range)
 
@@ -106,9 +332,12 @@ class CustomImageViewer(GraphicsLayoutWidget):
         self.set_data(np.zeros((1, 1)))
 
     def set_default_range(self):
-        if self.image_item.image is None:
+        if self._image_shape is None:
             return
         # self.set_auto_range()
+        self._set_image_range()
+
+    def _set_image_range(self):
         axes = self.get_axes()
         self.image_plot.setRange(xRange=axes[1], yRange=axes[0])
 
@@ -118,21 +347,28 @@ class CustomImageViewer(GraphicsLayoutWidget):
         self.set_data(self._raw_data)
 
     def set_auto_range(self):
-        self.image_plot.autoRange()
+        if self._display_mode != DisplayModes.full and self._image_shape is not None:
+            # children items are not taken into account by autoRange
+            self._set_image_range()
+        else:
+            self.image_plot.autoRange()
+
+    def _levels_image(self) -> np.ndarray or None:
+        if self._display_mode == DisplayModes.tiles and self._pyramid is not None:
+            return self._pyramid.sample()
+        return self._display_item.image
 
     def set_levels(self):
-        img = self.image_item.image
+        img = self._levels_image()
         if img is None:
             return
 
         if self._sigma_factor and self._sigma_factor > 0:
-            m, s = img.flatten().mean(), img.flatten().std() * self._sigma_factor
-            self.hist.setLevels(max(m - s, img.min()), min(m + s, img.max()))
+            self.hist.setLevels(*sigma_levels(img, self._sigma_factor))
         elif self._hist_range:
             self.hist.setLevels(*self._hist_range)
         else:
-            self.hist.setLevels(self.image_item.image.min(),
-                                self.image_item.image.max())
+            self.hist.setLevels(*min_max(img))
 
     @pyqtSlot(float)
     def set_sigma_factor(self, sigma_factor: float):
@@ -186,7 +422,7 @@ class CustomImageViewer(GraphicsLayoutWidget):
         self.set_default_range()
 
     def _set_axis(self, min_: float, max_: float, axis_ind: int):
-        shape = self.image_item.image.shape
+        shape = self._image_shape
         scale = np.array(self._scale)
         scale[axis_ind] = (max_ - min_) / shape[axis_ind]
         center = np.array(self._center)
@@ -199,7 +435,7 @@ class CustomImageViewer(GraphicsLayoutWidget):
         self._center = tuple(center)
 
     def get_axes(self):
-        shape = np.array(self.image_item.image.shape)
+        shape = np.array(self._image_shape)
         scale = np.array(self._scale)
         min_ = - np.array((self._center[1], self._center[0])) * scale
         max_ = min_ + shape * scale
@@ -12,6 +12,8 @@ import numpy as np
 from .buttons import RoundedPushButton
 
 from ..tools import color_animation
+from ..signal_bridge import qt_scheduler
+from ...app.throttle import EventCoalescer
 
 logger = logging.getLogger(__name__)
 
@@ -129,9 +131,11 @@ class LabeledSlider(QWidget):
     def __init__(self, name: str, bounds: tuple = (0, 1),
                  value: float = 0,
                  parent=None, orientation=Qt.Horizontal, decimals: int = 3, scientific: bool = False,
-                 log_scale: bool = False):
+                 log_scale: bool = False, max_rate: float = None):
         super().__init__(parent=parent)
         self.name = name
+        # if max_rate is set, valueChanged is emitted at most max_rate times per second while dragging
+        self._value_events = EventCoalescer(self._emit_value, max_rate, qt_scheduler) if max_rate else None
         self._decimals = decimals
         self._scientific: bool = scientific
         self._bounds = bounds
@@ -143,6 +147,7 @@ class LabeledSlider(QWidget):
         self.line_edit.setStyleSheet('QLineEdit {  border: none; }')
 
         self.slider.valueChangedByHand.connect(self._set_value_from_slider)
+        self.slider.sliderReleased.connect(self._finish_value_changes)
 
         layout = QHBoxLayout(self)
         layout.addWidget(self.label)
@@ -175,7 +180,17 @@ class LabeledSlider(QWidget):
 
     def _set_value_from_slider(self):
         self.line_edit.setText(self.get_str_value())
-        self.valueChanged.emit(self.slider.value())
+        if self._value_events:
+            self._value_events.push(None, self.slider.value())
+        else:
+            self.valueChanged.emit(self.slider.value())
+
+    def _emit_value(self, events: dict):
+        self.valueChanged.emit(events[None])
+
+    def _finish_value_changes(self, *args):
+        if self._value_events:
+            self._value_events.flush()
 
     def _set_value_from_text(self):
         value = self.line_edit.text()
@@ -191,6 +206,8 @@ class LabeledSlider(QWidget):
             self.line_edit.setText(self.get_str_value())
             color_animation(self.line_edit)
 
+        if self._value_events:
+            self._value_events.clear()
         self.valueChanged.emit(self.slider.value())
 
     def set_value(self, value: float, change_bounds: bool = True):
@@ -426,6 +443,7 @@ class ParametersSlider(QWidget):
     sigLowerValueChanged = pyqtSignal(float)
     sigMiddleValueChanged = pyqtSignal(float)
     sigUpperValueChanged = pyqtSignal(float)
+    sigMoveFinished = pyqtSignal()
 
     _rect_width = 10
     _rect_height = 20
@@ -495,6 +513,7 @@ class ParametersSlider(QWidget):
         if self._pressed:
             ev.accept()
             self._pressed = 0
+            self.sigMoveFinished.emit()
         else:
             ev.ignore()
 
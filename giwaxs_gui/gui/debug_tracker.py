@@ -8,7 +8,7 @@ import logging
 
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
 
-from .utils import SingletonMeta
+from ..app.utils import SingletonMeta
 
 logger = logging.getLogger(__name__)
 
@@ -3,18 +3,24 @@ from typing import Dict, Tuple, List, DefaultDict, Set
 from collections import defaultdict
 import gc
 
-from PyQt5.QtCore import QObject, pyqtSignal, Qt, pyqtSlot
+from PyQt5.QtCore import QObject, pyqtSignal, Qt, pyqtSlot, QTimer
 
 from PyQt5.QtWidgets import (QPlainTextEdit, QTreeWidget,
                              QTreeWidgetItem, QWidget, QPushButton,
                              QVBoxLayout, QApplication, QLabel, QSplitter,
                              QListWidget, QListWidgetItem, QLineEdit, QMenu,
-                             QCheckBox, QGridLayout, QComboBox)
+                             QCheckBox, QGridLayout, QComboBox, QTabWidget,
+                             QFileDialog)
 
 from PyQt5.QtGui import QColor, QTextCursor
 
+from pyqtgraph import PlotWidget, BarGraphItem
+
+import numpy as np
+
 from ..app import App
-from ..app.debug_tracker import ObjectTracker, ObjectStatus
+from ..app.profiling import profiler, HISTOGRAM_BINS
+from .debug_tracker import ObjectTracker, ObjectStatus
 
 
 def _set_html_color(message, level):
@@ -367,6 +373,124 @@ class WidgetList(QWidget):
         return [str(obj.__class__.__name__), obj.objectName(), '', str(id(obj))]
 
 
+class ProfilingWidget(QWidget):
+    """Stage timings collected by app.profiling: the table of the stages and the histogram of the selected one."""
+
+    UPDATE_INTERVAL: int = 1000
+
+    COLUMNS = ('Stage', 'Calls', 'Mean, ms', 'Median, ms', 'P90, ms', 'Max, ms',
+               'Total, s', 'CPU, s', 'Allocated, MB')
+
+    log = logging.getLogger(__name__)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items: Dict[str, QTreeWidgetItem] = {}
+        self._init_ui()
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(self.UPDATE_INTERVAL)
+        self._timer.timeout.connect(self.update_stats)
+
+        self.enable_checkbox.setChecked(profiler.enabled)
+
+    def _init_ui(self):
+        layout = QGridLayout(self)
+
+        self.enable_checkbox = QCheckBox('Enable profiling', self)
+        self.memory_checkbox = QCheckBox('Track memory (slow)', self)
+        self.memory_checkbox.setChecked(profiler.track_memory)
+        self.reset_button = QPushButton('Reset', self)
+        self.export_button = QPushButton('Export JSON', self)
+
+        self.stats_tree = QTreeWidget(self)
+        self.stats_tree.setHeaderLabels(self.COLUMNS)
+        self.stats_tree.setSortingEnabled(True)
+        self.histogram_plot = PlotWidget(self)
+        self.histogram_plot.setLogMode(x=True)
+        self.histogram_plot.setLabel('bottom', 'Wall time', units='s')
+        self.histogram_plot.setLabel('left', 'Calls')
+
+        splitter = QSplitter(orientation=Qt.Vertical, parent=self)
+        splitter.addWidget(self.stats_tree)
+        splitter.addWidget(self.histogram_plot)
+
+        layout.addWidget(self.enable_checkbox, 0, 0)
+        layout.addWidget(self.memory_checkbox, 0, 1)
+        layout.addWidget(self.reset_button, 0, 2)
+        layout.addWidget(self.export_button, 0, 3)
+        layout.addWidget(splitter, 1, 0, 1, 4)
+
+        self.enable_checkbox.toggled.connect(self._enable)
+        self.memory_checkbox.toggled.connect(self._enable)
+        self.reset_button.clicked.connect(self._reset)
+        self.export_button.clicked.connect(self._export)
+        self.stats_tree.currentItemChanged.connect(self._update_histogram)
+
+    @pyqtSlot(bool, name='enableProfiling')
+    def _enable(self, *args):
+        enabled = self.enable_checkbox.isChecked()
+        profiler.enable(enabled, self.memory_checkbox.isChecked())
+        if enabled:
+            self._timer.start()
+        else:
+            self._timer.stop()
+        self.update_stats()
+
+    @pyqtSlot(name='resetProfiling')
+    def _reset(self):
+        profiler.reset()
+        self.stats_tree.clear()
+        self._items.clear()
+        self.histogram_plot.clear()
+
+    @pyqtSlot(name='exportProfiling')
+    def _export(self):
+        path, _ = QFileDialog.getSaveFileName(self, 'Export stage timings', 'profiling.json', 'JSON (*.json)')
+        if path:
+            try:
+                profiler.export_json(path)
+            except OSError as err:
+                self.log.exception(err)
+
+    @pyqtSlot(name='updateStats')
+    def update_stats(self):
+        stats = profiler.stats()
+
+        for name, stage_stats in stats.items():
+            if name not in self._items:
+                self._items[name] = QTreeWidgetItem(self.stats_tree, [name])
+            item = self._items[name]
+            values = (stage_stats['count'], stage_stats['mean'] * 1e3, stage_stats['median'] * 1e3,
+                      stage_stats['p90'] * 1e3, stage_stats['max'] * 1e3, stage_stats['wall'],
+                      stage_stats['cpu'], stage_stats['allocated'] / 2 ** 20)
+            for i, value in enumerate(values, 1):
+                item.setData(i, Qt.DisplayRole, round(value, 3) if isinstance(value, float) else value)
+
+        self._update_histogram(self.stats_tree.currentItem())
+
+    def _update_histogram(self, item: QTreeWidgetItem or None, *args):
+        self.histogram_plot.clear()
+        if item is None:
+            return
+        stage_stats = profiler.stats().get(item.text(0))
+        if not stage_stats:
+            return
+        # bins are drawn in log10 coordinates, the last (overflow) bin is shown as one more bin
+        edges = np.log10([HISTOGRAM_BINS[0] / 10 ** 0.25, *HISTOGRAM_BINS, HISTOGRAM_BINS[-1] * 10 ** 0.25])
+        self.histogram_plot.addItem(BarGraphItem(x0=edges[:-1], x1=edges[1:], height=stage_stats['histogram']))
+        self.histogram_plot.setTitle(item.text(0))
+
+    def showEvent(self, event):
+        if profiler.enabled:
+            self._timer.start()
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self._timer.stop()
+        super().hideEvent(event)
+
+
 class DebugWindow(QWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -378,11 +502,16 @@ class DebugWindow(QWidget):
         self.setWindowFlag(Qt.Window)
         self.setWindowTitle('Debugging Window')
 
+        self.tab_widget = QTabWidget(self)
         self.logging_widget = QTextEditLogger(self)
         # self.widget_list = WidgetList(self)
         self.widget_list = TrackerWidget(self)
         self.splitter = QSplitter(orientation=Qt.Vertical, parent=self)
         self.splitter.addWidget(self.logging_widget.widget)
         self.splitter.addWidget(self.widget_list)
+        self.profiling_widget = ProfilingWidget(self)
 
-        layout.addWidget(self.splitter)
+        self.tab_widget.addTab(self.splitter, 'Logs and objects')
+        self.tab_widget.addTab(self.profiling_widget, 'Profiling')
+
+        layout.addWidget(self.tab_widget)
@@ -9,12 +9,8 @@ from .polar_image_viewer import PolarImageViewer
 from .file_viewer import MainFileWidget
 from .profiles.radial_profile_widget import RadialProfileWidget
 from .profiles.angular_profile_widget import AngularProfileWidget
-from .fitting import FitWidget, RoiFitWidget
 from .save_window import SaveWindow
 from .load_window import LoadFromH5Widget
-from .crystal_viewer import MainCrystalViewer
-from .structures.crystal_image_viewer import CrystalImageWidget
-from .structures import CrystalsController
 
 logger = logging.getLogger(__name__)
 
@@ -24,17 +20,19 @@ class AppDockArea(DockArea):
         DockArea.__init__(self, parent=parent)
         self._status_dict = defaultdict(lambda: True)
         self.app = App()
-        self.crystal_controller = CrystalsController(self.app.crystals_database, self, self)
-        self.crystal_viewer = MainCrystalViewer(self.crystal_controller, self)
+
+        # crystals, 3D viewer and fitting widgets are heavy to import and are created on first use
+        self.crystal_controller = None
+        self.crystal_viewer = None
+        self.crystal_image_viewer = None
+        self.fit_view = None
 
         self.__init_image_viewer()
         self.__init_polar_viewer()
         # self.__init_control_widget__()
         self.__init_radial_widget()
         self.__init_file_widget()
-        self.__init_fit_viewer()
         self.__init_angular_widget()
-        self.__init_crystal_image_widget()
 
         self._DOCK_DICT = {
             'image_view': self.image_viewer_dock,
@@ -42,8 +40,10 @@ class AppDockArea(DockArea):
             'radial_profile': self.radial_profile_dock,
             'file_widget': self.file_dock,
             'angular_profile': self.angular_profile_dock,
-            'crystal_image': self.crystal_image_viewer_dock,
-            'fit_view': self.fit_view_dock,
+        }
+        self._LAZY_DOCKS = {
+            'crystal_image': self.__init_crystal_image_widget,
+            'fit_view': self.__init_fit_viewer,
         }
         self._apply_default_view()
         self._fit_widget = None
@@ -63,6 +63,8 @@ class AppDockArea(DockArea):
         save_window.show()
 
     def _open_fit_widget(self, fit_object):
+        from .fitting import FitWidget
+
         fit_widget = FitWidget(fit_object, parent=self.parent())
         fit_widget.sigFitApplyActiveImage.connect(self.app.image_holder.apply_fit)
 
@@ -70,8 +72,6 @@ class AppDockArea(DockArea):
         self.show_hide_docks('polar')
         self.show_hide_docks('radial_profile')
         self.show_hide_docks('angular_profile')
-        self.show_hide_docks('crystal_image')
-        self.show_hide_docks('fit_view')
         # self.show_hide_docks('control')
 
     def __init_image_viewer(self):
@@ -82,11 +82,14 @@ class AppDockArea(DockArea):
         self.image_viewer_dock = dock
 
     def __init_fit_viewer(self):
+        from .fitting import RoiFitWidget
+
         self.fit_view = RoiFitWidget(self)
         dock = Dock('RoiFitWidget')
         dock.addWidget(self.fit_view)
         self.addDock(dock, size=(1000, 1000), position='right', relativeTo=self.image_viewer_dock)
         self.fit_view_dock = dock
+        return dock
 
     def __init_polar_viewer(self):
         self.polar_view = PolarImageViewer(self)
@@ -109,13 +112,26 @@ class AppDockArea(DockArea):
         self.addDock(dock, position='bottom')
         self.angular_profile_dock = dock
 
+    def __init_crystal_viewer(self):
+        from .structures import CrystalsController
+        from .crystal_viewer import MainCrystalViewer
+
+        self.crystal_controller = CrystalsController(self.app.crystals_database, self, self)
+        self.crystal_viewer = MainCrystalViewer(self.crystal_controller, self)
+
     def __init_crystal_image_widget(self):
+        from .structures.crystal_image_viewer import CrystalImageWidget
+
+        if not self.crystal_controller:
+            self.__init_crystal_viewer()
+
         self.crystal_image_viewer = CrystalImageWidget(self)
         self.crystal_controller.connect_image_widget(self.crystal_image_viewer)
         dock = Dock('Crystal Image Viewer')
         dock.addWidget(self.crystal_image_viewer)
         self.addDock(dock, position='right')
         self.crystal_image_viewer_dock = dock
+        return dock
 
     # def __init_control_widget__(self):
     #     self.control_widget = ControlWidget(
@@ -132,7 +148,11 @@ class AppDockArea(DockArea):
         self.addDock(self.file_dock, position='left')
 
     def show_hide_docks(self, dock_name: str):
-        assert dock_name in self._DOCK_DICT.keys()
+        assert dock_name in self._DOCK_DICT.keys() or dock_name in self._LAZY_DOCKS.keys()
+        if dock_name not in self._DOCK_DICT:
+            # a new dock is shown
+            self._DOCK_DICT[dock_name] = self._LAZY_DOCKS[dock_name]()
+            return
         dock = self._DOCK_DICT[dock_name]
         status = self._status_dict[dock_name]
         if status:
@@ -142,9 +162,16 @@ class AppDockArea(DockArea):
         self._status_dict[dock_name] = not status
 
     def show_hide_crystal_database(self):
+        if not self.crystal_viewer:
+            self.__init_crystal_viewer()
         if self.crystal_viewer.isHidden():
             self.crystal_viewer.show()
-            self.crystal_image_viewer_dock.show()
+            if 'crystal_image' in self._DOCK_DICT:
+                self.crystal_image_viewer_dock.show()
+                self._status_dict['crystal_image'] = True
+            else:
+                self.show_hide_docks('crystal_image')
         else:
             self.crystal_viewer.close()
             self.crystal_image_viewer_dock.hide()
+            self._status_dict['crystal_image'] = False
@@ -4,6 +4,7 @@ import traceback
 import logging
 
 from .tools import show_error
+from ..app.file_manager.write_behind import write_queue
 
 from PyQt5.QtCore import QObject, pyqtSignal
 
@@ -37,6 +38,9 @@ class UncaughtHook(QObject):
 
             self.log.critical("Uncaught exception:\n {0}".format(log_msg), exc_info=exc_info)
 
+            # keep the saved state on disk if the application is going to be closed
+            write_queue.flush()
+
             # trigger message box show
             self._exception_caught.emit(log_msg)
 
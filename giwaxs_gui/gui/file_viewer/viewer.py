@@ -5,9 +5,11 @@ from PyQt5.QtWidgets import (QTreeView, QMenu,
 from PyQt5.QtGui import QStandardItem, QStandardItemModel
 from PyQt5.QtCore import Qt
 
-from ..basic_widgets import RoundedPushButton
+from ..basic_widgets import RoundedPushButton, ProgressBar
 from ..tools import Icon, get_folder_filepath, get_image_filepath
-from ...app.file_manager import FileManager, ImageKey, FolderKey
+from ..workers import UpdateWorker
+from ..background_tasks import BackgroundTasks
+from ...app.file_manager import FileManager, ImageKey, FolderKey, ImagePathKey
 
 
 class FileModel(QStandardItemModel):
@@ -130,6 +132,10 @@ class FileViewer(QTreeView):
             close_folder = menu.addAction('Remove from project')
             close_folder.triggered.connect(
                 lambda *x, it=item: self._remove_item(it))
+            if self._fm.decompressed_cache:
+                warm_cache = menu.addAction('Decompress images to cache')
+                warm_cache.triggered.connect(
+                    lambda *x, it=item: self._warm_cache(it))
 
         elif isinstance(item, ImageItem):
             close_image = menu.addAction('Remove from project')
@@ -139,6 +145,22 @@ class FileViewer(QTreeView):
             return
         menu.exec_(self.viewport().mapToGlobal(position))
 
+    def _warm_cache(self, item: FolderItem):
+        cache = self._fm.decompressed_cache
+        item.on_clicked()
+        paths = [key.path for key in item.key.image_children
+                 if isinstance(key, ImagePathKey) and cache.is_compressed(key.path)]
+        if not paths:
+            return
+
+        progress_bar = ProgressBar(len(paths), 'Decompressing images...', 'Finished!',
+                                   parent=self, auto_close=True, block_window=False, show=True)
+        worker = UpdateWorker(cache.warm, paths)
+        worker.signals.sigSetMax.connect(progress_bar.set_max)
+        worker.signals.sigSetProgress.connect(progress_bar.set_progress)
+        worker.signals.finished.connect(progress_bar.finished)
+        BackgroundTasks().tasks.add_worker(worker)
+
     def _remove_item(self, item: FolderItem or ImageItem):
         parent = item.parent() or self._model
         parent.removeRow(item.row())
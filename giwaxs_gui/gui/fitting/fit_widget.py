@@ -21,7 +21,9 @@ from ...app.file_manager import ImageKey, FolderKey
 from ...app.rois.roi_data import Roi, RoiTypes
 from ...app.profiles import BasicProfile, SavedProfile
 from ...app import App
+from ...app.throttle import EventCoalescer
 from ..tools import Icon, get_pen, center_widget
+from ..signal_bridge import qt_scheduler
 from ..basic_widgets import (Custom1DPlot, CustomImageViewer, PlotBC,
                              ParametersSlider, LabeledSlider)
 from .multi_fit import MultiFitWindow
@@ -123,9 +125,11 @@ class FitWidget(QWidget):
 
         self.set_as_default_button = QPushButton('Set as default options')
         self.set_as_default_button.clicked.connect(self._set_as_default)
-        self.range_factor_slider = LabeledSlider('Y range factor', (0, 10), parent=self, decimals=2)
+        self.range_factor_slider = LabeledSlider('Y range factor', (0, 10), parent=self, decimals=2,
+                                                 max_rate=SlidersWidget.MAX_UPDATE_RATE)
         self.range_factor_slider.valueChanged.connect(self._on_range_slider_moved)
-        self.sigma_slider = LabeledSlider('Sigma', (0, 10), parent=self, decimals=2)
+        self.sigma_slider = LabeledSlider('Sigma', (0, 10), parent=self, decimals=2,
+                                          max_rate=SlidersWidget.MAX_UPDATE_RATE)
         self.sigma_slider.valueChanged.connect(self._on_sigma_slider_moved)
         self.fit_current_button = QPushButton(CurrentFitButtonStatus.fit.value)
         self.fit_current_button.clicked.connect(self._fit_current_clicked)
@@ -729,6 +733,7 @@ class SliderWithLabels(QFrame):
 class SlidersWidget(QWidget):
     sigValueChanged = pyqtSignal()
     DEFAULT_LABEL = 'lower bound; init value; upper bound'
+    MAX_UPDATE_RATE = 60.
 
     log = logging.getLogger(__name__)
 
@@ -740,6 +745,8 @@ class SlidersWidget(QWidget):
         self._sliders: Dict[int, ParametersSlider] = {}
         self._labels: Dict[int, QLabel] = {}
         self._param_labels: Dict[int, QLabel] = {}
+        self._value_events = EventCoalescer(
+            lambda events: self.sigValueChanged.emit(), self.MAX_UPDATE_RATE, qt_scheduler)
 
         self._init_ui()
 
@@ -763,6 +770,7 @@ class SlidersWidget(QWidget):
         sl.sigLowerValueChanged.connect(lambda x, idx=i: self._send_value(x, 0, idx))
         sl.sigMiddleValueChanged.connect(lambda x, idx=i: self._send_value(x, 1, idx))
         sl.sigUpperValueChanged.connect(lambda x, idx=i: self._send_value(x, 2, idx))
+        sl.sigMoveFinished.connect(self._value_events.flush)
 
         if App().debug_tracker:
             App().debug_tracker.add_object(pl)
@@ -826,17 +834,18 @@ class SlidersWidget(QWidget):
         self._update_label(
             idx, self.fit.lower_bounds[idx], self.fit.init_params[idx], self.fit.upper_bounds[idx])
 
-        self.sigValueChanged.emit()
+        self._value_events.push(None)
 
     def remove_fit(self):
         self.fit = None
+        self._value_events.clear()
         for l in self._labels.values():
             l.setText(self.DEFAULT_LABEL)
 
 
 class FittingProfile(BasicProfile):
-    def __init__(self, parent=None):
-        super().__init__(parent)
+    def __init__(self):
+        super().__init__()
         self.current_key = None
         self.profile_fm = App().fm.profiles
 
@@ -20,7 +20,9 @@ from ...app.fitting import (
 from ...app.fitting.fit_holder import FitHolder
 from ...app.rois.roi_data import Roi
 from ...app import App
+from ...app.throttle import EventCoalescer
 from ..tools import get_pen
+from ..signal_bridge import qt_scheduler
 from ..basic_widgets import (
     Custom1DPlot,
     ParametersSlider,
@@ -133,8 +135,8 @@ class RoiFitWidget(AbstractRoiHolder, QWidget):
         self.app.roi_dict.sig_unfixed.connect(self._unfix)
         self.app.roi_dict.sigConfLevelChanged.connect(self._change_confidence)
 
-        self.next_roi_btn.clicked.connect(self.app.roi_dict.select_next)
-        self.prev_roi_btn.clicked.connect(self.app.roi_dict.select_previous)
+        self.next_roi_btn.clicked.connect(lambda: self.app.roi_dict.select_next())
+        self.prev_roi_btn.clicked.connect(lambda: self.app.roi_dict.select_previous())
         self.fit_current_button.clicked.connect(self._fit_current_clicked)
         self.update_bounds_btn.clicked.connect(self._update_bounds_clicked)
         self.update_params_by_range_btn.clicked.connect(self._update_params_by_range_clicked)
@@ -419,6 +421,7 @@ class SliderWithLabels(QFrame):
 class SlidersWidget(QWidget):
     sigValueChanged = pyqtSignal()
     DEFAULT_LABEL = 'lower bound; init value; upper bound'
+    MAX_UPDATE_RATE = 60.
 
     log = logging.getLogger(__name__)
 
@@ -430,6 +433,8 @@ class SlidersWidget(QWidget):
         self._sliders: Dict[int, ParametersSlider] = {}
         self._labels: Dict[int, QLabel] = {}
         self._param_labels: Dict[int, QLabel] = {}
+        self._value_events = EventCoalescer(
+            lambda events: self.sigValueChanged.emit(), self.MAX_UPDATE_RATE, qt_scheduler)
 
         self._init_ui()
 
@@ -456,6 +461,7 @@ class SlidersWidget(QWidget):
         sl.sigLowerValueChanged.connect(lambda x, idx=i: self._send_value(x, 0, idx))
         sl.sigMiddleValueChanged.connect(lambda x, idx=i: self._send_value(x, 1, idx))
         sl.sigUpperValueChanged.connect(lambda x, idx=i: self._send_value(x, 2, idx))
+        sl.sigMoveFinished.connect(self._value_events.flush)
 
         if App().debug_tracker:
             App().debug_tracker.add_object(pl)
@@ -520,9 +526,10 @@ class SlidersWidget(QWidget):
         self._update_label(
             idx, self.fit.lower_bounds[idx], self.fit.init_params[idx], self.fit.upper_bounds[idx])
 
-        self.sigValueChanged.emit()
+        self._value_events.push(None)
 
     def remove_fit(self):
         self.fit = None
+        self._value_events.clear()
         for l in self._labels.values():
             l.setText(self.DEFAULT_LABEL)
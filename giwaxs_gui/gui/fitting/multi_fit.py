@@ -1,9 +1,12 @@
 import logging
+from bisect import bisect_left
 from enum import Enum
-from typing import Dict, List, Tuple
+from typing import Dict, List, Tuple, Generator
 from time import sleep
 from copy import deepcopy
 
+import numpy as np
+
 from PyQt5.QtCore import (QObject, pyqtSlot, pyqtSignal,
                           QCoreApplication, Qt, QThread)
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QPushButton,
@@ -13,9 +16,12 @@ from pyqtgraph import GraphicsLayoutWidget, FillBetweenItem, InfiniteLine
 
 from ...app import App, Roi, RoiData
 from ...app.file_manager import ImageKey, FolderKey
-from ...app.fitting import FitObject, Fit
+from ...app.fitting import FitObject, Fit, PolarWindows
+from ...app.throttle import EventCoalescer
+from ...app.parallel_io import iter_ordered, in_memory
 
 from ..tools import get_pen, center_widget, Icon, show_error
+from ..signal_bridge import qt_scheduler
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +45,9 @@ class MultiFit(QObject):
 
     log = logging.getLogger(__name__)
 
+    # number of the next images read in advance
+    READ_AHEAD: int = 2
+
     def __init__(self, fm_multi_fit, folder_key: FolderKey, parent=None):
         super().__init__(parent=parent)
         self.sleep_time: float = 0.05
@@ -64,6 +73,7 @@ class MultiFit(QObject):
                 roi_data = rois_data_fm[image_key] or RoiData()
                 roi_data.apply_fit(rois)
                 rois_data_fm[image_key] = roi_data
+                App().roi_dict.update_index(roi_data, image_key)
 
             self.sigSaved.emit(i)
             self._process_events()
@@ -74,6 +84,9 @@ class MultiFit(QObject):
     def run_fit(self, fit_obj: FitObject):
         self._paused = False
         fit_obj = deepcopy(fit_obj)
+        # the next images are read while the current one is fitted
+        next_images = iter_ordered(self._load_next_image, _next_image_keys(fit_obj),
+                                   workers=self.READ_AHEAD, max_pending=self.READ_AHEAD + 1)
 
         while fit_obj and fit_obj.fits and not self._paused:
             self._process_events()
@@ -99,18 +112,19 @@ class MultiFit(QObject):
                 break
 
             fit_obj.is_fitted = True
-            new_key = fit_obj.image_key.parent.get_next_image(fit_obj.image_key)
+            new_key, saved_fit, image_data = next(next_images, (None, None, None))
 
             if not new_key:
                 self.sigFit.emit(fit_obj)
                 break
 
-            saved_fit = self.fm_multi_fit[new_key]
             self.sigFit.emit(deepcopy(fit_obj))
             new_fit_obj = get_new_fit(fit_obj, saved_fit=saved_fit,
-                                      add_fits=True, new_image_key=new_key)
+                                      add_fits=True, new_image_key=new_key, image_data=image_data)
             fit_obj = new_fit_obj
 
+        next_images.close()
+
         if self._stopped:
             self.deleteLater()
         elif self._paused:
@@ -119,6 +133,13 @@ class MultiFit(QObject):
             self._paused = True
             self.sigFinished.emit()
 
+    def _load_next_image(self, image_key: ImageKey) -> Tuple[ImageKey, FitObject or None, tuple or None]:
+        saved_fit = self.fm_multi_fit[image_key]
+        if saved_fit:
+            return image_key, saved_fit, None
+        image, polar_image, geometry = App().image_holder.get_data_by_key(image_key, save=True)
+        return image_key, None, (in_memory(image), polar_image, geometry)
+
     def _process_events(self):
         sleep(self.sleep_time)
         QCoreApplication.processEvents()
@@ -154,8 +175,20 @@ class MultiFit(QObject):
         self._stopped = True
 
 
+def _next_image_keys(fit_obj: FitObject or None) -> Generator[ImageKey, None, None]:
+    if not fit_obj or not fit_obj.image_key.parent:
+        return
+    image_key, folder_key = fit_obj.image_key, fit_obj.image_key.parent
+    while True:
+        image_key = folder_key.get_next_image(image_key)
+        if not image_key:
+            return
+        yield image_key
+
+
 def get_new_fit(previous_fit: FitObject, saved_fit: FitObject = None,
-                add_fits: bool = False, new_image_key: ImageKey = None):
+                add_fits: bool = False, new_image_key: ImageKey = None,
+                image_data: tuple = None):
     if not saved_fit:
         if not new_image_key:
             folder_key: FolderKey = previous_fit.image_key.parent
@@ -167,13 +200,17 @@ def get_new_fit(previous_fit: FitObject, saved_fit: FitObject = None,
             logger.debug('empty next image_key')
             return
 
-        image, polar_image, geometry = App().image_holder.get_data_by_key(new_image_key, save=True)
+        if image_data is None:
+            image_data = App().image_holder.get_data_by_key(new_image_key, save=True)
+        image, polar_image, geometry = image_data
 
         if polar_image is None:
             logger.debug('empty polar_image')
             return
 
         saved_fit: FitObject = FitObject(new_image_key, polar_image, geometry.r_axis, geometry.phi_axis)
+        if image is not None:
+            saved_fit.set_polar_windows(PolarWindows(image, geometry, transformed=True))
 
     if not saved_fit.saved_profile:
 
@@ -242,7 +279,7 @@ class MultiFitWindow(QWidget):
 
     def _init_ui(self):
         layout = QVBoxLayout(self)
-        self.plot_params = MultiFitPlot(self)
+        self.plot_params = MultiFitPlot(self, images_num=self.folder_key.images_num)
         self.progress_widget = ImageSeriesSliderProgressWidget(self.current_fit.image_key, self)
         self.control_button = QPushButton(ButtonStates.start.value)
         layout.addWidget(QLabel('Image series'))
@@ -375,20 +412,70 @@ class MultiFitWindow(QWidget):
         self.deleteLater()
 
 
+class FitSeries(object):
+    """
+    Radius and width of a roi over an image series. Values are stored in preallocated arrays
+    by the image index (nan for the images without the roi), the sorted indices of the
+    filled images are kept to slice the curves.
+    """
+
+    def __init__(self, capacity: int = 64):
+        self._data: np.ndarray = np.full((2, max(capacity, 1)), np.nan)
+        self._indices: List[int] = []
+
+    def __len__(self):
+        return len(self._indices)
+
+    def __contains__(self, idx: int):
+        i = bisect_left(self._indices, idx)
+        return i < len(self._indices) and self._indices[i] == idx
+
+    def set(self, idx: int, radius: float, width: float):
+        if idx >= self._data.shape[1]:
+            self._grow(idx + 1)
+        self._data[:, idx] = radius, width
+        i = bisect_left(self._indices, idx)
+        if i == len(self._indices) or self._indices[i] != idx:
+            self._indices.insert(i, idx)
+
+    def remove(self, idx: int):
+        i = bisect_left(self._indices, idx)
+        if i < len(self._indices) and self._indices[i] == idx:
+            del self._indices[i]
+            self._data[:, idx] = np.nan
+
+    def curves(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Image indices, radii and widths from the first to the last filled image."""
+        if not self._indices:
+            return np.zeros(0), np.zeros(0), np.zeros(0)
+        start, stop = self._indices[0], self._indices[-1] + 1
+        return np.arange(start, stop), self._data[0, start:stop], self._data[1, start:stop]
+
+    def _grow(self, size: int):
+        data = np.full((2, max(size, 2 * self._data.shape[1])), np.nan)
+        data[:, :self._data.shape[1]] = self._data
+        self._data = data
+
+
 class MultiFitPlot(GraphicsLayoutWidget):
     log = logging.getLogger(__name__)
 
     INACTIVE_COLOR = [63, 63, 63, 190]
     ACTIVE_COLOR = [50, 250, 50, 240]
 
-    def __init__(self, parent=None):
+    # max rate (Hz) of redrawing the curves while fitting
+    MAX_REDRAW_RATE: float = 20.
+
+    def __init__(self, parent=None, images_num: int = 0):
         super().__init__(parent)
         self.plot_item = self.addPlot()
         self.plot_item.setMenuEnabled(False)
         self.inf_line = InfiniteLine(0, pen=get_pen(color='red', style=Qt.DashLine))
         self.plot_item.addItem(self.inf_line)
         self.plots = {}
-        self.x_axis: Dict[int, List[int]] = {}
+        self.series: Dict[int, FitSeries] = {}
+        self._images_num: int = images_num
+        self._redraws = EventCoalescer(self._redraw, self.MAX_REDRAW_RATE, qt_scheduler)
 
     def add_fit(self, fit_obj: FitObject):
         self.log.debug(f'Number of fits = {len(fit_obj.fits)}')
@@ -397,10 +484,10 @@ class MultiFitPlot(GraphicsLayoutWidget):
         for fit in fit_obj.fits.values():
             self._add_fit(fit, x)
 
-        fitted_keys = [k for k in fit_obj.fits.keys() if fit_obj.fits[k].fitted_params]
+        fitted_keys = {k for k, fit in fit_obj.fits.items() if fit.fitted_params}
 
-        for key, x_axis in self.x_axis.items():
-            if x in x_axis and (key not in fitted_keys):
+        for key, series in self.series.items():
+            if x in series and key not in fitted_keys:
                 self._delete_fit(key, x)
 
         self.change_image(fit_obj.image_key)
@@ -411,77 +498,35 @@ class MultiFitPlot(GraphicsLayoutWidget):
     def delete_roi(self, roi_key: int, image_idx: int):
         self._delete_fit(roi_key, image_idx)
 
-    def _add_fit(self, fit: Fit, x):
-        # if not fit.roi.fitted_parameters:
-        #     return
-
+    def _add_fit(self, fit: Fit, x: int):
         key = fit.roi.key
 
-        if key not in self.plots:
+        if key not in self.series:
             self._init_plot(key)
 
-        idx, x_axis = self._add_x(key, x)
-
-        plots = self.plots[key]
-
-        radius, width = fit.roi.radius, fit.roi.width
-
-        for name, point in zip(('upper', 'middle', 'lower'),
-                               (radius + width, radius, radius - width)):
-            plot = plots[name]
-            y = plot.yData
-            if y is None:
-                y = [point]
-            else:
-                y = y.tolist()
-                if len(y) == len(x_axis):
-                    # self.log.debug('Moving roi ...')
-                    y[idx] = point
-                else:
-                    # self.log.debug('Inserting roi ...')
-                    y.insert(idx, point)
-            plot.setData(x_axis, y)
-
-        self._update_fill_between(plots)
-
-    def _add_x(self, key: int, x) -> Tuple[int, list]:
-        if key not in self.x_axis:
-            self.x_axis[key] = [x]
-            return 0, self.x_axis[key]
-
-        x_axis: list = self.x_axis[key]
-        if x not in x_axis:
-            if not len(x_axis) or x_axis[-1] < x:
-                x_axis.append(x)
-                return len(x_axis) - 1, x_axis
-            else:
-                # TODO implement binary search
-                for i, other_x in enumerate(x_axis):
-                    if x < other_x:
-                        x_axis.insert(i, x)
-                        return i, x_axis
-        else:
-            return x_axis.index(x), x_axis
+        self.series[key].set(x, fit.roi.radius, fit.roi.width)
+        self._redraws.push(key)
 
     def _delete_fit(self, key: int, x: int):
-        try:
-            plots = self.plots[key]
-            x_axis = self.x_axis[key]
-            idx = x_axis.index(x)
-        except (KeyError, ValueError):
+        series = self.series.get(key)
+
+        if series is None or x not in series:
             return
 
-        # self.log.debug('Deleting fit ... ')
+        series.remove(x)
+        self._redraws.push(key)
 
-        x_axis.remove(x)
+    def _redraw(self, keys: dict):
+        for key in keys:
+            if key not in self.series:
+                continue
+            plots = self.plots[key]
+            x, radius, width = self.series[key].curves()
 
-        for name in ('upper', 'middle', 'lower'):
-            plot = plots[name]
-            y = plot.yData.tolist()
-            del y[idx]
-            plot.setData(x_axis, y)
+            for name, y in zip(('upper', 'middle', 'lower'), (radius + width, radius, radius - width)):
+                plots[name].setData(x, y, connect='finite')
 
-        self._update_fill_between(plots)
+        self.plot_item.autoRange()
 
     def select_fit(self, key: int):
         try:
@@ -496,25 +541,21 @@ class MultiFitPlot(GraphicsLayoutWidget):
             pass
 
     def _init_plot(self, key):
-        self.plots[key] = {}
-        self.plots[key]['upper'] = self.plot_item.plot(pen=get_pen(color='blue'))
-        self.plots[key]['middle'] = self.plot_item.plot(
+        self.series[key] = FitSeries(self._images_num)
+        self.plots[key] = plots = {}
+        plots['upper'] = self.plot_item.plot(pen=get_pen(color='blue'))
+        plots['middle'] = self.plot_item.plot(
             pen=get_pen(style=Qt.DashLine)
         )
-        self.plots[key]['lower'] = self.plot_item.plot(pen=get_pen(color='blue'))
-
-    def _update_fill_between(self, plots):
-        if 'fill' not in plots:
-            plots['fill'] = FillBetweenItem(plots['upper'], plots['lower'],
-                                            brush=self.INACTIVE_COLOR)
-            self.plot_item.addItem(plots['fill'])
-        else:
-            plots['fill'].setCurves(plots['upper'], plots['lower'])
+        plots['lower'] = self.plot_item.plot(pen=get_pen(color='blue'))
+        # the fill is updated by the curves
+        plots['fill'] = FillBetweenItem(plots['upper'], plots['lower'], brush=self.INACTIVE_COLOR)
+        self.plot_item.addItem(plots['fill'])
 
     @pyqtSlot(object, name='changeImage')
     def change_image(self, key: ImageKey):
         self.inf_line.setValue(key.idx)
-        self.plot_item.autoRange()
+        self._redraws.push(None)
 
 
 class ImageSeriesSliderProgressWidget(QWidget):
@@ -17,14 +17,16 @@ from ..__version import __version__
 
 from .dock_area import AppDockArea
 from .basic_widgets import ToolBar
-from .tools import Icon, get_image_filepath, get_folder_filepath, save_file_dialog
+from .tools import Icon, get_image_filepath, get_folder_filepath, save_file_dialog, show_error
 
 from .init_window import InitWindow
 from .debug_widgets import DebugWindow
+from .debug_tracker import TrackQObjects
 from .exception_message import UncaughtHook
 from .notifications import PopUpWrapper
 from .background_tasks import BackgroundTasks
 from .background_update import BackgroundUpdate
+from .signal_bridge import qt_scheduler, QtDispatcher
 
 
 class GIWAXSMainController(QObject):
@@ -43,8 +45,12 @@ class GIWAXSMainController(QObject):
         self.main_window = None
 
         if self.log.level <= logging.DEBUG:
+            self.app.debug_tracker = TrackQObjects()
             self.debug_window = DebugWindow()
         self.exception_hook = UncaughtHook()
+        self.app.roi_dict.set_move_scheduler(qt_scheduler)
+        self.app.image_holder.set_async_loading(QtDispatcher(self))
+        self.app.fm.sigSavingFailed.connect(self.show_saving_error)
 
         self.log.info(f'{"*" * 10}')
         self.log.info(f'Starting GIWAXS analysis {__version__}!')
@@ -68,6 +74,11 @@ class GIWAXSMainController(QObject):
         self.init_window.sigOpenProject.connect(self.open_new_project)
         self.init_window.sigExit.connect(self.close_app)
 
+    def show_saving_error(self, failed: dict):
+        show_error(f'{len(failed)} project files could not be saved.',
+                   error_title='Saving error',
+                   info_text='\n'.join(f'{path}: {err}' for path, err in failed.items()))
+
     @pyqtSlot(name='closeProject')
     def close_project(self):
         self.app.fm.close_project()
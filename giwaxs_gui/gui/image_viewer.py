@@ -23,12 +23,14 @@ from ..app.transformations import Transformation
 
 from .basic_widgets import (
     CustomImageViewer,
+    DisplayModes,
     LabeledSlider,
     BlackToolBar,
     DrawRoiController
 )
 
 from .roi_widgets.roi_2d_ring_widget import Roi2DRing
+from .roi_widgets.rings_overlay import RingsOverlay, OverlayRing
 from .roi_widgets.abstract_roi_holder import AbstractRoiHolder
 
 from .tools import (
@@ -40,20 +42,58 @@ logger = logging.getLogger(__name__)
 
 
 class ImageViewer(AbstractRoiHolder, CustomImageViewer):
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, **kwargs):
         AbstractRoiHolder.__init__(self, 'ImageViewer')
         CustomImageViewer.__init__(
-            self, parent)
+            self, parent, **kwargs)
         self.image_plot.getAxis('bottom').setLabel(text='<math>Q<sub>xy</sub>  (A<sup>-1</sup>) </math>', color='white')
         self.image_plot.getAxis('left').setLabel(text='<math>Q<sub>z</sub>  (A<sup>-1</sup>) </math>', color='white')
 
+        # only selected rois are interactive items, others are drawn by a single overlay item
+        self._rings_overlay = RingsOverlay()
+        self.image_plot.addItem(self._rings_overlay)
+
     def _make_roi_widget(self, roi: Roi):
+        if not roi.active:
+            return OverlayRing(roi, self._rings_overlay)
         roi_widget = Roi2DRing(roi)
         self.image_plot.addItem(roi_widget)
         return roi_widget
 
-    def _delete_roi_widget(self, roi_widget: Roi2DRing):
-        self.image_plot.removeItem(roi_widget)
+    def _delete_roi_widget(self, roi_widget: Roi2DRing or OverlayRing):
+        if isinstance(roi_widget, OverlayRing):
+            roi_widget.remove()
+        else:
+            self.image_plot.removeItem(roi_widget)
+
+    def _update_select(self, keys: tuple):
+        for key in keys:
+            roi_widget = self._roi_widgets.get(key)
+            if roi_widget is None:
+                self.log.error(f'Key error in {self.__class__.__name__}')
+                continue
+            if roi_widget.roi.active == isinstance(roi_widget, OverlayRing):
+                self._delete_roi_widget(roi_widget)
+                self._roi_widgets[key] = self._make_roi_widget(roi_widget.roi)
+                self._connect_roi_widget(self._roi_widgets[key])
+                if self._segments_hidden and not isinstance(self._roi_widgets[key], OverlayRing):
+                    self._roi_widgets[key].hide()
+            else:
+                roi_widget.update_select()
+
+    def hide_segments(self, *args):
+        self._rings_overlay.hide()
+        for roi_widget in self._roi_widgets.values():
+            if not isinstance(roi_widget, OverlayRing):
+                roi_widget.hide()
+        self._segments_hidden = True
+
+    def show_segments(self, *args):
+        self._rings_overlay.show()
+        for roi_widget in self._roi_widgets.values():
+            if not isinstance(roi_widget, OverlayRing):
+                roi_widget.show()
+        self._segments_hidden = False
 
 
 class MainImageViewer(ImageViewer):
@@ -85,13 +125,14 @@ class MainImageViewer(ImageViewer):
             self.set_size()
 
     def __init__(self, parent=None):
-        super().__init__(parent)
+        super().__init__(parent, display_mode=DisplayModes.tiles)
 
         self.app = App()
         self.register_key_patch()
         self._draw_roi = ImageDrawRoiController(self.view_box, self)
         self._draw_roi.sigCreateRoi.connect(self.app.roi_dict.add_roi)
         self._draw_roi.sigMoveRoi.connect(self.app.roi_dict.move_roi)
+        self._draw_roi.sigMoveFinished.connect(lambda: self.app.roi_dict.finish_moves())
 
         self._segments_hidden = False
         self._geometry_params_widget = None
@@ -99,6 +140,7 @@ class MainImageViewer(ImageViewer):
         self.app.geometry_holder.sigScaleChanged.connect(self._on_scale_changed)
         self.app.geometry_holder.sigBeamCenterChanged.connect(self._on_beam_center_changed)
         self.app.image_holder.sigImageChanged.connect(self._on_image_changed)
+        self.app.image_holder.sigImagePreview.connect(self.set_preview)
         self.app.image_holder.sigEmptyImage.connect(self.clear_image)
 
     def _on_scale_changed(self):
@@ -269,5 +311,5 @@ class Basic2DImageWidget(QMainWindow):
             self.image_viewer.open_geometry_parameters)
 
         self._set_default_geometry_button = QPushButton('Save as default geometry')
-        self._set_default_geometry_button.clicked.connect(self.app.geometry_holder.save_as_default)
+        self._set_default_geometry_button.clicked.connect(lambda: self.app.geometry_holder.save_as_default())
         toolbar.addWidget(self._set_default_geometry_button)
@@ -4,7 +4,7 @@ from PyQt5.QtWidgets import QMainWindow, QLabel, QComboBox, QHBoxLayout
 from PyQt5.QtCore import pyqtSlot, Qt, QPointF
 
 import numpy as np
-from .basic_widgets import (CustomImageViewer, BlackToolBar, BasicInputParametersWidget,
+from .basic_widgets import (CustomImageViewer, DisplayModes, BlackToolBar, BasicInputParametersWidget,
                             InfoButton, AbstractInputParametersWidget,
                             DrawRoiController)
 from .roi_widgets.roi_2d_rect_widget import Roi2DRect
@@ -29,13 +29,14 @@ class PolarImageViewer(AbstractRoiHolder, QMainWindow):
         self.app = App()
         self._setup_window = None
         self._interpolation_params_dict: dict = InterpolateSetupWindow.get_config()
-        self._image_viewer = _PolarCustomImageViewer(self)
+        self._image_viewer = _PolarCustomImageViewer(self, display_mode=DisplayModes.tiles)
 
         self.register_key_patch()
 
         self._draw_roi = PolarDrawRoi(self._image_viewer.view_box, self)
         self._draw_roi.sigCreateRoi.connect(self.app.roi_dict.add_roi)
         self._draw_roi.sigMoveRoi.connect(self.app.roi_dict.move_roi)
+        self._draw_roi.sigMoveFinished.connect(lambda: self.app.roi_dict.finish_moves())
 
         self._image_viewer.image_plot.getAxis('bottom').setLabel(
             text='|Q|', color='white', font_size='large')
@@ -76,7 +77,7 @@ class PolarImageViewer(AbstractRoiHolder, QMainWindow):
             self.set_axes()
 
     def set_axes(self):
-        if self._image_viewer.image_item.image is None:
+        if self._image_viewer.image_shape is None:
             return
         p1, p2 = self.app.geometry.phi_range
         r1, r2 = self.app.geometry.r_axis.min(), self.app.geometry.r_axis.max()
@@ -8,13 +8,16 @@ from PyQt5.QtGui import QColor
 from PyQt5.QtCore import QPointF
 
 from ..basic_widgets import (ConfirmButton, DrawRoiController,
-                             RoundedPushButton, PlotBC,
+                             RoundedPushButton, PlotBC, ProgressBar,
                              BlackToolBar, BasicInputParametersWidget)
 from ...app.app import App
+from ...app.profiles import SeriesPeaks, SeriesPeaksFinder, SeriesProfileLoader
 from ..tools import Icon
 from ..roi_widgets.abstract_roi_holder import AbstractRoiHolder
 from ..roi_widgets.roi_1d_widget import Roi1D
 from ..tools import show_error
+from ..workers import UpdateWorker
+from ..background_tasks import BackgroundTasks
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,7 @@ class RadialProfileWidget(AbstractRoiHolder, PlotBC):
         self._draw_roi = RadialDrawRoi(self.view_box, self)
         self._draw_roi.sigCreateRoi.connect(self.app.roi_dict.add_roi)
         self._draw_roi.sigMoveRoi.connect(self.app.roi_dict.move_roi)
+        self._draw_roi.sigMoveFinished.connect(lambda: self.app.roi_dict.finish_moves())
 
         self.register_key_patch()
 
@@ -52,6 +56,12 @@ class RadialProfileWidget(AbstractRoiHolder, PlotBC):
             'QLabel { color : white ; }')
         find_peaks_widget.clicked.connect(self.find_peaks)
         fit_toolbar.addWidget(find_peaks_widget)
+
+        find_folder_peaks_widget = ConfirmButton(Icon('folder'), text='Find peaks in all images of the folder?')
+        find_folder_peaks_widget.label_widget.setStyleSheet(
+            'QLabel { color : white ; }')
+        find_folder_peaks_widget.clicked.connect(self.find_peaks_in_folder)
+        fit_toolbar.addWidget(find_folder_peaks_widget)
         #
         # fit_peaks_widget = ConfirmButton(Icon('fit'), text='Fit selected peaks?')
         # fit_peaks_widget.label_widget.setStyleSheet(
@@ -80,12 +90,12 @@ class RadialProfileWidget(AbstractRoiHolder, PlotBC):
         fix_all = RoundedPushButton(icon=Icon('fix_all'), radius=120, background_color=QColor(0, 0, 0, 0))
         fix_all.setFixedWidth(60)
         fix_all.setFixedHeight(30)
-        fix_all.clicked.connect(self.app.roi_dict.fix_all)
+        fix_all.clicked.connect(lambda: self.app.roi_dict.fix_all())
         segments_toolbar.addWidget(fix_all)
         unfix_all = RoundedPushButton(icon=Icon('unfix_all'), radius=120, background_color=QColor(0, 0, 0, 0))
         unfix_all.setFixedWidth(60)
         unfix_all.setFixedHeight(30)
-        unfix_all.clicked.connect(self.app.roi_dict.unfix_all)
+        unfix_all.clicked.connect(lambda: self.app.roi_dict.unfix_all())
         segments_toolbar.addWidget(unfix_all)
 
     # def _on_scale_changed(self):
@@ -113,6 +123,36 @@ class RadialProfileWidget(AbstractRoiHolder, PlotBC):
         for r in peaks:
             self._roi_dict.create_roi(radius=self.x[r], width=w)
 
+    def find_peaks_in_folder(self):
+        image_key = self.app.image_holder.current_key
+        if not image_key or not image_key.parent:
+            return
+        image_keys = list(image_key.parent.image_children)
+        params = self._fit_params_dict
+
+        finder = SeriesPeaksFinder(
+            SeriesProfileLoader(self.app.fm, self.app.image_holder),
+            sigma=params.get('sigma_find', None) or self.profile.sigma,
+            max_peaks_number=params.get('max_peaks_number', 40),
+            max_shift=params.get('max_shift', None) or params.get('init_width', 30) / 2,
+        )
+
+        progress_bar = ProgressBar(len(image_keys), 'Finding peaks in the folder...', 'Finished!',
+                                   parent=self, auto_close=True, show=True)
+        worker = UpdateWorker(finder.find, image_keys)
+        worker.signals.sigSetMax.connect(progress_bar.set_max)
+        worker.signals.sigSetProgress.connect(progress_bar.set_progress)
+        worker.signals.finished.connect(progress_bar.finished)
+        worker.signals.result.connect(
+            lambda result, folder_key=image_key.parent: self._add_series_peaks(folder_key, result))
+        BackgroundTasks().tasks.add_worker(worker)
+
+    def _add_series_peaks(self, folder_key, series_peaks: SeriesPeaks):
+        if not len(series_peaks):
+            return
+        w = self._fit_params_dict.get('init_width', 30) * App().geometry.scale
+        self._roi_dict.add_roi_tracks(folder_key, series_peaks.roi_tracks(w))
+
     def _make_roi_widget(self, roi):
         roi_widget = Roi1D(roi)
         self.image_view.plot_item.addItem(roi_widget)
@@ -156,7 +196,12 @@ class PeaksSetupWindow(BasicInputParametersWidget):
                          'Default sigma value for gaussian smooth\n'
                          'applied before gaussian fitting of \n'
                          'found peaks. To use current lambda, \n'
-                         'leave empty.', True)
+                         'leave empty.', True),
+                       P('max_shift', 'Max peak shift between images', float,
+                         'Peaks of neighbouring images of a folder\n'
+                         'shifted by less than this radius difference\n'
+                         'are assigned to the same roi. To use a half\n'
+                         'of the peaks width, leave empty.', True)
                        )
 
     NAME = 'Fitting parameters'
@@ -2,5 +2,6 @@ from .rois_context_menu import RoiContextMenu
 from .roi_2d_rect_widget import Roi2DRect
 from .roi_1d_widget import Roi1D, Roi1DAngular
 from .roi_2d_ring_widget import Roi2DRing, BasicRoiRing
+from .rings_overlay import RingsOverlay, OverlayRing
 from .abstract_roi_widget import AbstractRoiWidget
 from .abstract_roi_holder import AbstractRoiHolder
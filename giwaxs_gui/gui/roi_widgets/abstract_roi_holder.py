@@ -75,6 +75,9 @@ class AbstractRoiHolder(object):
             lambda k: self._roi_dict.move_roi(k, self._name))
         roi_widget.sigSelected.connect(self._roi_dict.select)
         roi_widget.sigShiftSelected.connect(self._roi_dict.shift_select)
+        move_finished = getattr(roi_widget, 'sigRegionChangeFinished', None)
+        if move_finished is not None:
+            move_finished.connect(lambda *args: self._roi_dict.finish_moves())
 
     def _update_select(self, keys: tuple):
         for key in keys:
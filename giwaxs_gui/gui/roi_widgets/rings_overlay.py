@@ -0,0 +1,129 @@
+from typing import Dict, List, Tuple
+
+from PyQt5.QtCore import Qt, QRectF
+from PyQt5.QtGui import QPen, QColor
+
+from pyqtgraph import GraphicsObject, mkPen
+
+from ...app import Roi
+from .abstract_roi_widget import AbstractRoiWidget
+
+# (rect, start angle, span angle), angles in 1/16 degrees
+Arc = Tuple[QRectF, int, int]
+
+
+class RingsOverlay(GraphicsObject):
+    """
+    Draws many ring rois as a single graphics item. The arcs of the rings are grouped
+    by color and pen style and cached, so that the pen is set once per group, and the
+    geometry is rebuilt only when the rings are changed.
+    """
+
+    PEN_WIDTH: int = 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # key -> (radius, width, angle, angle_std)
+        self._rings: Dict[int, Tuple[float, float, float, float]] = {}
+        self._colors: Dict[int, int] = {}
+        self._arcs: List[Tuple[QPen, List[Arc]]] or None = None
+        self._max_radius: float or None = 0
+
+    def __len__(self):
+        return len(self._rings)
+
+    def __contains__(self, key: int):
+        return key in self._rings
+
+    def set_ring(self, key: int, radius: float, width: float, angle: float or None, angle_std: float or None):
+        self._rings[key] = (radius, width, angle, angle_std)
+        self._invalidate()
+
+    def set_color(self, key: int, color: QColor):
+        rgba = color.rgba()
+        if self._colors.get(key) != rgba:
+            self._colors[key] = rgba
+            self._invalidate()
+
+    def remove_ring(self, key: int):
+        if self._rings.pop(key, None) is not None:
+            self._colors.pop(key, None)
+            self._invalidate()
+
+    def clear(self):
+        self._rings.clear()
+        self._colors.clear()
+        self._invalidate()
+
+    def _invalidate(self):
+        self._arcs = None
+        self.prepareGeometryChange()
+        self._max_radius = None
+        self.update()
+
+    def boundingRect(self) -> QRectF:
+        if self._max_radius is None:
+            self._max_radius = max((r + abs(w) / 2 for r, w, *_ in self._rings.values()), default=0)
+        r = self._max_radius
+        return QRectF(-r, -r, 2 * r, 2 * r)
+
+    def paint(self, p, *args):
+        if self._arcs is None:
+            self._arcs = self._build_arcs()
+        for pen, arcs in self._arcs:
+            p.setPen(pen)
+            for rect, start, span in arcs:
+                p.drawArc(rect, start, span)
+
+    def _build_arcs(self) -> List[Tuple[QPen, List[Arc]]]:
+        # arcs are drawn directly: stroking a single path with a wide pen is much slower
+        groups: Dict[int, Tuple[List[Arc], List[Arc]]] = {}
+
+        for key, (radius, width, angle, angle_std) in self._rings.items():
+            rgba = self._colors.get(key, 0)
+            if rgba not in groups:
+                groups[rgba] = [], []
+            solid, dashed = groups[rgba]
+
+            start = int((- (angle or 0) - (angle_std or 360) / 2) * 16)
+            span = int((angle_std or 360) * 16)
+
+            solid.append((_circle_rect(radius + width / 2), start, span))
+            solid.append((_circle_rect(max(radius - width / 2, 0)), start, span))
+            dashed.append((_circle_rect(radius), start, span))
+
+        arcs = []
+
+        for rgba, (solid, dashed) in groups.items():
+            pen = mkPen(color=QColor.fromRgba(rgba), width=self.PEN_WIDTH)
+            dash_pen = QPen(pen)
+            dash_pen.setStyle(Qt.DashLine)
+            arcs.append((pen, solid))
+            arcs.append((dash_pen, dashed))
+        return arcs
+
+
+def _circle_rect(radius: float) -> QRectF:
+    return QRectF(-radius, -radius, 2 * radius, 2 * radius)
+
+
+class OverlayRing(AbstractRoiWidget):
+    """Non-interactive ring roi drawn by the shared RingsOverlay item."""
+
+    def __init__(self, roi: Roi, overlay: RingsOverlay):
+        AbstractRoiWidget.__init__(self, roi)
+        self._overlay = overlay
+        self.update_roi()
+
+    def move_roi(self):
+        roi = self.roi
+        self._overlay.set_ring(roi.key, roi.radius, roi.width, roi.angle, roi.angle_std)
+
+    def send_move(self):
+        pass
+
+    def set_color(self, color):
+        self._overlay.set_color(self.roi.key, color)
+
+    def remove(self):
+        self._overlay.remove_ring(self.roi.key)
@@ -51,29 +51,29 @@ class RoiContextMenu(AbstractRoiContextMenu):
             fix_action.triggered.connect(lambda: self.roi_dict.unfix_roi(self.key))
 
         fix_selected = fix_menu.addAction('Fix selected roi')
-        fix_selected.triggered.connect(self.roi_dict.fix_selected)
+        fix_selected.triggered.connect(lambda: self.roi_dict.fix_selected())
         unfix_selected = fix_menu.addAction('Unfix selected roi')
-        unfix_selected.triggered.connect(self.roi_dict.unfix_selected)
+        unfix_selected.triggered.connect(lambda: self.roi_dict.unfix_selected())
 
         fix_all = fix_menu.addAction('Fix all roi')
-        fix_all.triggered.connect(self.roi_dict.fix_all)
+        fix_all.triggered.connect(lambda: self.roi_dict.fix_all())
 
         unfix_all = fix_menu.addAction('Unix all roi')
-        unfix_all.triggered.connect(self.roi_dict.unfix_all)
+        unfix_all.triggered.connect(lambda: self.roi_dict.unfix_all())
 
     def _init_delete_menu(self):
         delete_menu = self.addMenu('Delete')
         delete_self = delete_menu.addAction('Delete this roi')
         delete_self.triggered.connect(lambda: self.roi_dict.delete_roi(self.key))
         delete_selected = delete_menu.addAction('Delete selected')
-        delete_selected.triggered.connect(self.roi_dict.delete_selected_roi)
+        delete_selected.triggered.connect(lambda: self.roi_dict.delete_selected_roi())
 
     def _init_select_menu(self):
         select_menu = self.addMenu('Select')
         select_all = select_menu.addAction('Select all')
-        select_all.triggered.connect(self.roi_dict.select_all)
+        select_all.triggered.connect(lambda: self.roi_dict.select_all())
         unselect_all = select_menu.addAction('Unselect all')
-        unselect_all.triggered.connect(self.roi_dict.unselect_all)
+        unselect_all.triggered.connect(lambda: self.roi_dict.unselect_all())
 
     def _init_rename_menu(self):
         rename = self.addMenu('Rename')
@@ -131,5 +131,8 @@ class RoiContextMenu(AbstractRoiContextMenu):
         copy_menu.addAction('Copy roi', lambda: self.roi_dict.copy_rois(self.roi.key))
         copy_menu.addAction('Copy selected rois', lambda: self.roi_dict.copy_rois('selected'))
         copy_menu.addAction('Copy all rois', lambda: self.roi_dict.copy_rois('all'))
+        copy_menu.addAction('Apply selected rois to all images in the folder',
+                            lambda: self.roi_dict.apply_rois_to_folder(self.roi_dict.selected_rois))
         if self.roi_dict.is_copied:
             copy_menu.addAction('Paste rois', lambda: self.roi_dict.paste_rois())
+            copy_menu.addAction('Paste rois to all images in the folder', lambda: self.roi_dict.paste_rois_to_folder())
@@ -138,7 +138,8 @@ _PATH_MODE_DICT: Dict[tuple, PathLineModes] = {
 
 
 def _get_path_line_mode(save_format: SaveFormats, save_mode: SaveMode):
-    if save_format.value in (SaveFormats.object_detection.value, SaveFormats.h5_project.value):
+    if save_format.value in (SaveFormats.object_detection.value, SaveFormats.chunked_dataset.value,
+                             SaveFormats.h5_project.value):
         sf = SaveFormats.h5.value
     else:
         sf = save_format.value
@@ -34,6 +34,7 @@ class OptionsWidget(QWidget):
                 self.text_options.setHidden(False)
             elif save_format.value in (
                     SaveFormats.object_detection.value,
+                    SaveFormats.chunked_dataset.value,
                     SaveFormats.h5_project.value,
             ):
                 self.bool_options.setDisabled(True)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+from typing import Callable
+
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot, Qt, QTimer
+
+from ..app.signals import BoundSignal
+
+__all__ = ['QtSignalBridge', 'QtDispatcher', 'connect_qt', 'qt_scheduler']
+
+
+class QtSignalBridge(QObject):
+    """
+    Forwards an app signal (app.signals.Signal) to a Qt signal, so that
+    the slots are called by the Qt event loop in the thread of the bridge
+    and are disconnected automatically when the receivers are deleted.
+    """
+
+    sigEmitted = pyqtSignal(tuple)
+
+    def __init__(self, signal: BoundSignal, parent: QObject = None):
+        super().__init__(parent)
+        self._signal = signal
+        self._signal.connect(self._forward)
+
+    def _forward(self, *args):
+        try:
+            self.sigEmitted.emit(args)
+        except RuntimeError:
+            # the bridge is deleted by Qt
+            self._signal.disconnect(self._forward)
+
+    def connect(self, slot: Callable, connection_type: Qt.ConnectionType = Qt.AutoConnection):
+        self.sigEmitted.connect(lambda args: slot(*args), connection_type)
+
+    def close(self):
+        try:
+            self._signal.disconnect(self._forward)
+        except TypeError:
+            pass
+
+
+class QtDispatcher(QObject):
+    """
+    Dispatcher for app.image_loader: calls functions by the Qt event loop
+    in the thread of the dispatcher; can be called from any thread.
+    """
+
+    _sigCall = pyqtSignal(object)
+
+    def __init__(self, parent: QObject = None):
+        super().__init__(parent)
+        self._sigCall.connect(self._call, Qt.QueuedConnection)
+
+    def __call__(self, func: Callable[[], None]):
+        self._sigCall.emit(func)
+
+    @pyqtSlot(object)
+    def _call(self, func: Callable[[], None]):
+        func()
+
+
+def connect_qt(signal: BoundSignal, slot: Callable, receiver: QObject,
+               connection_type: Qt.ConnectionType = Qt.QueuedConnection) -> QtSignalBridge:
+    """
+    Connects an app signal to a slot of a QObject through the Qt event loop.
+    The bridge is owned by the receiver and is deleted together with it.
+    """
+    bridge = QtSignalBridge(signal, receiver)
+    bridge.connect(slot, connection_type)
+    return bridge
+
+
+def qt_scheduler(delay: float, callback: Callable[[], None]) -> None:
+    """Scheduler for app.throttle.EventCoalescer: calls callback by the Qt event loop after delay (seconds)."""
+    QTimer.singleShot(max(int(delay * 1000), 0), callback)
@@ -13,7 +13,7 @@ from ..basic_widgets.progress_bar import ProgressBar
 from ..background_tasks import BackgroundTasks
 
 from ...app.app import App
-from ...app.utils import UpdateWorker
+from ..workers import UpdateWorker
 from ...app.structures import CrystalsDatabase, CustomCrystal
 
 logger = logging.getLogger(__name__)
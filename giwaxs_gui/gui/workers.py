@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import logging
+import sys
+import traceback
+
+from PyQt5.QtCore import QObject, pyqtSlot, pyqtSignal, QRunnable
+
+
+class WorkerSignals(QObject):
+    finished = pyqtSignal()
+    error = pyqtSignal(tuple)
+    result = pyqtSignal(object)
+
+
+class Worker(QRunnable):
+    log = logging.getLogger(__name__)
+
+    def __init__(self, fn, *args, signals: WorkerSignals = None, **kwargs):
+        super(Worker, self).__init__()
+
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = signals or WorkerSignals()
+
+    def call_func(self):
+        return self.fn(*self.args, **self.kwargs)
+
+    @pyqtSlot()
+    def run(self):
+
+        try:
+            result = self.call_func()
+        except Exception as err:
+            self.log.exception(err)
+            traceback.print_exc()
+            exctype, value = sys.exc_info()[:2]
+            try:
+                self.signals.error.emit((exctype, value, traceback.format_exc()))
+            except RuntimeError:
+                return
+        else:
+            try:
+                self.signals.result.emit(result)
+            except RuntimeError:
+                return
+        finally:
+            try:
+                self.signals.finished.emit()
+            except RuntimeError:
+                return
+
+
+class UpdateWorkerSignals(WorkerSignals):
+    sigSetMax = pyqtSignal(int)
+    sigSetProgress = pyqtSignal(int)
+
+
+class UpdateWorker(Worker):
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__(fn, *args, signals=UpdateWorkerSignals(), **kwargs)
+
+    def call_func(self):
+        return self.fn(*self.args, process_callback=self.signals.sigSetProgress.emit,
+                       set_max_callback=self.signals.sigSetMax.emit, **self.kwargs)
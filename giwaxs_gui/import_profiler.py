@@ -0,0 +1,96 @@
+import builtins
+import sys
+from collections import defaultdict
+from contextlib import contextmanager
+from importlib.util import resolve_name
+from time import perf_counter
+from typing import Dict, List, Tuple
+
+__all__ = ['ImportProfiler']
+
+
+class ImportProfiler(object):
+    """
+    Measures the time spent on importing modules (excluding the time of nested imports)
+    and the time of the named startup stages. Used by the --profile-startup flag.
+    """
+
+    def __init__(self):
+        self.modules: Dict[str, float] = {}
+        self.stages: List[Tuple[str, float]] = []
+        self._stack: List[float] = []
+        self._original_import = None
+        self._start: float = 0
+
+    def start(self):
+        if self._original_import:
+            return
+        self._original_import = builtins.__import__
+        builtins.__import__ = self._import
+        self._start = perf_counter()
+
+    def stop(self):
+        if not self._original_import:
+            return
+        builtins.__import__ = self._original_import
+        self._original_import = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    @contextmanager
+    def stage(self, name: str):
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.stages.append((name, perf_counter() - start))
+
+    @property
+    def total_import_time(self) -> float:
+        return sum(self.modules.values())
+
+    def packages(self, depth: int = 1) -> Dict[str, float]:
+        packages = defaultdict(float)
+        for name, t in self.modules.items():
+            packages['.'.join(name.split('.')[:depth])] += t
+        return dict(packages)
+
+    def report(self, num: int = 25) -> str:
+        lines = ['Startup stages:']
+        lines += [f'  {name:<40} {t * 1000:>9.1f} ms' for name, t in self.stages]
+
+        packages = self.packages(1)
+        packages.update({k: v for k, v in self.packages(3).items() if k.startswith('giwaxs_gui.')})
+        packages.pop('giwaxs_gui', None)
+
+        lines.append(f'Imports: {len(self.modules)} modules, {self.total_import_time * 1000:.1f} ms')
+        for name, t in sorted(packages.items(), key=lambda x: x[1], reverse=True)[:num]:
+            lines.append(f'  {name:<40} {t * 1000:>9.1f} ms')
+        return '\n'.join(lines)
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        modules_num = len(sys.modules)
+        self._stack.append(0.)
+        start = perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = perf_counter() - start
+            nested = self._stack.pop()
+            if len(sys.modules) > modules_num:
+                self._add_module(name, globals, level, elapsed - nested)
+                if self._stack:
+                    self._stack[-1] += elapsed
+
+    def _add_module(self, name: str, globals: dict or None, level: int, t: float):
+        if level:
+            try:
+                name = resolve_name('.' * level + name, (globals or {}).get('__package__'))
+            except (ImportError, ValueError):
+                pass
+        self.modules[name] = self.modules.get(name, 0) + t
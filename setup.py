@@ -38,7 +38,8 @@ setup(
             'giwaxs_gui = giwaxs_gui:main',
         ],
         'console_scripts': [
-            'giwaxs_gui_update = giwaxs_gui.app.update:giwaxs_gui_update'],
+            'giwaxs_gui_update = giwaxs_gui.app.update:giwaxs_gui_update',
+            'giwaxs_gui_process = giwaxs_gui.app.pipeline:giwaxs_gui_process'],
     },
     install_requires=[
         'numpy>=1.18.1',
@@ -0,0 +1,59 @@
+"""
+Benchmarks of the analysis hot paths.
+
+    python -m tests.benchmarks run [-k pattern] [--sizes small medium]
+    python -m tests.benchmarks save       # store the results as the baselines
+    python -m tests.benchmarks check      # fail if slower than baselines * threshold or without baselines
+                                          # (--allow-missing to only report benchmarks without baselines)
+"""
+import sys
+from argparse import ArgumentParser
+from pathlib import Path
+
+from .runner import (run_benchmarks, compare, load_baselines, save_baselines,
+                     SIZES, BASELINES_PATH, Timing)
+
+
+def _print_timing(key: str, timing: Timing):
+    print(f'{key:<40} {timing.median * 1e3:>10.3f} ms  (min {timing.min * 1e3:.3f} ms, '
+          f'{timing.number} x {timing.repeat})', flush=True)
+
+
+def main(args=None) -> int:
+    parser = ArgumentParser(prog='python -m tests.benchmarks', description='GIWAXS GUI benchmarks')
+    parser.add_argument('command', choices=('run', 'save', 'check'))
+    parser.add_argument('-k', '--pattern', default='*', help='glob pattern of benchmark names')
+    parser.add_argument('--sizes', nargs='+', choices=tuple(SIZES), default=tuple(SIZES))
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--baselines', type=Path, default=BASELINES_PATH)
+    parser.add_argument('--threshold', type=float, default=2.,
+                        help='max allowed ratio of the current and the baseline times')
+    parser.add_argument('--allow-missing', action='store_true',
+                        help='check does not fail for benchmarks without baselines')
+    args = parser.parse_args(args)
+
+    results = run_benchmarks(args.pattern, tuple(args.sizes), args.repeat, callback=_print_timing)
+
+    if args.command == 'save':
+        save_baselines(results, args.baselines)
+        print(f'{len(results)} baselines saved to {args.baselines}')
+
+    elif args.command == 'check':
+        baselines = load_baselines(args.baselines)
+        missing = [key for key in results if key not in baselines]
+        regressions = compare(results, baselines, args.threshold)
+
+        if missing:
+            print(f'No baselines for: {", ".join(missing)}')
+        for r in regressions:
+            print(f'REGRESSION {r.key}: {r.current * 1e3:.3f} ms vs {r.baseline * 1e3:.3f} ms '
+                  f'({r.ratio:.2f}x > {args.threshold}x)')
+        if regressions or (missing and not args.allow_missing):
+            return 1
+        print(f'{len(results) - len(missing)} benchmarks within {args.threshold}x of the baselines')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
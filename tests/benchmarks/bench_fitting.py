@@ -0,0 +1,33 @@
+from giwaxs_gui.app.fitting import FitObject
+from giwaxs_gui.app.polar_image import PolarImage
+from giwaxs_gui.app.rois import Roi
+
+from .runner import benchmark
+from .frames import synthetic_frame, synthetic_geometry, ring_radii
+
+
+@benchmark()
+def do_fit(shape):
+    geometry = synthetic_geometry(shape)
+    polar_image = PolarImage.calc_polar_image(synthetic_frame(shape), *geometry.polar_grids)
+    fit_object = FitObject(None, polar_image, geometry.r_axis, geometry.phi_axis)
+    fit = fit_object.new_fit(Roi(radius=float(ring_radii(shape)[3]), width=shape[0] / 50, key=0))
+    init_params = list(fit.init_params)
+
+    def fit_once():
+        fit.init_params = list(init_params)
+        fit.do_fit()
+
+    return fit_once
+
+
+@benchmark(sizes=('small',))
+def get_crystal_rings(shape):
+    # crystals and periodictable are heavy, they are imported on first use
+    from crystals import Crystal
+    from giwaxs_gui.app.structures.custom_crystal import CustomCrystal
+    from giwaxs_gui.app.structures.get_ring_list import get_crystal_rings
+
+    crystal = CustomCrystal.from_crystal(Crystal.from_database('C'))
+    return lambda: get_crystal_rings(crystal, q_max=4, max_num=4)
+
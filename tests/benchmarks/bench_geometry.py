@@ -0,0 +1,49 @@
+import pickle
+
+from giwaxs_gui.app.geometry import Geometry, _get_ranges, _polar_grids_cache
+from giwaxs_gui.app.polar_image import PolarImage
+
+from .runner import benchmark
+from .frames import synthetic_frame, synthetic_geometry, beam_center
+
+
+@benchmark()
+def geometry_update(shape):
+    params = dict(shape=shape, beam_center=beam_center(shape), polar_shape=(shape[0] // 2, shape[1] // 2))
+
+    def update():
+        _get_ranges.cache_clear()
+        _polar_grids_cache.clear()
+        return Geometry(**params).polar_grids
+
+    return update
+
+
+@benchmark()
+def geometry_load(shape):
+    # a stored per-image geometry sharing the grids of the already loaded one
+    geometry = synthetic_geometry(shape)
+    geometry.polar_grids
+    data = pickle.dumps(geometry)
+
+    def load():
+        # the loaded geometry is alive while the others are loaded
+        assert geometry.is_available
+        return pickle.loads(data).polar_grids
+
+    return load
+
+
+@benchmark()
+def calc_polar_image(shape):
+    image = synthetic_frame(shape)
+    yy, zz = synthetic_geometry(shape).polar_grids
+    return lambda: PolarImage.calc_polar_image(image, yy, zz)
+
+
+@benchmark()
+def remap_rotated(shape):
+    geometry = Geometry(shape=shape, beam_center=beam_center(shape),
+                        polar_shape=(shape[0] // 2, shape[1] // 2), t_key='3142')
+    image = synthetic_frame(shape)
+    return lambda: PolarImage.remap(image, geometry)
@@ -0,0 +1,74 @@
+import atexit
+from pathlib import Path
+
+import numpy as np
+
+from giwaxs_gui.app.data_manager.save_h5 import SaveH5
+from giwaxs_gui.app.data_manager.saving_parameters import SavingParameters
+from giwaxs_gui.app.rois import RoiData
+
+from .runner import benchmark
+from .frames import SyntheticProject, synthetic_rois
+
+_PROJECTS = {}
+
+
+@atexit.register
+def _close_projects():
+    for project in _PROJECTS.values():
+        project.close()
+
+
+def _project(shape) -> SyntheticProject:
+    if shape not in _PROJECTS:
+        _PROJECTS[shape] = SyntheticProject(shape)
+    return _PROJECTS[shape]
+
+
+@benchmark()
+def read_image_file(shape):
+    project = _project(shape)
+    image_key = project.image_keys[0]
+    return lambda: project.fm.images[image_key]
+
+
+@benchmark()
+def read_image_file_float32(shape):
+    # mapped files are read on access
+    project = _project(shape)
+    image_key = project.image_keys[0]
+    return lambda: np.array(project.fm.images[image_key], dtype=np.float32)
+
+
+@benchmark()
+def read_image_stored(shape):
+    project = _project(shape)
+    image_key = project.image_keys[1]
+    project.fm.images[image_key] = project.fm.images[image_key]
+    return lambda: project.fm.images[image_key]
+
+
+@benchmark()
+def save_h5(shape):
+    project = _project(shape)
+    path: Path = project.path / 'saved.h5'
+    params = SavingParameters({project.folder_key: project.image_keys}, path, save_polar_image=True)
+    save_h5 = SaveH5(project.fm, project.image_holder)
+
+    def save():
+        path.unlink(missing_ok=True)
+        save_h5.save(params)
+
+    return save
+
+
+@benchmark()
+def roi_data_to_dict(shape):
+    roi_data = synthetic_rois(shape[0] // 4)
+    return roi_data.to_dict
+
+
+@benchmark()
+def roi_data_from_dict(shape):
+    arr_dict = synthetic_rois(shape[0] // 4).to_dict()
+    return lambda: RoiData.from_dict(arr_dict)
@@ -0,0 +1,32 @@
+from giwaxs_gui.app.polar_image import PolarImage
+from giwaxs_gui.app.rois import Roi
+from giwaxs_gui.app.utils import baseline_correction
+
+from .runner import benchmark
+from .frames import synthetic_frame, synthetic_geometry, ring_radii
+
+
+def _polar_image(shape) -> PolarImage:
+    geometry = synthetic_geometry(shape)
+    polar = PolarImage()
+    polar.update(geometry, synthetic_frame(shape))
+    return polar
+
+
+@benchmark()
+def radial_profile(shape):
+    return _polar_image(shape).get_radial_profile
+
+
+@benchmark()
+def angular_profile(shape):
+    geometry = synthetic_geometry(shape)
+    polar = _polar_image(shape)
+    roi = Roi(radius=float(ring_radii(shape)[3]), width=shape[0] / 100)
+    return lambda: polar.get_angular_profile(geometry, roi)
+
+
+@benchmark('baseline_correction')
+def asymmetric_least_squares(shape):
+    profile = _polar_image(shape).get_radial_profile()
+    return lambda: baseline_correction(profile, 1e5, 0.01)
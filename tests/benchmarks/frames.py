@@ -0,0 +1,85 @@
+"""Synthetic GIWAXS frames and projects for the benchmarks."""
+import tempfile
+from pathlib import Path
+from typing import Tuple, List
+
+import numpy as np
+from PIL import Image
+
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.geometry_holder import GeometryHolder
+from giwaxs_gui.app.image_holder import ImageHolder
+from giwaxs_gui.app.file_manager import FileManager, ImageKey
+from giwaxs_gui.app.rois import Roi, RoiData
+from giwaxs_gui.app.rois.roi_dict import RoiDict
+
+
+def beam_center(shape: Tuple[int, int]) -> Tuple[float, float]:
+    # grazing incidence: the beam is close to the bottom edge of the detector
+    return shape[0] * 0.95, shape[1] * 0.5
+
+
+def ring_radii(shape: Tuple[int, int], num: int = 10) -> np.ndarray:
+    return np.linspace(0.1, 0.8, num) * min(shape)
+
+
+def synthetic_frame(shape: Tuple[int, int], num_rings: int = 10, seed: int = 0) -> np.ndarray:
+    """Poisson noise of textured gaussian rings over a decaying background."""
+    rng = np.random.default_rng(seed)
+    zc, yc = beam_center(shape)
+    zz, yy = np.ogrid[:shape[0], :shape[1]]
+    rr = np.hypot(zz - zc, yy - yc)
+    phi = np.arctan2(zc - zz, yy - yc)
+
+    intensity = 200 / (1 + rr / 100)
+    for radius in ring_radii(shape, num_rings):
+        width = rng.uniform(0.005, 0.01) * min(shape)
+        texture = 1 + rng.uniform(0, 3) * np.cos(phi - rng.uniform(0, np.pi)) ** 2
+        intensity = intensity + rng.uniform(50, 500) * texture * np.exp(- (rr - radius) ** 2 / 2 / width ** 2)
+
+    return rng.poisson(intensity).astype(np.float32)
+
+
+def synthetic_geometry(shape: Tuple[int, int]) -> Geometry:
+    return Geometry(shape=shape, beam_center=beam_center(shape), polar_shape=(shape[0] // 2, shape[1] // 2))
+
+
+def synthetic_rois(num: int, seed: int = 0) -> RoiData:
+    rng = np.random.default_rng(seed)
+    return RoiData([Roi(radius=float(r), width=float(w), angle=float(a), angle_std=float(s), key=i)
+                    for i, (r, w, a, s) in enumerate(zip(rng.uniform(10, 500, num), rng.uniform(1, 10, num),
+                                                         rng.uniform(0, 90, num), rng.uniform(5, 180, num)))])
+
+
+class SyntheticProject(object):
+    """Project with synthetic tiff frames in a temporary folder."""
+
+    def __init__(self, shape: Tuple[int, int], num: int = 4):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.path = path = Path(self._tmp.name)
+        images_path = path / 'images'
+        images_path.mkdir()
+
+        for i in range(num):
+            Image.fromarray(synthetic_frame(shape, seed=i)).save(images_path / f'frame_{i:03}.tiff')
+
+        self.fm = FileManager(path / 'config')
+        self.fm.open_project(path / 'project')
+        self.fm.add_root_path_to_project(images_path)
+        self.folder_key = next(iter(self.fm.root.folder_children))
+        self.folder_key.update()
+        self.g_holder = GeometryHolder(self.fm)
+        self.roi_dict = RoiDict(self.fm, self.g_holder)
+        self.image_holder = ImageHolder(self.fm, self.g_holder, self.roi_dict)
+
+        self.fm.geometries.default[self.folder_key] = synthetic_geometry(shape)
+        for i, image_key in enumerate(self.image_keys):
+            self.fm.rois_data[image_key] = synthetic_rois(20, seed=i)
+
+    @property
+    def image_keys(self) -> List[ImageKey]:
+        return list(self.folder_key.image_children)
+
+    def close(self):
+        self.fm.close_project()
+        self._tmp.cleanup()
@@ -0,0 +1,139 @@
+"""
+Minimal asv style benchmark runner.
+
+Benchmarks are registered by the @benchmark decorator in the bench_*.py modules
+of this package. A benchmark is a setup function that receives the frame shape
+and returns the callable to time; every callable is timed for each frame size,
+and the best times (the least disturbed by other processes) are compared
+with the stored baselines.
+"""
+import json
+import time
+import platform
+import importlib
+import pkgutil
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple
+
+import numpy as np
+
+__all__ = ['benchmark', 'run_benchmarks', 'compare', 'load_baselines', 'save_baselines',
+           'BENCHMARKS', 'SIZES', 'BASELINES_PATH', 'Timing', 'Regression']
+
+SIZES: Dict[str, Tuple[int, int]] = {
+    'small': (512, 512),
+    'medium': (1024, 1024),
+    'large': (2048, 2048),
+}
+
+BASELINES_PATH: Path = Path(__file__).parent / 'baselines.json'
+
+
+class Benchmark(NamedTuple):
+    name: str
+    setup: Callable[[Tuple[int, int]], Callable[[], object]]
+    sizes: Tuple[str, ...]
+
+
+class Timing(NamedTuple):
+    median: float
+    min: float
+    number: int
+    repeat: int
+
+
+class Regression(NamedTuple):
+    key: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+BENCHMARKS: Dict[str, Benchmark] = {}
+
+
+def benchmark(name: str = None, sizes: Tuple[str, ...] = tuple(SIZES)):
+    def wrapper(setup):
+        bench_name = name or setup.__name__
+        BENCHMARKS[bench_name] = Benchmark(bench_name, setup, tuple(sizes))
+        return setup
+
+    return wrapper
+
+
+def load_modules():
+    for module in pkgutil.iter_modules([str(Path(__file__).parent)]):
+        if module.name.startswith('bench_'):
+            importlib.import_module(f'{__package__}.{module.name}')
+
+
+def time_call(func: Callable[[], object], repeat: int = 5, min_time: float = 0.05) -> Timing:
+    """Times func as timeit does: the number of calls per repeat is chosen to take at least min_time."""
+    number = 1
+
+    while True:
+        elapsed = _time_calls(func, number)
+        if elapsed >= min_time or number >= 10 ** 6:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    times = [elapsed / number] + [_time_calls(func, number) / number for _ in range(repeat - 1)]
+    return Timing(float(np.median(times)), min(times), number, repeat)
+
+
+def _time_calls(func: Callable[[], object], number: int) -> float:
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def run_benchmarks(pattern: str = '*', sizes: Tuple[str, ...] = tuple(SIZES), repeat: int = 5,
+                   callback: Callable[[str, Timing], None] = None) -> Dict[str, Timing]:
+    load_modules()
+    results = {}
+
+    for bench in BENCHMARKS.values():
+        if not fnmatch(bench.name, pattern):
+            continue
+        for size in bench.sizes:
+            if size not in sizes:
+                continue
+            key = f'{bench.name}[{size}]'
+            timing = time_call(bench.setup(SIZES[size]), repeat)
+            results[key] = timing
+            if callback:
+                callback(key, timing)
+    return results
+
+
+def compare(results: Dict[str, Timing], baselines: Dict[str, float], threshold: float) -> List[Regression]:
+    """Benchmarks that are more than threshold times slower than the baselines."""
+    return [
+        Regression(key, baselines[key], timing.min)
+        for key, timing in results.items()
+        if key in baselines and timing.min > baselines[key] * threshold
+    ]
+
+
+def load_baselines(path: Path = BASELINES_PATH) -> Dict[str, float]:
+    if not path.is_file():
+        return {}
+    return json.loads(path.read_text())['benchmarks']
+
+
+def save_baselines(results: Dict[str, Timing], path: Path = BASELINES_PATH, update: bool = True):
+    """Saves the best times of the results; other stored baselines are kept if update is True."""
+    baselines = load_baselines(path) if update else {}
+    baselines.update({key: timing.min for key, timing in results.items()})
+
+    data = dict(
+        machine=dict(platform=platform.platform(), processor=platform.processor(),
+                     python=platform.python_version(), numpy=np.__version__),
+        benchmarks=dict(sorted(baselines.items())),
+    )
+    path.write_text(json.dumps(data, indent=2))
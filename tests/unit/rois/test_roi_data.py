@@ -0,0 +1,114 @@
+import pickle
+from copy import deepcopy
+
+import numpy as np
+
+from giwaxs_gui.app.rois import Roi, RoiData, RoiTypes
+from giwaxs_gui.app.rois.roi_data import copy_rois
+
+
+def _roi_data(num: int = 5) -> RoiData:
+    return RoiData([Roi(radius=10. * (i + 1), width=2., key=i, name=str(i)) for i in range(num)])
+
+
+def test_rois_are_table_views():
+    roi_data = _roi_data()
+    roi = roi_data[2]
+    assert roi.is_bound
+    roi.radius = 33.
+    assert roi_data.table['radius'][roi_data.table['key'] == 2] == 33.
+
+    roi_data.on_scale_changed(2.)
+    assert roi.radius == 66.
+    assert roi.width == 4.
+
+
+def test_delete_and_add():
+    roi_data = _roi_data()
+    deleted = roi_data[1]
+    roi_data.delete_roi(1)
+    assert not deleted.is_bound
+    assert deleted.radius == 20.
+
+    assert [roi.radius for roi in roi_data.values()] == [10., 30., 40., 50.]
+    assert roi_data.to_array()[:, 0].tolist() == [10., 30., 40., 50.]
+
+    roi_data.add_roi(Roi(radius=60., width=1., key=10, active=True))
+    assert list(roi_data.selected_keys) == [10]
+    assert roi_data[10].radius == 60.
+
+
+def test_change_ring_bounds():
+    roi_data = _roi_data(3)
+    roi_data[0].type = RoiTypes.segment
+    keys = roi_data.change_ring_bounds((90, 180))
+    assert sorted(keys) == [1, 2]
+    assert roi_data[0].angle == 180
+    assert roi_data[2].angle_std == 180
+
+
+def test_dict_export():
+    roi_data = _roi_data()
+    roi_data[3].confidence_level = 0.5
+    loaded = RoiData.from_dict(roi_data.to_dict())
+    assert list(loaded.keys()) == list(roi_data.keys())
+    for k in roi_data.keys():
+        assert loaded[k].radius == roi_data[k].radius
+        assert loaded[k].type == roi_data[k].type
+        assert loaded[k].confidence_level == roi_data[k].confidence_level
+    assert np.allclose(loaded.confidence_levels, roi_data.confidence_levels)
+
+
+def test_h5_export_with_failed_fits(tmp_path):
+    from h5py import File
+    from giwaxs_gui.app.fitting import FittingType
+    from giwaxs_gui.app.file_manager.read_roi_data import _ReadRoiData
+
+    roi_data = _roi_data(3)
+    # the fit of the second roi failed
+    for i in (0, 2):
+        roi_data[i].fitted_parameters = {
+            'fitting_function': FittingType.gaussian, 'fitted_params': [1., 2., 3., 4., 5.],
+            'r_range': (1., 2.), 'peak height': float(i)}
+
+    with File(str(tmp_path / 'rois.h5'), 'w') as f:
+        _ReadRoiData.set_h5(f, None, roi_data)
+        fitted_params = f['roi_data']['fitted_params'][()]
+        loaded = _ReadRoiData.get_h5(f, None)
+
+    assert fitted_params.dtype == float and fitted_params.shape == (3, 5)
+    assert np.isnan(fitted_params[1]).all() and fitted_params[2, 4] == 5.
+    assert loaded[1].fitted_parameters is None
+    assert loaded[2].fitted_parameters['fitting_function'] == 'Gaussian'
+    assert loaded[2].fitted_parameters['peak height'] == 2.
+
+
+def test_copies():
+    roi_data = _roi_data()
+    for copied in (deepcopy(roi_data), pickle.loads(pickle.dumps(roi_data))):
+        assert copied == roi_data
+        copied[0].radius = 100.
+        assert roi_data[0].radius == 10.
+
+
+def test_bulk_operations():
+    template = _roi_data(3)
+    template[1].fitted_parameters = {'peak height': 1.}
+    template[2].active = True
+
+    roi_data = _roi_data(5)
+    to_select = roi_data.add_table(template.table, template.attributes())
+    assert len(roi_data) == 5 and to_select == [2]
+    assert roi_data[1].fitted_parameters == {'peak height': 1.}
+    assert roi_data[1].fitted_parameters is not template[1].fitted_parameters
+    assert roi_data[4].radius == 50.
+    assert list(roi_data.selected_keys) == [2]
+
+    assert sorted(roi_data.set_movable(False, only_selected=True)) == [2]
+    assert sorted(roi_data.set_movable(False)) == [0, 1, 3, 4]
+    assert not any(roi.movable for roi in roi_data.values())
+
+    copies = copy_rois(list(template.values()))
+    assert not any(roi.is_bound for roi in copies)
+    assert copies[1].fitted_parameters == template[1].fitted_parameters
+    assert copies[1].fitted_parameters is not template[1].fitted_parameters
@@ -0,0 +1,162 @@
+import pickle
+
+import numpy as np
+
+from giwaxs_gui.app.file_manager import FileManager
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.geometry_holder import GeometryHolder
+from giwaxs_gui.app.rois import Roi, RoiData, RoiDict
+from giwaxs_gui.app.rois.roi_index import RoiIndex
+from giwaxs_gui.app.rois.roi_meta_data import ImageKeysContainer
+
+
+class _ImageKey(object):
+    def __init__(self, idx: int):
+        self.idx = idx
+
+    def __hash__(self):
+        return hash(('image', self.idx))
+
+    def __eq__(self, other):
+        return self.idx == other.idx
+
+
+def _roi_data(image_idx: int) -> RoiData:
+    rois = [Roi(radius=10. + image_idx, width=1., key=0),
+            Roi(radius=20. + 2 * image_idx, width=1., key=1)]
+    rois[1].fitted_parameters = {'peak height': float(image_idx), 'fitting_function': 1}
+    return RoiData(rois)
+
+
+def test_roi_series():
+    index = RoiIndex()
+    for image_idx in (3, 0, 2, 1):
+        index.update_image(image_idx, _roi_data(image_idx))
+
+    assert len(index) == 8
+    image_indices, radii = index.get(1, 'radius')
+    assert image_indices.tolist() == [0, 1, 2, 3]
+    assert radii.tolist() == [20., 22., 24., 26.]
+    assert index.get(1, 'peak height')[1].tolist() == [0., 1., 2., 3.]
+    assert np.isnan(index.get(0, 'peak height')[1]).all()
+
+    index.update_image(2, RoiData([Roi(radius=5., width=1., key=0)]))
+    assert index.image_indices(1).tolist() == [0, 1, 3]
+    assert index.get(0)[1].tolist() == [10., 11., 5., 13.]
+    assert index.closest_image_idx(1, 2) in (1, 3)
+    assert index.closest_image_idx(1, 10) == 3
+
+    index.remove_image(0)
+    assert index.roi_keys().tolist() == [0, 1]
+    assert 2 not in index
+
+    index.update_images({0: RoiData([Roi(radius=1., width=1., key=2)]), 3: RoiData()})
+    assert index.roi_keys().tolist() == [0, 1, 2]
+    assert index.image_indices(1).tolist() == [1]
+    assert index.get(2)[1].tolist() == [1.]
+
+
+def test_closest_image_key():
+    keys = [_ImageKey(i) for i in (0, 4, 10)]
+    container = ImageKeysContainer(*keys)
+    assert container.closest(_ImageKey(4)) == keys[1]
+    assert container.closest(_ImageKey(3)) == keys[1]
+    assert container.closest(_ImageKey(8)) == keys[2]
+    assert container.closest(_ImageKey(20)) == keys[2]
+    container.remove(keys[1])
+    assert container.closest(_ImageKey(3)) == keys[0]
+
+
+def _make_project(tmp_path, num: int = 4):
+    folder = tmp_path / 'data'
+    folder.mkdir()
+    for i in range(num):
+        (folder / f'{i}.tif').touch()
+
+    fm = FileManager(tmp_path / 'config')
+    fm.open_project(tmp_path / 'project')
+    folder_key = fm.add_root_path_to_project(folder)
+    folder_key.update()
+    roi_dict = RoiDict(fm, GeometryHolder(fm))
+    roi_dict.change_folder(folder_key)
+    return fm, roi_dict, folder_key
+
+
+def _add_rois(roi_dict: RoiDict, folder_key):
+    for image_key in folder_key.image_children:
+        roi_dict.change_image(image_key)
+        # the same roi in all the images
+        roi_dict.add_roi(Roi(radius=10. + image_key.idx, width=1., key=0 if image_key.idx else None))
+        roi_dict.save_state()
+    # as FileManager.change_image, the folder is changed first
+    roi_dict.change_folder(None)
+    roi_dict.change_image(None)
+
+
+def test_remove_image_from_index(tmp_path):
+    fm, roi_dict, folder_key = _make_project(tmp_path)
+    _add_rois(roi_dict, folder_key)
+    image_keys = list(folder_key.image_children)
+
+    # the index of the stored meta data (folder is not opened)
+    fm.remove_key(image_keys[1])
+    meta_data = fm.rois_meta_data[folder_key]
+    assert meta_data.index.get(0)[1].tolist() == [10., 12., 13.]
+    assert meta_data.index.image_indices(0).tolist() == [0, 1, 2]
+    assert image_keys[1] not in set(meta_data[0])
+
+    # the index of the meta data of the opened folder, the current image is removed
+    roi_dict.change_folder(folder_key)
+    roi_dict.change_image(image_keys[3])
+    fm.remove_key(image_keys[3])
+    assert roi_dict.roi_series(0)[0].tolist() == [0, 1]
+    assert fm.rois_data[image_keys[3]] is None
+
+    roi_dict.change_image(image_keys[0])
+    roi_dict.change_folder(None)
+    assert fm.rois_meta_data[folder_key].index.get(0)[1].tolist() == [10., 12.]
+
+
+def test_index_is_rebuilt_for_old_meta_data(tmp_path):
+    fm, roi_dict, folder_key = _make_project(tmp_path, 3)
+    _add_rois(roi_dict, folder_key)
+
+    # meta data pickled before the index was introduced
+    meta_data = fm.rois_meta_data[folder_key]
+    del meta_data.index, meta_data.index_outdated
+    meta_data = pickle.loads(pickle.dumps(meta_data))
+    assert meta_data.index_outdated and not len(meta_data.index)
+    fm.rois_meta_data[folder_key] = meta_data
+
+    roi_dict.change_folder(folder_key)
+    assert roi_dict.roi_series(0)[1].tolist() == [10., 11., 12.]
+
+    roi_dict.change_image(next(folder_key.image_children))
+    roi_dict.change_folder(None)
+    assert not fm.rois_meta_data[folder_key].index_outdated
+
+
+def test_apply_rois_to_images(tmp_path):
+    fm, roi_dict, folder_key = _make_project(tmp_path, 3)
+    image_keys = list(folder_key.image_children)
+    geometry_holder = roi_dict._geometry_holder
+    fm.geometries[image_keys[0]] = Geometry(shape=(100, 100), beam_center=(50, 50))
+    fm.geometries[image_keys[1]] = Geometry(shape=(100, 100), beam_center=(0, 0))
+    geometry_holder.change_image(image_keys[0])
+    roi_dict.change_image(image_keys[0])
+
+    roi_dict.add_roi(Roi(radius=10., width=1.))
+    key = next(iter(roi_dict.keys()))
+    deleted = []
+    roi_dict.sig_roi_deleted.connect(deleted.append)
+
+    roi_dict.apply_rois_to_images([Roi(radius=20., width=1., key=key)], image_keys)
+
+    # the replaced roi of the current image is deleted from the views
+    assert deleted == [(key,)]
+    assert roi_dict[key].radius == 20.
+    # the ring angles are set by the geometry of each image
+    assert (roi_dict[key].angle, roi_dict[key].angle_std) == fm.geometries[image_keys[0]].ring_bounds
+    roi = fm.rois_data[image_keys[1]][key]
+    assert (roi.angle, roi.angle_std) == fm.geometries[image_keys[1]].ring_bounds
+    assert fm.geometries[image_keys[0]].ring_bounds != fm.geometries[image_keys[1]].ring_bounds
@@ -0,0 +1,61 @@
+import numpy as np
+from h5py import File
+
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.rois import Roi, RoiData
+from giwaxs_gui.app.data_manager.dataset_writer import (
+    DatasetSample, ChunkedDatasetWriter, get_boxes_n_labels, iter_samples
+)
+
+
+def _sample(idx: int, num_rois: int, shape=(8, 6)) -> DatasetSample:
+    return DatasetSample(
+        polar_image=np.full(shape, idx, dtype=np.float32),
+        boxes=np.full((num_rois, 4), idx, dtype=float),
+        labels=np.zeros(num_rois),
+        intensities=np.arange(num_rois, dtype=float),
+        confidence_levels=np.ones(num_rois),
+        file_key=f'key_{idx}',
+        path=f'path_{idx}',
+    )
+
+
+def test_boxes_n_labels():
+    geometry = Geometry(shape=(100, 120), beam_center=(10, 20))
+    roi_arr = RoiData([Roi(radius=10. * i, width=2., angle=30. * i, angle_std=10., key=i)
+                       for i in range(1, 4)]).to_array()
+    boxes, labels = get_boxes_n_labels(roi_arr, geometry)
+
+    for (r, w, a, a_s, *_), box in zip(roi_arr, boxes):
+        assert np.allclose(box, [geometry.r2p(r - w / 2), geometry.a2p(a - a_s / 2),
+                                 geometry.r2p(r + w / 2), geometry.a2p(a + a_s / 2)])
+    assert labels.tolist() == roi_arr[:, 5].tolist()
+    assert get_boxes_n_labels(np.array([]), geometry)[0].shape == (0, 4)
+
+
+def test_chunked_writer(tmp_path):
+    samples = list(iter_samples(lambda i: _sample(i, i % 3), range(10), workers=3))
+    assert [s.file_key for s in samples] == [f'key_{i}' for i in range(10)]
+
+    with File(str(tmp_path / 'dataset.h5'), 'a') as f:
+        writer = ChunkedDatasetWriter(f, compression='gzip', buffer_size=4)
+        for sample in samples[:7]:
+            writer.write(sample)
+        writer.write(_sample(100, 1, shape=(5, 5)))
+        writer.close()
+        assert writer.skipped == 1
+
+    with File(str(tmp_path / 'dataset.h5'), 'a') as f:
+        writer = ChunkedDatasetWriter(f)
+        for sample in samples[7:]:
+            writer.write(sample)
+        writer.close()
+
+    with File(str(tmp_path / 'dataset.h5'), 'r') as f:
+        assert f['polar_images'].shape == (10, 8, 6)
+        assert f['boxes'].shape == (sum(i % 3 for i in range(10)), 4)
+        for i, (start, stop) in enumerate(f['roi_slices'][()]):
+            assert np.all(f['polar_images'][i] == i)
+            assert stop - start == i % 3
+            assert np.all(f['boxes'][start:stop] == i)
+            assert f['file_keys'].asstr()[i] == f'key_{i}'
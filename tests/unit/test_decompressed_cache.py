@@ -0,0 +1,76 @@
+import gzip
+import os
+
+import numpy as np
+from read_edf import read_edf
+
+from giwaxs_gui.app.decompressed_cache import DecompressedCache
+from giwaxs_gui.app.read_image import read_image, set_decompressed_cache
+
+
+def _write_edf_gz(path, image: np.ndarray):
+    header = (f'{{\nDataType = SignedInteger ;\nDim_1 = {image.shape[1]} ;\n'
+              f'Dim_2 = {image.shape[0]} ;\nSize = {image.nbytes} ;\n')
+    with gzip.open(str(path), 'wb') as f:
+        f.write((header.ljust(510) + '}\n').encode() + image.astype(np.int32).tobytes())
+
+
+def test_read_cached(tmp_path):
+    paths = [tmp_path / f'{i}.edf.gz' for i in range(4)]
+    for i, path in enumerate(paths):
+        _write_edf_gz(path, np.full((30, 40), i))
+
+    cache = DecompressedCache(tmp_path / 'cache')
+    assert cache.warm(paths, workers=2) == 4
+    assert cache.get(paths[0]).name.endswith('.edf')
+
+    set_decompressed_cache(cache)
+    try:
+        image = read_image(paths[1])
+    finally:
+        set_decompressed_cache(None)
+
+    assert not image.flags.writeable
+    assert np.array_equal(image, read_edf(str(paths[1])))
+
+
+def test_lru_cleanup(tmp_path):
+    paths = [tmp_path / f'{i}.edf.gz' for i in range(3)]
+    for i, path in enumerate(paths):
+        _write_edf_gz(path, np.full((30, 40), i))
+
+    cache = DecompressedCache(tmp_path / 'cache')
+    cached = [cache.get(path) for path in paths]
+    for i, path in enumerate(cached):
+        os.utime(path, (i, i))
+    # access the oldest one
+    cache.get(paths[0])
+
+    cache.max_size = 2 * cached[0].stat().st_size
+    cache.cleanup()
+
+    assert cached[0].is_file() and not cached[1].is_file() and cached[2].is_file()
+    assert cache.size == cache.max_size
+
+
+def test_cleanup_to_low_watermark(tmp_path, monkeypatch):
+    paths = [tmp_path / f'{i}.edf.gz' for i in range(30)]
+    for i, path in enumerate(paths):
+        _write_edf_gz(path, np.full((30, 40), i))
+
+    cache = DecompressedCache(tmp_path / 'cache')
+    file_size = cache.get(paths[0]).stat().st_size
+    cache.clear()
+    cache.max_size = 10 * file_size
+
+    cleanups = []
+    cleanup = cache.cleanup
+    monkeypatch.setattr(cache, 'cleanup', lambda *args, **kwargs: cleanups.append(1) or cleanup(*args, **kwargs))
+
+    for path in paths:
+        cache.get(path)
+        assert cache.size <= cache.max_size
+
+    # the cache is reduced to 9 files, so that it is cleaned up every second new file
+    assert len(cleanups) == 10
+    assert cache.size == 10 * file_size
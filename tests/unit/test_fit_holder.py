@@ -0,0 +1,92 @@
+import numpy as np
+from scipy.ndimage import gaussian_filter1d
+
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.polar_image import PolarImage
+from giwaxs_gui.app.rois import Roi
+from giwaxs_gui.app.fitting import RangeStrategy
+from giwaxs_gui.app.fitting.fit_holder import FitHolder, _detrend_and_smooth
+from giwaxs_gui.app.fitting.functions import Gaussian
+from giwaxs_gui.app.fitting.background import LinearBackground
+
+
+class _ImageHolder(object):
+    def __init__(self, raw_image: np.ndarray = None):
+        self.raw_image = raw_image
+
+
+class _App(object):
+    def __init__(self, image: np.ndarray, geometry: Geometry, with_windows: bool):
+        self.geometry = geometry
+        self.polar_image = PolarImage.remap(image, geometry)
+        self.image_holder = _ImageHolder(image if with_windows else None)
+
+
+def _fit_holder(with_windows: bool = False) -> FitHolder:
+    # FitHolder.__init__ requires App
+    yy, xx = np.mgrid[:200, :200]
+    image = np.exp(-(np.hypot(yy, xx) - 100.3) ** 2 / 8).astype(np.float32)
+    geometry = Geometry(shape=image.shape, polar_shape=(256, 512))
+
+    holder = FitHolder.__new__(FitHolder)
+    holder.app = _App(image, geometry, with_windows)
+    holder.polar_image, holder.polar_windows, holder._segment_profile, holder.fit = None, None, None, None
+    holder.default_fitting, holder.default_background = Gaussian, LinearBackground
+    holder.default_range_strategy = RangeStrategy()
+    holder.update_data()
+    return holder
+
+
+def test_shared_read_only_profiles():
+    holder = _fit_holder()
+    fit = holder.new_fit(Roi(radius=100, width=3, key=0))
+    x_profile, y_profile = fit.x_profile, fit.y_profile
+
+    assert not x_profile.flags.writeable and not y_profile.flags.writeable
+    assert np.shares_memory(fit.x, x_profile) and np.shares_memory(fit.y, y_profile)
+
+    x_range = fit.x_range
+    fit.roi.radius, fit.roi.width = 110, 5
+    holder.update_fit_data()
+
+    assert fit.x_range != x_range
+    assert fit.x_profile is x_profile and fit.y_profile is y_profile
+    assert np.shares_memory(fit.y, y_profile)
+    assert fit.x.size == fit.x_range[1] - fit.x_range[0]
+
+
+def test_profiles_with_polar_windows():
+    holder = _fit_holder(with_windows=True)
+    fit = holder.new_fit(Roi(radius=100, width=3, key=0))
+    y_profile = fit.y_profile
+
+    # the fit is made on the window, the profiles of the polar image are still shared
+    assert not np.shares_memory(fit.y, y_profile)
+    assert not y_profile.flags.writeable
+
+    x_range = fit.x_range
+    fit.roi.radius = 110
+    holder.update_fit_data()
+
+    assert fit.x_range != x_range
+    assert fit.y_profile is y_profile
+    assert fit.x.size == holder.polar_windows.params.r_size
+
+
+def test_detrend_and_smooth_range():
+    profile = np.random.default_rng(0).random(500).astype(np.float32)
+    size = profile.size
+    corrected = gaussian_filter1d(
+        profile - (profile[0] + (profile[-1] - profile[0]) / size * np.linspace(0, size, size)), 2)
+
+    for start, stop in ((0, 10), (3, 50), (200, 350), (490, 500), (0, 500)):
+        assert np.allclose(_detrend_and_smooth(profile, start, stop, 2), corrected[start:stop])
+
+
+def test_auto_range():
+    holder = _fit_holder()
+    roi = Roi(radius=100, width=2, key=0)
+    fit = holder.set_auto_range(roi)
+    r1, r2 = fit.r_range
+    assert r1 < 100 < r2
+    assert fit.x.size == fit.x_range[1] - fit.x_range[0]
@@ -0,0 +1,70 @@
+import numpy as np
+
+from giwaxs_gui.gui.fitting.multi_fit import FitSeries
+
+
+def _assert_curves(series: FitSeries, x, radii, widths):
+    curves = series.curves()
+    for arr, expected in zip(curves, (x, radii, widths)):
+        assert np.array_equal(arr, np.asarray(expected, dtype=float), equal_nan=True)
+
+
+def test_set_grows_past_capacity():
+    series = FitSeries(capacity=2)
+    series.set(1, 10., 1.)
+    series.set(5, 15., 1.5)
+
+    assert len(series) == 2 and 1 in series and 5 in series and 3 not in series
+    _assert_curves(series, range(1, 6), [10., np.nan, np.nan, np.nan, 15.], [1., np.nan, np.nan, np.nan, 1.5])
+
+    # the data is kept after growing again, a repeated index is updated in place
+    series.set(100, 20., 2.)
+    series.set(1, 11., 1.1)
+    assert len(series) == 3
+    x, radii, widths = series.curves()
+    assert x[0] == 1 and x[-1] == 100 and x.size == 100
+    assert radii[0] == 11. and radii[4] == 15. and radii[-1] == 20.
+    assert np.isnan(radii[1:4]).all() and np.isnan(widths[5:-1]).all()
+
+
+def test_remove():
+    series = FitSeries(capacity=8)
+    for idx in (2, 3, 6):
+        series.set(idx, float(idx), idx / 10)
+
+    # removing a missing index does nothing
+    series.remove(4)
+    series.remove(20)
+    assert len(series) == 3
+
+    # a removed inner point is a nan gap
+    series.remove(3)
+    assert 3 not in series
+    _assert_curves(series, range(2, 7), [2., np.nan, np.nan, np.nan, 6.], [.2, np.nan, np.nan, np.nan, .6])
+
+    # removed edges shrink the curves
+    series.remove(2)
+    _assert_curves(series, [6], [6.], [.6])
+
+    series.remove(6)
+    assert not len(series)
+    assert all(arr.size == 0 for arr in series.curves())
+
+
+def test_curves_slicing():
+    series = FitSeries(capacity=16)
+    assert all(arr.size == 0 for arr in series.curves())
+
+    series.set(7, 7., .7)
+    _assert_curves(series, [7], [7.], [.7])
+
+    # the curves start at the first filled image whatever the order of setting
+    series.set(4, 4., .4)
+    series.set(9, 9., .9)
+    _assert_curves(series, range(4, 10),
+                   [4., np.nan, np.nan, 7., np.nan, 9.], [.4, np.nan, np.nan, .7, np.nan, .9])
+
+    # the curves are views of the series data
+    radii = series.curves()[1]
+    series.set(5, 5., .5)
+    assert radii[1] == 5.
@@ -0,0 +1,56 @@
+import gc
+import pickle
+import weakref
+
+import numpy as np
+
+from giwaxs_gui.app.geometry import Geometry, _polar_grids_cache
+
+
+def test_copy_shares_grids():
+    geometry = Geometry(shape=(100, 120), beam_center=(10, 20), scale=2.)
+    copy = geometry.copy()
+
+    assert copy == geometry
+    assert copy.polar_grids[0] is geometry.polar_grids[0]
+    assert not geometry.r_axis.flags.writeable
+
+    copy.set_beam_center(30, 40)
+    assert geometry.beam_center == (10, 20)
+    assert not np.array_equal(copy.polar_grids[0], geometry.polar_grids[0])
+
+
+def test_scale():
+    geometry = Geometry(shape=(100, 120), beam_center=(10, 20))
+    r_axis, aspect_ratio = geometry.r_axis, geometry.polar_aspect_ratio
+    geometry.set_scale(0.5)
+
+    assert geometry.scale_change == 0.5
+    assert np.allclose(geometry.r_axis, r_axis * 0.5)
+    assert np.isclose(geometry.polar_aspect_ratio, aspect_ratio / 0.5)
+
+
+def test_pickle_params_only():
+    geometry = Geometry(shape=(100, 120), beam_center=(10, 20), scale=2., t_key='2413')
+    geometry.polar_grids
+
+    data = pickle.dumps(geometry)
+    assert len(data) < 1000
+    assert pickle.loads(data) == geometry
+
+
+def test_unused_grids_are_freed():
+    geometry = Geometry(shape=(100, 120), beam_center=(10, 20))
+    shared = Geometry(shape=(100, 120), beam_center=(10, 20))
+    assert shared.polar_grids[0] is geometry.polar_grids[0]
+
+    refs = []
+    for i in range(20):
+        geometry.set_beam_center(11 + i, 20)
+        geometry.raw_polar_grids
+        refs.append(weakref.ref(geometry._polar_grids))
+    gc.collect()
+
+    assert sum(ref() is not None for ref in refs) == 1
+    assert len(_polar_grids_cache) <= 2
+    assert shared.polar_grids[0] is Geometry(shape=(100, 120), beam_center=(10, 20)).polar_grids[0]
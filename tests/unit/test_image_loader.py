@@ -0,0 +1,52 @@
+import queue
+import threading
+import time
+
+from giwaxs_gui.app.image_loader import LatestRequestLoader
+
+
+def test_latest_request_wins():
+    calls = queue.Queue()
+    started, release = threading.Event(), threading.Event()
+    loaded, previews, finished = [], [], []
+
+    def process_events():
+        deadline = time.monotonic() + 5
+        while (loader.is_loading or not calls.empty()) and time.monotonic() < deadline:
+            try:
+                calls.get(timeout=0.01)()
+            except queue.Empty:
+                pass
+
+    def read(key):
+        if key == 0:
+            started.set()
+            release.wait(5)
+        return key
+
+    def finish(key):
+        finished.append(key)
+        return key * 10
+
+    loader = LatestRequestLoader(read, finish, lambda key, res: loaded.append((key, res)),
+                                 calls.put, lambda key, data: previews.append(key))
+
+    loader.request(0)
+    assert started.wait(5)
+    # 0 is running, 1 is replaced by 2
+    loader.request(1)
+    loader.request(2)
+    release.set()
+
+    process_events()
+
+    assert loaded == [(2, 20)]
+    assert previews == [2]
+    # the expensive stage of the outdated request is skipped
+    assert finished == [2]
+
+    loader.request(3)
+    loader.cancel()
+    process_events()
+    assert loaded == [(2, 20)]
+    loader.shutdown()
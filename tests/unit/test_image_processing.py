@@ -0,0 +1,55 @@
+import numpy as np
+import cv2 as cv
+
+from giwaxs_gui.app.image_processing import (
+    ContrastCorrection, ImagePyramid, norm_img, sigma_levels, subsample
+)
+
+
+def _reference_contrast_correction(img, limit: float = 2000, coef: float = 5000):
+    img = np.log10(norm_img(img) * coef + 1)
+    img = cv.createCLAHE(clipLimit=limit, tileGridSize=(1, 1)).apply(
+        (norm_img(img) * coef).astype('uint16')).astype(np.float32)
+    return norm_img(img)
+
+
+def test_contrast_correction():
+    rng = np.random.default_rng(0)
+    contrast_correction = ContrastCorrection()
+
+    for _ in range(2):
+        img = rng.poisson(5, (300, 200)).astype(np.int32)
+        img[10:20, 10:20] += 10000
+        res = contrast_correction(img)
+        assert res.dtype == np.float32
+        assert np.allclose(res, _reference_contrast_correction(img), atol=1e-6)
+
+    assert not contrast_correction(np.ones((10, 10))).any()
+
+
+def test_sigma_levels():
+    img = np.random.default_rng(0).normal(size=(2000, 1000)).astype(np.float32)
+    assert subsample(img, 2 ** 16).size <= 2 ** 16
+    low, high = sigma_levels(img, 1, 2 ** 16)
+    assert abs(low + 1) < 0.05 and abs(high - 1) < 0.05
+
+
+def test_image_pyramid():
+    img = np.arange(1000 * 700, dtype=np.uint16).reshape(1000, 700) % 1000
+    lut = np.linspace(0, 1, 2 ** 16, dtype=np.float32)
+    pyramid = ImagePyramid(img, tile_size=128, lut=lut)
+
+    assert pyramid.levels[0] is img
+    assert [level.shape for level in pyramid.levels] == [(1000, 700), (500, 350), (250, 175), (125, 87)]
+    assert pyramid.level_by_step(1) == 0
+    assert pyramid.level_by_step(5) == 2
+    assert pyramid.level_by_step(100) == pyramid.top_level
+
+    keys = pyramid.tile_keys(0, 100, 200, 300, 260)
+    assert keys == [(0, 1, 0), (0, 1, 1), (0, 1, 2), (0, 2, 0), (0, 2, 1), (0, 2, 2)]
+    assert np.allclose(pyramid.tile((0, 1, 2)), lut[img[128:256, 256:384]])
+    assert pyramid.tile_rect((0, 7, 5)) == (640, 896, 60, 104)
+
+    x, y, w, h = pyramid.tile_rect((1, 3, 2))
+    assert (x, y, w + x, h + y) == (512, 768, 700, 1000)
+    assert pyramid.tile_keys(1, 0, 0, 700, 1000)[-1] == (1, 3, 2)
@@ -0,0 +1,54 @@
+import pickle
+from copy import deepcopy
+
+from giwaxs_gui.app.file_manager import ProjectRootKey, FolderPathKey, ImagePathKey
+
+
+def _make_tree(tmp_path):
+    folder = tmp_path / 'data'
+    (folder / 'sub').mkdir(parents=True)
+    for name in ('a.tif', 'b.tif', 'sub/c.edf'):
+        (folder / name).touch()
+    root = ProjectRootKey(project_path=tmp_path / 'project')
+    folder_key = root.add_path(folder)
+    root.expand_tree()
+    folder_key.update()
+    root.expand_tree(folder_key)
+    return root, folder_key
+
+
+def test_clean_copy_is_interned(tmp_path):
+    root, folder_key = _make_tree(tmp_path)
+    image_key = list(folder_key.image_children)[0]
+
+    copied = image_key.clean_copy()
+
+    assert copied == image_key and copied.idx == image_key.idx
+    assert copied.parent is None
+    assert image_key.parent is folder_key
+    assert image_key.clean_copy() is copied
+
+    copied_folder = folder_key.clean_copy()
+    assert copied_folder == folder_key and copied_folder.parent is None
+    assert not copied_folder.images_num and folder_key.images_num == 2
+    assert folder_key.clean_copy() is copied_folder
+
+
+def test_pickle_without_parents(tmp_path):
+    root, folder_key = _make_tree(tmp_path)
+    image_key = list(folder_key.image_children)[0]
+
+    assert pickle.loads(pickle.dumps(image_key)).parent is None
+    assert deepcopy(image_key).parent is folder_key
+    assert image_key.parent is folder_key
+
+    for loaded in (pickle.loads(pickle.dumps(root)), deepcopy(root)):
+        assert loaded.parent is None
+        loaded_folder = list(loaded.folder_children)[0]
+        loaded_sub = list(loaded_folder.folder_children)[0]
+        assert loaded_folder == folder_key and loaded_folder.parent is loaded
+        assert list(loaded_folder.image_children)[1].parent is loaded_folder
+        assert list(loaded_sub.image_children)[0].parent is loaded_sub
+        assert isinstance(list(loaded_sub.image_children)[0], ImagePathKey)
+        assert isinstance(loaded_sub, FolderPathKey)
+
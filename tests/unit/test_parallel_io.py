@@ -0,0 +1,65 @@
+import threading
+import time
+
+import numpy as np
+from PIL import Image
+
+from giwaxs_gui.app.parallel_io import iter_ordered, in_memory
+from giwaxs_gui.app.read_image import read_image
+from giwaxs_gui.app.pipeline.stages import ImageProcessor, ImageTask
+
+
+def _is_mapped(array: np.ndarray) -> bool:
+    while array is not None:
+        if isinstance(array, np.memmap):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+
+def test_order_and_back_pressure():
+    lock = threading.Lock()
+    calls = []
+
+    def read(i):
+        with lock:
+            calls.append(i)
+        time.sleep(0.001 * (i % 3))
+        return i * 2
+
+    results = []
+    for result in iter_ordered(read, range(20), workers=4, max_pending=3):
+        # never more than max_pending calls ahead of the consumer
+        assert len(calls) <= len(results) + 3
+        results.append(result)
+
+    assert results == [i * 2 for i in range(20)]
+
+
+def test_close_cancels_pending():
+    calls = []
+    results = iter_ordered(calls.append, range(100), workers=2, max_pending=4)
+    next(results)
+    results.close()
+    assert len(calls) <= 4
+
+
+def test_prefetched_images_are_in_memory(tmp_path):
+    images = [np.random.default_rng(i).integers(0, 1000, (60, 80)).astype(np.int32) for i in range(4)]
+    paths = [tmp_path / f'{i}.tif' for i in range(4)]
+    for path, image in zip(paths, images):
+        Image.fromarray(image).save(path)
+
+    assert _is_mapped(read_image(paths[0]))
+
+    results = list(iter_ordered(lambda path: in_memory(read_image(path)), paths, workers=2))
+    tasks = list(iter_ordered(ImageProcessor.read, [ImageTask('images', i, p) for i, p in enumerate(paths)],
+                              workers=2))
+
+    for image, result, (_, raw_image) in zip(images, results, tasks):
+        assert not _is_mapped(result) and not _is_mapped(raw_image)
+        assert np.array_equal(result, image) and np.array_equal(raw_image, image)
+
+    array = np.zeros(3)
+    assert in_memory(array) is array
+    assert in_memory(None) is None
@@ -0,0 +1,98 @@
+import numpy as np
+from PIL import Image
+import pytest
+from h5py import File
+
+from giwaxs_gui.app.pipeline import Pipeline, PipelineParams, iter_image_paths
+
+
+def _ring_image(shape=(200, 300), center=(100, 150), radius=60., width=3.):
+    zz, yy = np.mgrid[:shape[0], :shape[1]]
+    rr = np.sqrt((zz - center[0]) ** 2 + (yy - center[1]) ** 2)
+    return (1000 * np.exp(- (rr - radius) ** 2 / width ** 2) + 10).astype(np.float32)
+
+
+def _make_folder(tmp_path, num: int = 3):
+    folder = tmp_path / 'images'
+    folder.mkdir(parents=True)
+    for i in range(num):
+        Image.fromarray(_ring_image()).save(folder / f'img_{i}.tiff')
+    return folder
+
+
+def test_iter_image_paths(tmp_path):
+    folder = _make_folder(tmp_path)
+    (folder / 'notes.txt').write_text('not an image')
+    tasks = list(iter_image_paths([folder]))
+    assert [t.idx for t in tasks] == [0, 1, 2]
+    assert all(t.folder == 'images' for t in tasks)
+
+
+def test_pipeline_finds_ring(tmp_path):
+    folder = _make_folder(tmp_path)
+    dest = tmp_path / 'result.h5'
+    params = PipelineParams(beam_center=(100, 150), polar_shape=(128, 256), init_width=5, sigma_find=2)
+
+    assert Pipeline(params, processes=1).run([folder], dest) == 3
+
+    with File(str(dest), 'r') as f:
+        group = f['images']
+        assert len(group.keys()) == 3
+        img_group = group['img_0.tiff']
+        assert 'radial_profile' in img_group
+        radii = img_group['roi_data']['radius'][()]
+        assert np.any(np.abs(radii - 60) < 2)
+
+
+def test_folders_with_same_names(tmp_path):
+    folders = [_make_folder(tmp_path / 'a', 2), _make_folder(tmp_path / 'b', 2)]
+    _make_folder(folders[0], 2)
+    dest = tmp_path / 'result.h5'
+    params = PipelineParams(beam_center=(100, 150), polar_shape=(64, 128), find_peaks=False)
+
+    assert [t.folder for t in iter_image_paths(folders, recursive=True)] == \
+           ['images'] * 2 + ['images/images'] * 2 + ['images_2'] * 2
+
+    assert Pipeline(params).run(folders, dest, recursive=True) == 6
+
+    with File(str(dest), 'r') as f:
+        assert set(f['images'].keys()) == {'img_0.tiff', 'img_1.tiff', 'images'}
+        assert len(f['images/images'].keys()) == 2
+        assert len(f['images_2'].keys()) == 2
+
+    # conflicts are found before any image is written
+    Image.fromarray(_ring_image()).save(folders[1] / 'img_2.tiff')
+    with pytest.raises(ValueError):
+        Pipeline(params).run(folders, dest)
+    with File(str(dest), 'r') as f:
+        assert 'img_2.tiff' not in f['images_2']
+
+    assert Pipeline(params).run(folders, dest, overwrite=True) == 5
+
+
+def test_failed_images(tmp_path):
+    folder = _make_folder(tmp_path, 2)
+    (folder / 'img_broken.tiff').write_bytes(b'not an image')
+    params = PipelineParams(beam_center=(100, 150), polar_shape=(64, 128), find_peaks=False)
+
+    for processes in (1, 2):
+        pipeline = Pipeline(params, processes=processes)
+        assert pipeline.run([folder], tmp_path / f'result_{processes}.h5') == 2
+        assert pipeline.failed == [folder / 'img_broken.tiff']
+
+
+def test_pipeline_processes(tmp_path):
+    folder = _make_folder(tmp_path, 4)
+    dest = tmp_path / 'result.h5'
+    params = PipelineParams(beam_center=(100, 150), polar_shape=(128, 256), init_width=5, sigma_find=2)
+
+    assert Pipeline(params, processes=2, max_pending=2).run([folder], dest) == 4
+
+    with File(str(dest), 'r') as f:
+        group = f['images']
+        assert list(group.keys()) == [f'img_{i}.tiff' for i in range(4)]
+        assert [group[k].attrs['idx'] for k in group.keys()] == [0, 1, 2, 3]
+        roi_data = group['img_3.tiff']['roi_data']
+        assert roi_data['fitted_params'].dtype == float
+        assert roi_data['fitted_params'].shape[0] == roi_data['radius'].shape[0]
+        assert np.any(np.abs(roi_data['radius'][()] - 60) < 2)
@@ -0,0 +1,74 @@
+import pickle
+
+import numpy as np
+
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.polar_image import PolarImage
+from giwaxs_gui.app.fitting import FitObject, PolarWindows
+from giwaxs_gui.app.rois import Roi
+from giwaxs_gui.app.rois.roi import RoiTypes
+from giwaxs_gui.app.profiles import SavedProfile, BaselineParams
+
+
+def _ring_image(shape=(200, 220), radius=80.3, width=1.5):
+    yy, xx = np.mgrid[:shape[0], :shape[1]]
+    return np.exp(-(np.hypot(yy, xx) - radius) ** 2 / 2 / width ** 2).astype(np.float32)
+
+
+def test_window_profile():
+    image = _ring_image()
+    geometry = Geometry(shape=image.shape, polar_shape=(128, 128))
+    windows = PolarWindows(image, geometry)
+    roi = Roi(radius=80, width=5, key=0)
+
+    x, y = windows.get_x_y(roi, (70, 90))
+
+    assert x.size == windows.params.r_size
+    assert abs(x[np.argmax(y)] - 80.3) < 0.1
+    # scaled as the profile of the polar image with the same number of rows
+    fine_geometry = Geometry(shape=image.shape, polar_shape=(128, 2048))
+    profile = PolarImage.remap(image, fine_geometry).sum(axis=0)
+    assert np.isclose(y.max(), profile.max(), rtol=0.01)
+
+    window = windows.get(0, (70, 90), windows.phi_range)
+    assert windows.get(0, (70, 90), windows.phi_range) is window
+    assert windows.get(0, (71, 90), windows.phi_range) is not window
+    assert len(windows) == 1
+
+
+def test_fit_object_windows():
+    image = _ring_image()
+    geometry = Geometry(shape=image.shape, polar_shape=(128, 128))
+    polar_image = PolarImage.remap(image, geometry)
+    fit_object = FitObject(None, polar_image, geometry.r_axis, geometry.phi_axis)
+    fit_object.set_polar_windows(PolarWindows(image, geometry))
+
+    fit = fit_object.new_fit(Roi(radius=80, width=5, key=0))
+    assert fit.x.size == fit_object.polar_windows.params.r_size
+
+    fit.do_fit()
+    assert abs(fit.roi.radius - 80.3) < 0.05
+
+    assert pickle.loads(pickle.dumps(fit_object)).polar_windows is None
+
+
+def test_baseline_does_not_depend_on_sigma():
+    image = _ring_image()
+    geometry = Geometry(shape=image.shape, polar_shape=(128, 128))
+    polar_image = PolarImage.remap(image, geometry)
+    r_axis = geometry.r_axis
+    saved_profile = SavedProfile(polar_image.sum(axis=0), r_axis, (0, r_axis.size), 1., BaselineParams(),
+                                 baseline=np.linspace(0, 10, r_axis.size))
+    fit_object = FitObject(None, polar_image, r_axis, geometry.phi_axis, saved_profile=saved_profile)
+    roi, segment = Roi(radius=80, width=5, key=0), Roi(radius=80, width=5, key=1, type=RoiTypes.segment,
+                                                       angle=45, angle_std=20)
+    x1, x2 = fit_object._get_r_coords(70), fit_object._get_r_coords(90)
+
+    for windows in (None, PolarWindows(image, geometry)):
+        fit_object.polar_windows = windows
+        x, y = fit_object._get_x_y(roi, x1, x2, None, r_range=(70, 90))
+        x_s, y_s = fit_object._get_x_y(roi, x1, x2, 1., r_range=(70, 90))
+        # the slices of the polar image are smoothed separately, the edges differ
+        assert np.allclose(x, x_s) and np.allclose(y[2:-2], y_s[2:-2], atol=1e-3)
+        assert np.allclose(fit_object._get_x_y(segment, x1, x2, None, r_range=(70, 90))[1][2:-2],
+                           fit_object._get_x_y(segment, x1, x2, 1., r_range=(70, 90))[1][2:-2])
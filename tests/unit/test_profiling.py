@@ -0,0 +1,33 @@
+import json
+
+import numpy as np
+
+from giwaxs_gui.app.profiling import Profiler
+
+
+def test_profiler():
+    profiler = Profiler()
+
+    @profiler.timed('stage')
+    def allocate(size: int):
+        return np.ones(size)
+
+    allocate(10)
+    assert profiler.stats() == {}
+
+    profiler.enable(track_memory=True)
+    arrays = [allocate(2 ** 16) for _ in range(3)]
+    with profiler.stage('other'):
+        pass
+    profiler.disable()
+    allocate(10)
+
+    stats = profiler.stats()
+    assert stats['stage']['count'] == 3 and stats['other']['count'] == 1
+    assert stats['stage']['allocated'] >= 3 * arrays[0].nbytes
+    assert sum(stats['stage']['histogram']) == 3
+    assert stats['stage']['min'] <= stats['stage']['median'] <= stats['stage']['max']
+    assert json.loads(profiler.to_json())['stages']['other']['count'] == 1
+
+    profiler.reset()
+    assert profiler.stats() == {}
@@ -0,0 +1,56 @@
+import numpy as np
+from PIL import Image
+
+from giwaxs_gui.app.read_image import read_image, layout_cache
+
+
+_EDF_TYPES = {np.dtype(np.int32): 'SignedInteger', np.dtype(np.uint16): 'UnsignedShort',
+              np.dtype(np.float32): 'FloatValue'}
+
+
+def _write_edf(path, image: np.ndarray, header_size: int = 1024, dtype=np.int32):
+    image = image.astype(dtype)
+    header = (f'{{\nByteOrder = LowByteFirst ;\nDataType = {_EDF_TYPES[image.dtype]} ;\n'
+              f'Dim_1 = {image.shape[1]} ;\nDim_2 = {image.shape[0]} ;\nSize = {image.nbytes} ;\n')
+    path.write_bytes((header.ljust(header_size - 2) + '}\n').encode() + image.tobytes())
+
+
+def test_mapped_tiff(tmp_path):
+    image = np.random.default_rng(0).integers(0, 1000, (60, 80)).astype(np.int32)
+    Image.fromarray(image).save(tmp_path / 'image.tif')
+    Image.fromarray(image).save(tmp_path / 'compressed.tif', compression='tiff_adobe_deflate')
+
+    mapped = read_image(tmp_path / 'image.tif')
+    assert np.array_equal(mapped, image)
+    assert not mapped.flags.writeable
+    assert np.array_equal(read_image(tmp_path / 'compressed.tif'), image)
+
+
+def test_edf_layout_cache(tmp_path):
+    layout_cache.clear()
+    rng = np.random.default_rng(0)
+
+    for i, header_size in enumerate((1024, 1024, 512)):
+        image = rng.integers(0, 1000, (60, 80))
+        path = tmp_path / f'{i}.edf'
+        _write_edf(path, image, header_size)
+
+        mapped = read_image(path)
+        assert np.array_equal(mapped, read_image(path, mmap=False))
+        assert np.array_equal(mapped, np.rot90(image))
+
+
+def test_edf_mixed_layouts(tmp_path):
+    # files of a folder with the same header size but different types and shapes
+    layout_cache.clear()
+    rng = np.random.default_rng(0)
+
+    for i, (shape, dtype) in enumerate((((64, 64), np.float32), ((128, 128), np.uint16),
+                                        ((64, 64), np.float32), ((32, 128), np.int32))):
+        image = rng.integers(0, 1000, shape)
+        path = tmp_path / f'{i}.edf'
+        _write_edf(path, image, 1024, dtype)
+
+        mapped = read_image(path)
+        assert mapped.dtype == dtype
+        assert np.array_equal(mapped, np.rot90(image))
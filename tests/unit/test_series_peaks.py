@@ -0,0 +1,52 @@
+import numpy as np
+from scipy.signal import find_peaks
+
+from giwaxs_gui.app.profiles import SeriesPeaks, SeriesPeaksFinder, find_peaks_2d, track_peaks
+
+
+def _drifting_profiles(num: int = 20, size: int = 300) -> np.ndarray:
+    x = np.arange(size)
+    centers = np.stack([np.linspace(50, 80, num), np.linspace(200, 190, num)], axis=1)
+    return np.exp(- (x[None, None] - centers[..., None]) ** 2 / 50).sum(axis=1)
+
+
+def test_find_peaks_2d():
+    profiles = np.random.default_rng(0).normal(size=(10, 200)).cumsum(axis=1)
+    frames, positions = find_peaks_2d(profiles)
+
+    for i, row in enumerate(profiles):
+        assert positions[frames == i].tolist() == find_peaks(row)[0].tolist()
+
+    frames, positions = find_peaks_2d(profiles, 3)
+    for i, row in enumerate(profiles):
+        peaks = find_peaks(row)[0]
+        highest = np.sort(peaks[np.argsort(row[peaks])[::-1][:3]])
+        assert positions[frames == i].tolist() == highest.tolist()
+
+
+def test_track_peaks():
+    frames = np.array([0, 0, 1, 1, 1, 3])
+    positions = np.array([10, 50, 12, 14, 49, 12])
+    assert track_peaks(frames, positions, 5).tolist() == [0, 1, 0, 2, 1, 3]
+
+
+def test_series_peaks():
+    profiles = _drifting_profiles()
+    image_keys = [f'image_{i}' for i in range(len(profiles))]
+    r_axis = np.arange(profiles.shape[1]) * 0.1
+    # max_shift is in the units of the r axis
+    finder = SeriesPeaksFinder(None, sigma=1, max_peaks_number=5, max_shift=0.5)
+    series_peaks = finder.find_in_profiles(image_keys, r_axis, profiles)
+
+    assert isinstance(series_peaks, SeriesPeaks)
+    assert len(series_peaks) == 2 * len(image_keys)
+
+    tracks = series_peaks.roi_tracks(width=1.)
+    assert len(tracks) == 2
+    assert [image_key for image_key, _ in tracks[0]] == image_keys
+    assert abs(tracks[0][0][1].radius - 5.) < 0.11
+    assert abs(tracks[1][-1][1].radius - 19.) < 0.11
+
+    # the first peak shifts by 1.6 points (0.16) per frame
+    finder.max_shift = 0.1
+    assert len(finder.find_in_profiles(image_keys, r_axis, profiles).roi_tracks(width=1.)) > 2
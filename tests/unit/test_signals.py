@@ -0,0 +1,132 @@
+import gc
+import sys
+from copy import deepcopy
+
+import pytest
+from PyQt5 import sip
+from PyQt5.QtCore import QObject
+
+from giwaxs_gui.app.signals import Signal
+
+
+class _Emitter(object):
+    sigValue = Signal(int)
+
+
+class _TextEmitter(object):
+    sigText = Signal(str)
+
+
+class _Receiver(object):
+    def __init__(self):
+        self.values = []
+
+    def on_value(self, value):
+        self.values.append(value)
+
+    def on_any(self):
+        self.values.append(None)
+
+
+def test_connect_emit_disconnect():
+    emitter, receiver = _Emitter(), _Receiver()
+    emitter.sigValue.connect(receiver.on_value)
+    emitter.sigValue.connect(receiver.on_any)
+    emitter.sigValue.emit(1)
+    assert receiver.values == [1, None]
+
+    emitter.sigValue.disconnect(receiver.on_any)
+    emitter.sigValue.emit(2)
+    assert receiver.values == [1, None, 2]
+
+    with pytest.raises(TypeError):
+        emitter.sigValue.disconnect(receiver.on_any)
+
+
+def test_signals_are_per_instance():
+    emitter1, emitter2, receiver = _Emitter(), _Emitter(), _Receiver()
+    emitter1.sigValue.connect(receiver.on_value)
+    emitter2.sigValue.emit(1)
+    assert receiver.values == []
+
+
+def test_methods_are_weakly_referenced():
+    emitter, receiver = _Emitter(), _Receiver()
+    emitter.sigValue.connect(receiver.on_value)
+    del receiver
+    gc.collect()
+    emitter.sigValue.emit(1)
+    assert len(emitter.sigValue) == 0
+
+
+def test_chained_signals_and_copies():
+    emitter1, emitter2, receiver = _Emitter(), _Emitter(), _Receiver()
+    emitter1.sigValue.connect(emitter2.sigValue)
+    emitter2.sigValue.connect(receiver.on_value)
+    emitter1.sigValue.emit(3)
+    assert receiver.values == [3]
+
+    copied = deepcopy(emitter1)
+    assert len(copied.sigValue) == 0
+
+
+def test_slot_exceptions_are_passed_to_excepthook(monkeypatch):
+    emitter, receiver = _Emitter(), _Receiver()
+    errors = []
+    monkeypatch.setattr(sys, 'excepthook', lambda exc_type, value, tb: errors.append(value))
+
+    def fail(value):
+        raise ValueError(value)
+
+    emitter.sigValue.connect(fail)
+    emitter.sigValue.connect(receiver.on_value)
+    emitter.sigValue.emit(1)
+    emitter.sigValue.emit(2)
+
+    assert receiver.values == [1, 2]
+    assert len(emitter.sigValue) == 2
+    assert [err.args for err in errors] == [(1,), (2,)]
+
+
+def test_slots_of_deleted_qt_objects_are_disconnected(monkeypatch):
+    emitter, receiver = _TextEmitter(), _Receiver()
+    errors = []
+    monkeypatch.setattr(sys, 'excepthook', lambda exc_type, value, tb: errors.append(value))
+    obj = QObject()
+
+    def other_error(value):
+        raise RuntimeError('not a deleted object')
+
+    emitter.sigText.connect(obj.setObjectName)
+    emitter.sigText.connect(other_error)
+    emitter.sigText.connect(receiver.on_value)
+    emitter.sigText.emit('a')
+    assert obj.objectName() == 'a'
+
+    sip.delete(obj)
+    emitter.sigText.emit('b')
+    assert receiver.values == ['a', 'b']
+    assert len(emitter.sigText) == 2
+
+    emitter.sigText.emit('c')
+    assert receiver.values == ['a', 'b', 'c']
+    assert [str(err) for err in errors] == ['not a deleted object'] * 3
+
+
+def test_qt_bridge():
+    from PyQt5.QtCore import QCoreApplication
+    from giwaxs_gui.gui.signal_bridge import connect_qt
+
+    qapp = QCoreApplication.instance() or QCoreApplication([])
+    emitter, receiver, values = _Emitter(), QObject(), []
+    connect_qt(emitter.sigValue, values.append, receiver)
+
+    emitter.sigValue.emit(1)
+    assert values == []
+    qapp.processEvents()
+    assert values == [1]
+
+    sip.delete(receiver)
+    emitter.sigValue.emit(2)
+    qapp.processEvents()
+    assert values == [1] and len(emitter.sigValue) == 0
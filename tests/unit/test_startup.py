@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+import pytest
+
+# seconds for importing the gui package in a fresh interpreter
+COLD_START_BUDGET: float = 5.
+
+_HEAVY_MODULES = ('crystals', 'periodictable', 'OpenGL', 'glm', 'requests', 'pkg_resources',
+                  'giwaxs_gui.gui.viewer_3d', 'giwaxs_gui.gui.structures', 'giwaxs_gui.gui.fitting',
+                  'giwaxs_gui.app.structures')
+
+
+def _run_import(module: str) -> dict:
+    code = (
+        'import sys, json, time\n'
+        't = time.perf_counter()\n'
+        f'import {module}\n'
+        't = time.perf_counter() - t\n'
+        'print(json.dumps({"time": t, "modules": list(sys.modules)}))\n'
+    )
+    output = subprocess.check_output([sys.executable, '-c', code])
+    return json.loads(output.decode().splitlines()[-1])
+
+
+def test_package_import_is_light():
+    modules = _run_import('giwaxs_gui')['modules']
+    assert not [m for m in modules if m.split('.')[0] in ('PyQt5', 'numpy', 'cv2', 'pyqtgraph', 'h5py')]
+    assert 'giwaxs_gui.app' not in modules
+
+
+def test_gui_cold_start_budget():
+    pytest.importorskip('PyQt5')
+    pytest.importorskip('pyqtgraph')
+
+    res = _run_import('giwaxs_gui.gui')
+    assert not [m for m in _HEAVY_MODULES if m in res['modules']]
+    assert res['time'] < COLD_START_BUDGET
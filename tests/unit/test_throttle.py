@@ -0,0 +1,42 @@
+from giwaxs_gui.app.throttle import EventCoalescer
+
+
+class _Clock(object):
+    def __init__(self):
+        self.time = 0.
+
+    def __call__(self):
+        return self.time
+
+
+def test_event_coalescer():
+    clock, calls, dispatched = _Clock(), [], []
+
+    coalescer = EventCoalescer(
+        dispatched.append, max_rate=10, clock=clock,
+        scheduler=lambda delay, callback: calls.append((delay, callback)),
+        merge=lambda old, new: old + new,
+    )
+
+    coalescer.push('a', 1)
+    assert dispatched == [{'a': 1}] and not calls
+
+    clock.time = 0.05
+    for key, value in (('a', 1), ('b', 2), ('a', 3)):
+        coalescer.push(key, value)
+    assert len(dispatched) == 1 and len(calls) == 1
+    assert abs(calls[0][0] - 0.05) < 1e-9
+
+    clock.time = 0.1
+    calls.pop()[1]()
+    assert dispatched[-1] == {'a': 4, 'b': 2}
+    assert not coalescer.has_pending
+
+    clock.time = 0.12
+    coalescer.push('a', 5)
+    coalescer.flush()
+    assert dispatched[-1] == {'a': 5}
+
+    coalescer.set_scheduler(None)
+    coalescer.push('c', 1)
+    assert dispatched[-1] == {'c': 1}
@@ -0,0 +1,29 @@
+import numpy as np
+
+from giwaxs_gui.app.geometry import Geometry
+from giwaxs_gui.app.polar_image import PolarImage
+from giwaxs_gui.app.transformations import TransformationsHolder, _T_DICT
+
+
+def test_raw_coordinates():
+    raw = np.arange(5 * 7).reshape(5, 7)
+
+    for key in _T_DICT:
+        t = TransformationsHolder(key)
+        image = t(raw)
+        assert t.transformed_shape(raw.shape) == image.shape
+        assert t.raw_shape(image.shape) == raw.shape
+
+        yy, xx = np.mgrid[:image.shape[0], :image.shape[1]]
+        x, y = t.raw_coordinates(xx, yy, image.shape)
+        assert np.array_equal(raw[y, x], image)
+
+
+def test_remap_raw_image():
+    raw = np.random.default_rng(0).poisson(100, (60, 80)).astype(np.int32)
+
+    for key in _T_DICT:
+        geometry = Geometry(beam_center=(50, 20), polar_shape=(32, 32), t_key=key)
+        geometry.set_shape(geometry.t(raw).shape)
+        expected = PolarImage.calc_polar_image(geometry.t(raw), *geometry.polar_grids)
+        assert np.allclose(PolarImage.remap(raw, geometry), expected, atol=1e-2)
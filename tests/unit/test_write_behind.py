@@ -0,0 +1,78 @@
+import pickle
+
+from giwaxs_gui.app.file_manager import FileManager
+from giwaxs_gui.app.file_manager.write_behind import WriteBehindQueue, write_queue
+
+
+def test_pending_reads_and_flush(tmp_path):
+    queue = WriteBehindQueue()
+    path = tmp_path / 'value'
+
+    for i in range(100):
+        queue.put(path, pickle.dumps(i))
+        pending, data = queue.get(path)
+        assert not pending or pickle.loads(data) == i
+
+    assert queue.flush(5)
+    assert queue.get(path) == (False, None)
+    assert pickle.loads(path.read_bytes()) == 99
+
+    queue.delete(path)
+    pending, data = queue.get(path)
+    assert not pending or data is None
+
+    assert queue.flush(5)
+    assert not path.exists()
+    assert not list(tmp_path.iterdir())
+
+
+def test_failed_writes(tmp_path):
+    queue = WriteBehindQueue()
+    path, missing = tmp_path / 'value', tmp_path / 'missing' / 'value'
+
+    queue.put(path, pickle.dumps(1))
+    queue.put(missing, pickle.dumps(2))
+
+    assert not queue.flush(5)
+    assert list(queue.failed) == [missing]
+    assert pickle.loads(path.read_bytes()) == 1
+
+    # the data of the failed file is kept and retried by flush
+    pending, data = queue.get(missing)
+    assert pending and pickle.loads(data) == 2
+    missing.parent.mkdir()
+    assert queue.flush(5)
+    assert not queue.failed
+    assert pickle.loads(missing.read_bytes()) == 2
+
+    # a new write of the failed file replaces its data
+    missing.rename(tmp_path / 'file')
+    missing.mkdir()
+    queue.put(missing, pickle.dumps(3))
+    assert not queue.flush(5)
+    assert not [p for p in missing.parent.iterdir() if p.name.endswith('.tmp')]
+    missing.rmdir()
+    queue.put(missing, pickle.dumps(4))
+    assert queue.flush(5)
+    assert pickle.loads(missing.read_bytes()) == 4
+
+    (tmp_path / 'missing').rename(tmp_path / 'moved')
+    queue.put(missing, pickle.dumps(4))
+    assert not queue.flush(5)
+    assert list(queue.pop_failed()) == [missing]
+    assert queue.flush(5)
+
+
+def test_close_project_reports_failed_writes(tmp_path):
+    fm = FileManager(tmp_path / 'config')
+    fm.open_project(tmp_path / 'project')
+    reported = []
+    fm.sigSavingFailed.connect(reported.append)
+
+    missing = tmp_path / 'missing' / 'value'
+    write_queue.put(missing, pickle.dumps(1))
+    fm.close_project()
+
+    assert not fm.project_opened
+    assert len(reported) == 1 and list(reported[0]) == [missing]
+    assert not write_queue.failed